@@ -1,32 +1,6 @@
 #!/bin/bash
 
-# Get the directory of the current script
-script_dir="$(dirname "$(realpath "$0")")"
-
-# Function to clean up background processes
-cleanup() {
-    echo "Cleaning up..."
-    # Kill the background process
-    kill $bg_pid 2>/dev/null
-    exit 0
-}
-
-# Set up trap to catch Ctrl+C (SIGINT)
-trap cleanup SIGINT
-
-# Run the mistral.sh script and redirect its output to mistral.log
-"$script_dir/server/mistral_nemo.sh" > "$script_dir/server/mistral_nemo.log" 2>&1 &
-bg_pid=$!
-
-echo "Sleeping for 10"
-
-# Wait for 10 seconds
-sleep 10
-
-echo "Starting script"
-
-# Run the Python script
-python3 "$script_dir/code/mistral_nemo.py"
-
-# Wait for the background process to finish
-wait $bg_pid
+# Start llama-server, classify as soon as it has loaded the model and keep
+# going through server crashes; the server is stopped when the run ends or on
+# Ctrl+C. Server output goes to dss-selc-dump/classification/servers.
+python3 -m dss_selc.classify theme --model mistral_nemo --slot-cache --serve 1
@@ -1,10 +1,13 @@
+mkdir -p /home/student/anurag/.models/slots
 llama-server \
 -m /home/student/anurag/.models/Mistral-Nemo-Instruct-2407-Q4_K_M.gguf \
 -cb \
+-np 4 \
 -t 12 \
--c 2000 \
+-c 8000 \
 -n 1800 \
 --port 8080 \
 --host :: \
 --threads-http 12 \
+--slot-save-path /home/student/anurag/.models/slots \
 --grammar-file /home/student/anurag/dss-solar-selc/categorize/theme/grammar/theme_grammar.gbnf
\ No newline at end of file
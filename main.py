@@ -4,4 +4,4 @@ from dss_selc.scraper import Scraper
 scraper = Scraper()
 scraper.fetch_all()
 
-transform_data()
+transform_data(incremental=True)
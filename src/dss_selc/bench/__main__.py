@@ -0,0 +1,116 @@
+import argparse
+import json
+from pathlib import Path
+
+from dss_selc.utils import DUMP_PATH
+
+FIXTURES_PATH = DUMP_PATH / "bench" / "fixtures"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m dss_selc.bench",
+        description="Benchmarks of the scrape, transform and classify stages",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    fixtures = sub.add_parser("fixtures", help="write synthetic fixture pages")
+    fixtures.add_argument("--path", type=Path, default=FIXTURES_PATH)
+    fixtures.add_argument("--articles", type=int, default=200)
+    fixtures.add_argument("--page-size", type=int, default=20)
+    fixtures.add_argument("--seed", type=int, default=0)
+
+    scrapers = sub.add_parser("scrapers", help="replay fixtures to the scrapers")
+    scrapers.add_argument("sources", nargs="*")
+    scrapers.add_argument("--fixtures", type=Path, default=FIXTURES_PATH)
+    scrapers.add_argument("--latency", type=float, default=0.0)
+    scrapers.add_argument("--jitter", type=float, default=0.0)
+    scrapers.add_argument("--error-rate", type=float, default=0.0)
+    scrapers.add_argument("--seed", type=int, default=0)
+    scrapers.add_argument("--timeout", type=float, default=600.0)
+    scrapers.add_argument("--json", type=Path, help="also write results here")
+
+    transform = sub.add_parser("transform", help="compare the transform engines")
+    transform.add_argument("--dump", type=Path, default=DUMP_PATH)
+    transform.add_argument("--engines", nargs="+", default=["pandas", "arrow"])
+    transform.add_argument("--repeat", type=int, default=3)
+    transform.add_argument("--json", type=Path, help="also write results here")
+
+    classify = sub.add_parser("classify", help="accuracy of batched prompts")
+    classify.add_argument("task", choices=["solar", "theme"])
+    classify.add_argument("--model", required=True)
+    classify.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    classify.add_argument("--sample", type=int, default=200)
+    classify.add_argument(
+        "--url", nargs="+", help="servers to use instead of the configured"
+    )
+    classify.add_argument("--in-flight", type=int, default=4, help="per server")
+    classify.add_argument("--reference", type=Path, help="labelled output parquet")
+    classify.add_argument("--seed", type=int, default=0)
+    classify.add_argument("--json", type=Path, help="also write results here")
+
+    transform_worker = sub.add_parser("transform-worker", help=argparse.SUPPRESS)
+    transform_worker.add_argument("engine")
+    transform_worker.add_argument("out", type=Path)
+
+    worker = sub.add_parser("worker", help=argparse.SUPPRESS)
+    worker.add_argument("source")
+    worker.add_argument("stub")
+    worker.add_argument("out", type=Path)
+
+    args = parser.parse_args()
+    if args.command == "fixtures":
+        from dss_selc.bench.fixtures import build_fixtures
+
+        store = build_fixtures(args.path, args.articles, args.page_size, args.seed)
+        print(f"[*] Wrote {len(store.index['routes'])} routes to {args.path}")
+    elif args.command == "scrapers":
+        from dss_selc.bench.scrapers import SOURCES, bench_scrapers, print_report
+
+        results = bench_scrapers(
+            args.fixtures,
+            tuple(args.sources) or SOURCES,
+            args.latency,
+            args.jitter,
+            args.error_rate,
+            args.seed,
+            timeout=args.timeout,
+        )
+        print_report(results)
+        if args.json:
+            args.json.write_text(json.dumps(results, indent=4))
+    elif args.command == "transform":
+        from dss_selc.bench.transform import bench_transform, print_transform_report
+
+        results = bench_transform(args.dump, tuple(args.engines), args.repeat)
+        print_transform_report(results)
+        if args.json:
+            args.json.write_text(json.dumps(results, indent=4))
+    elif args.command == "classify":
+        from dss_selc.bench.classify import bench_classify, print_classify_report
+
+        results = bench_classify(
+            args.task,
+            args.model,
+            tuple(args.sizes),
+            args.sample,
+            args.url,
+            args.in_flight,
+            args.reference,
+            args.seed,
+        )
+        print_classify_report(results)
+        if args.json:
+            args.json.write_text(json.dumps(results, indent=4))
+    elif args.command == "transform-worker":
+        from dss_selc.bench.transform import run_transform_worker
+
+        run_transform_worker(args.engine, args.out)
+    elif args.command == "worker":
+        from dss_selc.bench.scrapers import run_worker
+
+        run_worker(args.source, args.stub, args.out)
+
+
+if __name__ == "__main__":
+    main()
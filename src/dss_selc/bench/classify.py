@@ -0,0 +1,130 @@
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from dss_selc.classify.client import LLMClient
+from dss_selc.classify.config import get_endpoint, load_config, server_urls
+from dss_selc.classify.dispatch import IN_FLIGHT, dispatch
+from dss_selc.classify.runner import read_input
+from dss_selc.classify.scorer import batched, make_scorer
+from dss_selc.classify.tasks import get_task
+from dss_selc.data_transform.aggregates import UNLABELLED
+
+
+def sample_titles(spec: dict, n: int, seed: int = 0) -> pd.DataFrame:
+    """`n` random rows the task would classify, with `id` and `title`"""
+    df = read_input(spec)
+    if spec["gate"] is not None:
+        df = df[df.iloc[:, -1] >= spec["gate"]]
+    df = df.dropna(subset=["title"])
+    return df.sample(min(n, len(df)), random_state=seed)[["id", "title"]]
+
+
+def score_sample(
+    client: LLMClient, spec: dict, titles: list[str], batch: int, in_flight: int
+) -> tuple[np.ndarray, int]:
+    """Scores of `titles` (NaN rows for failures) and the number of failures"""
+    scores = np.full((len(titles), len(spec["labels"])), np.nan)
+    score = make_scorer(client, spec, "json", batch)
+    failed = 0
+    chunks = batched(enumerate(titles), batch)
+    for rows, chunk_scores, error in dispatch(score, chunks, in_flight):
+        if error is not None:
+            failed += len(rows)
+            continue
+        scores[list(rows)] = chunk_scores
+    return scores, failed
+
+
+def bench_classify(
+    task: str,
+    model: str,
+    sizes: tuple[int, ...] = (1, 2, 4, 8),
+    sample: int = 200,
+    url: Optional[Union[str, list[str]]] = None,
+    in_flight: int = IN_FLIGHT,
+    reference: Optional[Path] = None,
+    seed: int = 0,
+) -> list[dict]:
+    """
+    Compare batched classification against one title per request.
+
+    The same sample of titles is scored with every batch size; answers are
+    compared with reference labels, either an existing output of the task
+    (e.g. a run with `--batch 1`) or, without one, the scores of the first
+    size.
+
+    Args:
+        task (str): Key of `TASKS`.
+        model (str): Model of the config.
+        sizes (tuple[int, ...]): Titles per request to try.
+        sample (int): Titles scored per size.
+        url (Optional[Union[str, list[str]]]): Servers to use instead of the
+            configured ones.
+        in_flight (int): Concurrent requests per server.
+        reference (Optional[Path]): Labelled output parquet of the task.
+        seed (int): Seed of the sample.
+
+    Returns:
+        list[dict]: Per size: throughput, prompt tokens evaluated per title,
+            failed titles, batches that fell back to single titles, mean
+            absolute difference to the reference scores and agreement of the
+            top label.
+    """
+    spec = get_task(task)
+    endpoint = get_endpoint(load_config(), model, task)
+    columns = list(spec["labels"].values())
+    rows = sample_titles(spec, sample, seed)
+    titles = rows["title"].tolist()
+    truth = None
+    if reference is not None:
+        labels = pd.read_parquet(reference, columns=["id", *columns])
+        labels = labels.replace(UNLABELLED, np.nan).drop_duplicates("id")
+        truth = rows[["id"]].merge(labels, on="id", how="left")[columns].to_numpy()
+
+    urls = server_urls(endpoint, url)
+    total = in_flight * len(urls)
+    results = []
+    for batch in sizes:
+        with LLMClient(
+            urls, endpoint["template"], endpoint["options"], total, slots=in_flight
+        ) as client:
+            start = time.perf_counter()
+            scores, failed = score_sample(client, spec, titles, batch, total)
+            seconds = time.perf_counter() - start
+            stats = dict(client.stats)
+        if truth is None:
+            truth = scores
+        both = ~np.isnan(scores).any(axis=1) & ~np.isnan(truth).any(axis=1)
+        mae = np.abs(scores[both] - truth[both]).mean() if both.any() else np.nan
+        top = scores[both].argmax(axis=1) == truth[both].argmax(axis=1)
+        results.append(
+            {
+                "batch": batch,
+                "titles": len(titles),
+                "seconds": seconds,
+                "titles_per_s": len(titles) / seconds,
+                "prompt_tokens_per_title": stats["prompt_tokens"] / len(titles),
+                "failed": failed,
+                "fallbacks": stats["fallbacks"],
+                "mae": float(mae),
+                "top_agreement": float(top.mean()) if both.any() else float("nan"),
+            }
+        )
+    return results
+
+
+def print_classify_report(results: list[dict]) -> None:
+    print(
+        f"{'batch':>6}{'titles':>8}{'titles/s':>10}{'prompt/t':>10}"
+        f"{'failed':>8}{'fallback':>10}{'MAE':>8}{'top-1':>8}"
+    )
+    for r in results:
+        print(
+            f"{r['batch']:>6}{r['titles']:>8}{r['titles_per_s']:>10.2f}"
+            f"{r['prompt_tokens_per_title']:>10.1f}{r['failed']:>8}"
+            f"{r['fallbacks']:>10}{r['mae']:>8.3f}{r['top_agreement']:>8.1%}"
+        )
@@ -0,0 +1,357 @@
+import json
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from urllib.parse import quote, urlencode
+
+from dss_selc.bench.stub import FixtureStore
+from dss_selc.scraper.ec import ECScraper
+from dss_selc.scraper.eec import EECScraper
+from dss_selc.scraper.mercom import MrcmScraper
+from dss_selc.scraper.nleec import NLEECScraper
+from dss_selc.scraper.pvmag import PvMagScraper
+from dss_selc.scraper.pvmag_global import PvMagGlobalScraper
+from dss_selc.scraper.pvmag_usa import PvMagUSAScraper
+from dss_selc.scraper.saur import SaurScraper
+
+WORDS = (
+    "solar",
+    "power",
+    "tariff",
+    "module",
+    "capacity",
+    "gigawatt",
+    "rooftop",
+    "auction",
+    "developer",
+    "ministry",
+    "tender",
+    "storage",
+    "battery",
+    "inverter",
+    "grid",
+    "transmission",
+    "policy",
+    "state",
+    "project",
+    "commission",
+    "investment",
+    "financing",
+    "company",
+    "shares",
+    "market",
+    "demand",
+    "manufacturing",
+    "cell",
+    "wafer",
+    "efficiency",
+    "perovskite",
+    "bifacial",
+    "hydrogen",
+    "wind",
+    "renewable",
+    "energy",
+    "india",
+    "government",
+    "scheme",
+    "subsidy",
+    "installation",
+    "utility",
+)
+START = datetime(2010, 1, 1)
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _title(rng: random.Random, i: int) -> str:
+    return f"{_text(rng, rng.randint(6, 12))} #{i}"
+
+
+def _paras(rng: random.Random, count: int) -> str:
+    return "".join(f"<p>{_text(rng, rng.randint(30, 80))}.</p>" for _ in range(count))
+
+
+def _json_ld(rng: random.Random, i: int, url: str, date: datetime) -> dict:
+    """A NewsArticle JSON-LD blob shaped like the ET/ETEnergyWorld ones"""
+    return {
+        "@context": "https://schema.org",
+        "@type": "NewsArticle",
+        "mainEntityOfPage": {"@type": "WebPage", "@id": url},
+        "url": url,
+        "headline": _title(rng, i),
+        "description": _text(rng, 25),
+        "articleBody": " ".join(_text(rng, 60) for _ in range(rng.randint(4, 12))),
+        "datePublished": date.strftime("%Y-%m-%dT%H:%M:%S+05:30"),
+        "dateModified": date.strftime("%Y-%m-%dT%H:%M:%S+05:30"),
+        "keywords": ", ".join(rng.sample(WORDS, 5)),
+        "image": {
+            "@type": "ImageObject",
+            "url": f"https://img.example.com/{i}.jpg",
+            "width": 1200,
+            "height": 900,
+        },
+        "author": {"@type": "Person", "name": "ET EnergyWorld"},
+        "publisher": {
+            "@type": "Organization",
+            "name": "ETEnergyWorld",
+            "logo": {"@type": "ImageObject", "url": "https://img.example.com/l.png"},
+        },
+        "breadcrumb": {
+            "@type": "BreadcrumbList",
+            "itemListElement": [
+                {"@type": "ListItem", "position": p, "name": n}
+                for p, n in enumerate(("Home", "News", "Renewable"), start=1)
+            ],
+        },
+    }
+
+
+def _detail_page(data: dict) -> str:
+    site = {"@context": "https://schema.org", "@type": "WebSite", "name": "stub"}
+    return (
+        "<html><head>"
+        f'<script type="application/ld+json">{json.dumps(site)}</script>'
+        f'<script type="application/ld+json">{json.dumps(data)}</script>'
+        "</head><body></body></html>"
+    )
+
+
+def _ordinal(day: int) -> str:
+    if 11 <= day <= 13:
+        return f"{day}th"
+    return f"{day}{({1: 'st', 2: 'nd', 3: 'rd'}).get(day % 10, 'th')}"
+
+
+def _pages(n: int, page_size: int) -> list[range]:
+    return [range(i, min(i + page_size, n)) for i in range(0, n, page_size)]
+
+
+def build_ec(store: FixtureStore, rng: random.Random, n: int, page_size: int) -> None:
+    for pg, ids in enumerate(_pages(n, page_size), start=1):
+        items = []
+        for i in ids:
+            href = f"/industry/renewables/article-{i}/articleshow/{1_000_000 + i}.cms"
+            data = _json_ld(rng, i, ECScraper.EC_URL + href, START + timedelta(i))
+            title = data["headline"]
+            items.append(f'<li><a class="anc" title="{title}" href="{href}">x</a></li>')
+            store.add("GET", ECScraper.EC_URL + href, _detail_page(data))
+        listing = ECScraper.EC_CMFID_URL["solar"].format(pg=pg)
+        store.add("GET", listing, "<ul>" + "".join(items) + "</ul>")
+    store.add_fallback("GET", ECScraper.EC_LL, "<ul></ul>")
+
+
+def build_eec(store: FixtureStore, rng: random.Random, n: int, page_size: int) -> None:
+    params = EECScraper.__new__(EECScraper)._get_pararms
+    pages = _pages(n, page_size)
+    for pg, ids in enumerate(pages, start=1):
+        items = []
+        for i in ids:
+            href = f"/news/renewable/article-{i}/{2_000_000 + i}"
+            url = EECScraper.ENERGY_BASE + href
+            data = _json_ld(rng, i, url, START + timedelta(i))
+            items.append(f'<li><a href="{href}">{data["headline"]}</a><p>s</p></li>')
+            store.add("GET", url, _detail_page(data))
+        resp = {
+            "html": "<ul>" + "".join(items) + "</ul>",
+            "data": {"has_reached_end": False},
+        }
+        query = urlencode(params(pg, "renewable-news"))
+        store.add(
+            "GET",
+            f"{EECScraper.AJAX_CALL_URL}?{query}",
+            json.dumps(resp),
+            content_type="application/json",
+        )
+    query = urlencode(params(len(pages) + 1, "renewable-news"))
+    store.add(
+        "GET",
+        f"{EECScraper.AJAX_CALL_URL}?{query}",
+        json.dumps({"html": "", "data": {"has_reached_end": True}}),
+        content_type="application/json",
+    )
+
+
+def build_nleec(
+    store: FixtureStore, rng: random.Random, n: int, page_size: int
+) -> None:
+    for day, ids in enumerate(_pages(n, page_size)):
+        date = START + timedelta(day)
+        anchors = ['<a href="https://example.com/x">Read More</a>']
+        for i in ids:
+            category = ("renewable", "power")[i % 2]
+            path = f"energy.economictimes.indiatimes.com/news/{category}/a-{i}/{i}"
+            url = f"https://{path}"
+            store.add("GET", url, _detail_page(_json_ld(rng, i, url, date)))
+            target = "{{STUB}}" + quote("/" + path, safe="")
+            href = (
+                f"{NLEECScraper.ENERGY_BASE}/newsletter/redirect"
+                f"?url={target}&mailer_id=35"
+            )
+            anchors.append(f'<a href="{href}">{_title(rng, i)}</a>')
+        nl_url = NLEECScraper.NL_BASE.format(date=date.strftime("%Y-%m-%d"))
+        store.add("GET", nl_url, "<html>" + "".join(anchors) + "</html>")
+    store.add_fallback("GET", NLEECScraper.ENERGY_BASE + "/newsletter", "<html/>")
+
+
+def _mercom_query(offset: int) -> bytes:
+    payload = {
+        "query": MrcmScraper.GRAPHQL_QUERY,
+        "variables": {"offset": offset, "size": 15},
+    }
+    return json.dumps(payload).encode()
+
+
+def build_mercom(
+    store: FixtureStore, rng: random.Random, n: int, page_size: int  # noqa: U100
+) -> None:
+    pages = _pages(n, 15)
+    for offset, ids in zip(range(0, n, 15), pages):
+        nodes = [
+            {
+                "id": f"cG9zdDo{i}",
+                "slug": f"article-{i}",
+                "date": (START + timedelta(i)).strftime("%Y-%m-%dT%H:%M:%S"),
+                "content": _paras(rng, rng.randint(4, 10)),
+                "title": _title(rng, i),
+                "modifiedGmt": (START + timedelta(i)).strftime("%Y-%m-%dT%H:%M:%S"),
+                "categories": {
+                    "nodes": [
+                        {"name": w.title(), "slug": w} for w in rng.sample(WORDS, 2)
+                    ]
+                },
+                "featuredImage": {"node": {"mediaItemUrl": "https://img/x.jpg"}},
+                "author": {"node": {"name": "Mercom", "description": ""}},
+            }
+            for i in ids
+        ]
+        store.add(
+            "POST",
+            MrcmScraper.GRAPHQL_ENDPOINT,
+            json.dumps({"data": {"posts": {"nodes": nodes}}}),
+            content_type="application/json",
+            body=_mercom_query(offset),
+        )
+    store.add(
+        "POST",
+        MrcmScraper.GRAPHQL_ENDPOINT,
+        json.dumps({"data": {"posts": {"nodes": []}}}),
+        content_type="application/json",
+        body=_mercom_query(len(pages) * 15),
+    )
+
+
+def _build_pvmag(
+    scraper: type,
+    store: FixtureStore,
+    rng: random.Random,
+    n: int,
+    page_size: int,
+) -> None:
+    host = scraper.LISTING_URL.split("/")[2]
+    for pg, ids in enumerate(_pages(n, page_size), start=1):
+        previews = []
+        for i in ids:
+            path = f"{host}/{2010 + i % 15}/01/01/article-{i}/"
+            date = (START + timedelta(i)).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+            previews.append(
+                '<div class="article-preview">'
+                f'<h2 class="entry-title"><a href="{{{{STUB}}}}/{path}">'
+                f"{_title(rng, i)}</a></h2>"
+                f'<time class="entry-published updated" datetime="{date}">x</time>'
+                '<span class="entry-author">PV Magazine</span>'
+                f'<div class="article-lead-text"><p>{_text(rng, 25)}</p></div>'
+                "</div>"
+            )
+            body = _paras(rng, rng.randint(4, 10)) + "<p>footer</p>"
+            page = f'<div class="entry-content">{body}</div>'
+            store.add("GET", f"https://{path}", page)
+        store.add("GET", scraper.LISTING_URL.format(page_num=pg), "".join(previews))
+
+
+def build_pvmag(
+    store: FixtureStore, rng: random.Random, n: int, page_size: int
+) -> None:
+    _build_pvmag(PvMagScraper, store, rng, n, page_size)
+
+
+def build_pvmag_global(
+    store: FixtureStore, rng: random.Random, n: int, page_size: int
+) -> None:
+    _build_pvmag(PvMagGlobalScraper, store, rng, n, page_size)
+
+
+def build_pvmag_usa(
+    store: FixtureStore, rng: random.Random, n: int, page_size: int
+) -> None:
+    _build_pvmag(PvMagUSAScraper, store, rng, n, page_size)
+
+
+def build_saur(store: FixtureStore, rng: random.Random, n: int, page_size: int) -> None:
+    for pg, ids in enumerate(_pages(n, page_size), start=1):
+        articles = []
+        for i in ids:
+            path = f"www.saurenergy.com/solar-energy-news/article-{i}"
+            date = START + timedelta(i)
+            published = date.strftime(f"%a, %b {_ordinal(date.day)}, %Y")
+            articles.append(
+                f'<article id="post-{i}">'
+                f'<a class="content-title-link" href="{{{{STUB}}}}/{path}">'
+                f"{_title(rng, i)}</a>"
+                f'<span itemprop="datePublished">{published}</span>'
+                '<span class="vcard author">Saur Energy</span>'
+                '<div class="entry-summary content-list-summary">'
+                f"<p>{_text(rng, 25)}</p></div></article>"
+            )
+            tags = "".join(f"<a>{w}</a>" for w in rng.sample(WORDS, 3))
+            page = (
+                f'<div class="entry-content clearfix">{_paras(rng, 6)}</div>'
+                f'<div class="entry-tags">{tags}</div>'
+            )
+            store.add("GET", f"https://{path}", page)
+        store.add("GET", SaurScraper.LISTING_URL.format(page_num=pg), "".join(articles))
+    store.add_fallback(
+        "GET", SaurScraper.LISTING_URL.partition("{")[0], "<html></html>"
+    )
+
+
+BUILDERS = {
+    "ec": build_ec,
+    "eec": build_eec,
+    "nleec": build_nleec,
+    "mercom": build_mercom,
+    "pvmag": build_pvmag,
+    "pvmag_global": build_pvmag_global,
+    "pvmag_usa": build_pvmag_usa,
+    "saur": build_saur,
+}
+
+
+def build_fixtures(
+    root: Path,
+    articles: int = 200,
+    page_size: int = 20,
+    seed: int = 0,
+) -> FixtureStore:
+    """
+    Write a synthetic fixture set for every source.
+
+    The pages mirror the markup each scraper parses, so they can stand in for
+    recorded ones; real recordings can be added to the same store with
+    `FixtureStore.add`.
+
+    Args:
+        root (Path): Directory of the fixture store, created if missing.
+        articles (int): Number of articles per source.
+        page_size (int): Articles per listing page (or newsletter).
+        seed (int): Seed of the text generator.
+
+    Returns:
+        FixtureStore: The saved store.
+    """
+    store = FixtureStore(root)
+    for source, builder in BUILDERS.items():
+        builder(store, random.Random(f"{seed}-{source}"), articles, page_size)
+    store.save()
+    return store
@@ -0,0 +1,231 @@
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from dss_selc.bench.stub import FixtureStore, StubServer, rebase_url
+
+SOURCES = (
+    "ec",
+    "eec",
+    "nleec",
+    "mercom",
+    "pvmag",
+    "pvmag_global",
+    "pvmag_usa",
+    "saur",
+)
+
+
+def _rebase_class(cls: type, stub: str) -> None:
+    """Rewrite the URL constants of a scraper class to hit the stub server"""
+
+    def is_site_url(value: object) -> bool:
+        return isinstance(value, str) and value.startswith("https://")
+
+    for name, value in list(vars(cls).items()):
+        if is_site_url(value):
+            setattr(cls, name, rebase_url(value, stub))
+        elif isinstance(value, dict) and all(map(is_site_url, value.values())):
+            setattr(cls, name, {k: rebase_url(v, stub) for k, v in value.items()})
+    for name in ("SLEEP_TIME", "PAUSE_TIME"):
+        if hasattr(cls, name):
+            setattr(cls, name, 0)
+
+
+def _run_ec() -> int:
+    from dss_selc.scraper.ec import ECScraper
+
+    scraper = ECScraper()
+    scraper.fetch_ec("solar")
+    return len(scraper.ec_articles)
+
+
+def _run_eec() -> int:
+    from dss_selc.scraper.eec import EECScraper
+
+    scraper = EECScraper()
+    scraper.fetch_articles("renewable-news")
+    return sum("data" in v for v in scraper.eec_articles.values())
+
+
+def _run_nleec() -> int:
+    from dss_selc.scraper.nleec import NLEECScraper
+
+    scraper = NLEECScraper()
+    scraper.fetch_newsletters()
+    fetched = []
+    _get_details = scraper._get_details
+
+    def counting_get_details(article_url: str) -> None:
+        fetched.append(article_url)
+        _get_details(article_url)
+
+    scraper._get_details = counting_get_details
+    scraper.fetch_articles()
+    return len(fetched)
+
+
+def _run_mercom() -> int:
+    from dss_selc.scraper.mercom import MrcmScraper
+
+    scraper = MrcmScraper()
+    scraper.fetch_articles()
+    return len(scraper.mcm_articles)
+
+
+def _run_pvmag(module: str, name: str) -> Callable[[], int]:
+    def run() -> int:
+        scraper = getattr(__import__(module, fromlist=[name]), name)()
+        scraper.fetch_articles()
+        scraper.fetch_body()
+        return sum(v.get("body") is not None for v in scraper.pvmag_articles.values())
+
+    return run
+
+
+def _run_saur() -> int:
+    from dss_selc.scraper.saur import SaurScraper
+
+    scraper = SaurScraper()
+    scraper.fetch_articles()
+    scraper.fetch_body()
+    return sum(v.get("body") is not None for v in scraper.saur_articles.values())
+
+
+RUNNERS = {
+    "ec": ("dss_selc.scraper.ec", "ECScraper", _run_ec),
+    "eec": ("dss_selc.scraper.eec", "EECScraper", _run_eec),
+    "nleec": ("dss_selc.scraper.nleec", "NLEECScraper", _run_nleec),
+    "mercom": ("dss_selc.scraper.mercom", "MrcmScraper", _run_mercom),
+    "pvmag": (
+        "dss_selc.scraper.pvmag",
+        "PvMagScraper",
+        _run_pvmag("dss_selc.scraper.pvmag", "PvMagScraper"),
+    ),
+    "pvmag_global": (
+        "dss_selc.scraper.pvmag_global",
+        "PvMagGlobalScraper",
+        _run_pvmag("dss_selc.scraper.pvmag_global", "PvMagGlobalScraper"),
+    ),
+    "pvmag_usa": (
+        "dss_selc.scraper.pvmag_usa",
+        "PvMagUSAScraper",
+        _run_pvmag("dss_selc.scraper.pvmag_usa", "PvMagUSAScraper"),
+    ),
+    "saur": ("dss_selc.scraper.saur", "SaurScraper", _run_saur),
+}
+
+
+def run_worker(source: str, stub: str, out_path: Path) -> None:
+    """
+    Run one scraper against the stub and write its measurements to `out_path`.
+
+    Meant to be run in a fresh process (see `bench_scrapers`) so that peak RSS
+    and CPU time belong to this scraper alone; the dump directory and proxy
+    settings come from the environment set up by the parent.
+    """
+    module, name, run = RUNNERS[source]
+    # the EEC listing is loaded by NLEEC too, so always point both at the stub
+    for mod, cls in {(module, name), ("dss_selc.scraper.eec", "EECScraper")}:
+        _rebase_class(getattr(__import__(mod, fromlist=[cls]), cls), stub)
+    wall, cpu = time.perf_counter(), time.process_time()
+    articles = run()
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    result = {
+        "source": source,
+        "articles": articles,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+    out_path.write_text(json.dumps(result))
+
+
+def bench_scrapers(
+    fixtures: Path,
+    sources: tuple[str, ...] = SOURCES,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    seed: int = 0,
+    env: Optional[dict[str, str]] = None,
+    timeout: float = 600.0,
+) -> list[dict]:
+    """
+    Replay the fixture store to each scraper and measure it.
+
+    Every scraper runs in its own subprocess with an empty temporary dump
+    directory, the SOCKS proxy disabled and logging quietened.
+
+    Args:
+        fixtures (Path): Directory of a `FixtureStore`, see `build_fixtures`.
+        sources (tuple[str, ...]): Scrapers to run, in order.
+        latency (float): Seconds of latency added by the stub to each response.
+        jitter (float): Maximum extra random latency in seconds.
+        error_rate (float): Fraction of requests answered with a 503.
+        seed (int): Seed of the latency/error injection.
+        env (Optional[dict[str, str]]): Extra environment for the workers, e.g.
+            to compare storage formats.
+        timeout (float): Seconds after which a worker is killed and reported
+            as timed out (some scrapers retry a failing page forever).
+
+    Returns:
+        list[dict]: One measurement dict per source.
+    """
+    results = []
+    store = FixtureStore(fixtures)
+    with StubServer(store, latency, jitter, error_rate, seed=seed) as stub:
+        for source in sources:
+            with tempfile.TemporaryDirectory(prefix=f"bench-{source}-") as tmp:
+                out = Path(tmp) / "result.json"
+                worker_env = {
+                    **os.environ,
+                    "DSS_SELC_DUMP_PATH": str(Path(tmp) / "dump"),
+                    "DSS_SELC_USE_SOCKS": "0",
+                    "DSS_SELC_LOG_LEVEL": "WARNING",
+                    "NO_PROXY": "127.0.0.1,localhost",
+                    **(env or {}),
+                }
+                before = dict(stub.stats)
+                cmd = [sys.executable, "-m", "dss_selc.bench", "worker"]
+                try:
+                    subprocess.run(
+                        cmd + [source, stub.url, str(out)],
+                        env=worker_env,
+                        check=True,
+                        timeout=timeout,
+                    )
+                    result = json.loads(out.read_text())
+                except subprocess.TimeoutExpired:
+                    result = {"source": source, "error": "timeout"}
+                except subprocess.CalledProcessError as e:
+                    result = {"source": source, "error": f"exit {e.returncode}"}
+            result |= {k: stub.stats[k] - before[k] for k in stub.stats}
+            results.append(result)
+    return results
+
+
+def print_report(results: list[dict]) -> None:
+    print(
+        f"{'source':<14}{'articles':>9}{'art/s':>10}{'cpu ms/art':>12}"
+        f"{'peak MB':>10}{'requests':>10}{'errors':>8}"
+    )
+    for r in results:
+        if "error" in r:
+            print(f"{r['source']:<14}{r['error']:>9}")
+            continue
+        n = max(r["articles"], 1)
+        print(
+            f"{r['source']:<14}{r['articles']:>9}"
+            f"{r['articles'] / r['wall_s']:>10.1f}"
+            f"{1000 * r['cpu_s'] / n:>12.2f}"
+            f"{r['peak_rss_mb']:>10.1f}"
+            f"{r['served'] + r['missing']:>10}"
+            f"{r['injected_errors']:>8}"
+        )
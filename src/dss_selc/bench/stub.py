@@ -0,0 +1,242 @@
+import contextlib
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+STUB_PLACEHOLDER = b"{{STUB}}"
+
+
+def rebase_url(url: str, stub: str) -> str:
+    """
+    Point an absolute site URL at the stub server.
+
+    `https://host/path?q` becomes `{stub}/host/path?q`, so one stub server can
+    stand in for every site the scrapers talk to.
+    """
+    return re.sub(r"^https?://", stub.rstrip("/") + "/", url)
+
+
+def request_key(method: str, path: str, query: str = "", body: bytes = b"") -> str:
+    """
+    Build the lookup key of a request in a fixture index.
+
+    The path has its repeated slashes collapsed, the query is sorted and JSON
+    bodies are canonicalised, so the key does not depend on how `requests`
+    happened to serialise the call.
+    """
+    path = re.sub(r"/{2,}", "/", path)
+    key = f"{method.upper()} {path}"
+    if query:
+        key += "?" + urlencode(sorted(parse_qsl(query, keep_blank_values=True)))
+    if body:
+        with contextlib.suppress(ValueError):
+            body = json.dumps(json.loads(body), sort_keys=True).encode()
+        key += " " + hashlib.sha1(body).hexdigest()[:16]
+    return key
+
+
+class FixtureStore:
+    """
+    Directory of recorded responses, addressed by `request_key`.
+
+    Layout:
+        index.json      {"routes": {key: entry}, "fallbacks": [entry, ...]}
+        pages/NNNNNN    response bodies
+
+    An entry is `{"status": int, "type": str, "file": str}`; fallbacks carry
+    an extra "prefix" and answer any unmatched key that starts with it. Bodies
+    may contain `{{STUB}}`, replaced by the stub's base URL when served.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.pages = self.root / "pages"
+        self.index_path = self.root / "index.json"
+        if self.index_path.exists():
+            with self.index_path.open("r") as f:
+                self.index = json.load(f)
+        else:
+            self.index = {"routes": {}, "fallbacks": []}
+        entries = [*self.index["routes"].values(), *self.index["fallbacks"]]
+        # rerecorded routes keep their key, so count from the highest page file
+        self.next_page = max((int(e["file"]) + 1 for e in entries), default=0)
+
+    def _write_page(self, content: Union[str, bytes]) -> str:
+        self.pages.mkdir(parents=True, exist_ok=True)
+        name = f"{self.next_page:>06}"
+        self.next_page += 1
+        data = content.encode() if isinstance(content, str) else content
+        (self.pages / name).write_bytes(data)
+        return name
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        content: Union[str, bytes],
+        status: int = 200,
+        content_type: str = "text/html",
+        body: bytes = b"",
+    ) -> None:
+        """Record the response of one request made to the live `url`"""
+        parts = urlsplit(rebase_url(url, ""))
+        key = request_key(method, parts.path, parts.query, body)
+        self.index["routes"][key] = {
+            "status": status,
+            "type": content_type,
+            "file": self._write_page(content),
+        }
+
+    def add_fallback(
+        self,
+        method: str,
+        url_prefix: str,
+        content: Union[str, bytes],
+        status: int = 200,
+        content_type: str = "text/html",
+    ) -> None:
+        """Answer every unrecorded request below `url_prefix` with `content`"""
+        prefix = request_key(method, urlsplit(rebase_url(url_prefix, "")).path)
+        self.index["fallbacks"].append(
+            {
+                "prefix": prefix,
+                "status": status,
+                "type": content_type,
+                "file": self._write_page(content),
+            }
+        )
+
+    def save(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self.index_path.open("w") as f:
+            json.dump(self.index, f, indent=4)
+
+    def lookup(self, key: str) -> Optional[dict]:
+        entry = self.index["routes"].get(key)
+        if entry is not None:
+            return entry
+        for fallback in self.index["fallbacks"]:
+            if key.startswith(fallback["prefix"]):
+                return fallback
+        return None
+
+    def read(self, entry: dict) -> bytes:
+        return (self.pages / entry["file"]).read_bytes()
+
+
+class StubServer:
+    """
+    Threaded local HTTP server replaying a `FixtureStore`.
+
+    Args:
+        store (FixtureStore): Recorded responses to serve.
+        latency (float): Seconds added to every response.
+        jitter (float): Extra uniformly random delay, up to this many seconds.
+        error_rate (float): Probability of answering with `error_status`.
+        error_status (int): Status code of injected errors.
+        seed (int): Seed of the latency/error generator, for reproducible runs.
+
+    Usage:
+        with StubServer(FixtureStore(path), latency=0.05) as stub:
+            requests.get(rebase_url("https://example.com/page", stub.url))
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ) -> None:
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"served": 0, "missing": 0, "injected_errors": 0}
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def _draw(self) -> tuple[float, bool]:
+        with self.lock:
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            return delay, self.rng.random() < self.error_rate
+
+    def _count(self, stat: str) -> None:
+        with self.lock:
+            self.stats[stat] += 1
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+            def _reply(self, status: int, content_type: str, data: bytes) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _serve(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                delay, fail = stub._draw()
+                if delay:
+                    time.sleep(delay)
+                if fail:
+                    stub._count("injected_errors")
+                    self._reply(stub.error_status, "text/plain", b"injected")
+                    return
+                parts = urlsplit(self.path)
+                key = request_key(self.command, parts.path, parts.query, body)
+                entry = stub.store.lookup(key)
+                if entry is None:
+                    stub._count("missing")
+                    self._reply(404, "text/plain", key.encode())
+                    return
+                stub._count("served")
+                data = stub.store.read(entry).replace(
+                    STUB_PLACEHOLDER, stub.url.encode()
+                )
+                self._reply(entry["status"], entry["type"], data)
+
+            do_GET = _serve  # noqa: N815
+            do_POST = _serve  # noqa: N815
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
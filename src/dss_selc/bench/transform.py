@@ -0,0 +1,90 @@
+import contextlib
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ENGINES = ("pandas", "arrow")
+
+
+def run_transform_worker(engine: str, out_path: Path) -> None:
+    """
+    Run the transform once with `engine` and write its measurements.
+
+    Meant to be run in a fresh process (see `bench_transform`) so that peak
+    RSS belongs to this engine alone; the dump is read from the directory in
+    `DSS_SELC_DUMP_PATH` and the dataset is written to a temporary directory.
+    """
+    from dss_selc.data_transform.data_processor import DataProcessor
+    from dss_selc.data_transform.transform import json_files, other_sources
+
+    processor = DataProcessor(json_files, engine=engine)
+    with tempfile.TemporaryDirectory(prefix="bench-transform-") as tmp:
+        wall = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            processor.transform(other_sources, Path(tmp) / "articles")
+        wall = time.perf_counter() - wall
+    sources = {**json_files, **other_sources}
+    result = {
+        "engine": engine,
+        "articles": sum(r["rows"] for r in processor.date_report.values()),
+        "sources": len(sources),
+        "build_s": sum(processor.timings.values()),
+        "wall_s": wall,
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+    out_path.write_text(json.dumps(result))
+
+
+def bench_transform(
+    dump: Path,
+    engines: tuple[str, ...] = ENGINES,
+    repeat: int = 3,
+) -> list[dict]:
+    """
+    Time the transform engines on a dump and keep the best of `repeat` runs.
+
+    Args:
+        dump (Path): Dump directory, with the `scraper/` stores.
+        engines (tuple[str, ...]): `DataProcessor` engines to compare.
+        repeat (int): Runs per engine, each in a fresh process.
+
+    Returns:
+        list[dict]: One measurement dict per engine; `build_s` is the time
+            spent turning stores into rows, `wall_s` includes clustering and
+            writing the dataset.
+    """
+    results = []
+    env = {**os.environ, "DSS_SELC_DUMP_PATH": str(dump)}
+    for engine in engines:
+        runs = []
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory(prefix=f"bench-{engine}-") as tmp:
+                out = Path(tmp) / "result.json"
+                cmd = [sys.executable, "-m", "dss_selc.bench", "transform-worker"]
+                subprocess.run(cmd + [engine, str(out)], env=env, check=True)
+                runs.append(json.loads(out.read_text()))
+        best = min(runs, key=lambda r: r["wall_s"])
+        best["build_s"] = min(r["build_s"] for r in runs)
+        best["peak_rss_mb"] = min(r["peak_rss_mb"] for r in runs)
+        results.append(best)
+    return results
+
+
+def print_transform_report(results: list[dict]) -> None:
+    print(
+        f"{'engine':<10}{'articles':>10}{'build s':>10}{'us/art':>9}"
+        f"{'total s':>10}{'peak MB':>10}"
+    )
+    for r in results:
+        n = max(r["articles"], 1)
+        print(
+            f"{r['engine']:<10}{r['articles']:>10}{r['build_s']:>10.2f}"
+            f"{1e6 * r['build_s'] / n:>9.1f}{r['wall_s']:>10.2f}"
+            f"{r['peak_rss_mb']:>10.1f}"
+        )
@@ -0,0 +1,71 @@
+import argparse
+import warnings
+from pathlib import Path
+from typing import Optional
+
+from dss_selc.classify.config import CONFIG_PATH, load_config
+from dss_selc.classify.runner import MODES, run_task
+from dss_selc.classify.servers import PORT, serve
+from dss_selc.classify.tasks import TASKS
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m dss_selc.classify",
+        description="Label article titles with a model served by llama-server",
+    )
+    parser.add_argument("task", choices=list(TASKS))
+    parser.add_argument("--model", required=True, help="model of the config")
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH)
+    parser.add_argument("--in-flight", type=int, help="concurrent requests per server")
+    parser.add_argument(
+        "--url", nargs="+", help="servers to use instead of the configured"
+    )
+    parser.add_argument(
+        "--slot-cache", action="store_true", help="restore and save slot KV caches"
+    )
+    parser.add_argument(
+        "--mode", choices=MODES, default="json", help="how scores are read"
+    )
+    parser.add_argument("--batch", type=int, default=1, help="titles per request")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="ignore the result cache"
+    )
+    parser.add_argument(
+        "--serve", type=int, metavar="N", help="start N local llama-servers first"
+    )
+    parser.add_argument("--port", type=int, default=PORT, help="of the first")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", category=UserWarning)
+    config = load_config(args.config)
+
+    def classify(url: Optional[list[str]]) -> None:
+        run_task(
+            args.task,
+            args.model,
+            config,
+            args.in_flight,
+            url,
+            args.slot_cache,
+            args.mode,
+            args.batch,
+            not args.no_cache,
+        )
+
+    if args.serve:
+        with serve(
+            config,
+            args.model,
+            args.task,
+            args.serve,
+            args.port,
+            parallel=args.in_flight,
+        ) as urls:
+            classify(urls)
+    else:
+        classify(args.url)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import argparse
+import hashlib
+import json
+import sqlite3
+import unicodedata
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+
+from dss_selc.classify.tasks import CLASSIFICATION_PATH
+
+CACHE_PATH = CLASSIFICATION_PATH / "results.sqlite"
+# keys per lookup query, well under SQLite's limit on bound parameters
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key BLOB PRIMARY KEY, model_id TEXT, quantization TEXT, scores TEXT,
+    created TEXT DEFAULT CURRENT_TIMESTAMP
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_model ON results (model_id, quantization);
+"""
+
+
+def normalize_text(text: str) -> str:
+    """NFKC with whitespace collapsed; case is kept, the model sees it"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def scope_digest(scope: tuple[str, str, str, str]) -> bytes:
+    return hashlib.sha256(json.dumps(scope).encode()).digest()
+
+
+def result_key(digest: bytes, text: str) -> bytes:
+    """Key of one text's result within a scope, see `scope_digest`"""
+    return hashlib.sha256(digest + normalize_text(text).encode()).digest()
+
+
+class ResultCache:
+    """
+    Classification results of every model, prompt and title seen so far.
+
+    A result is keyed by a hash of its scope, the (model id, quantization,
+    prompt template, grammar) it was produced with, and the normalized title,
+    so a re-run, a new input file or the same title from another source is
+    answered without a request, while a changed prompt or model misses.
+    Model id and quantization are also stored in the clear, to evict the
+    results of a model version.
+
+    Args:
+        path (Path): SQLite file, created if missing.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get_many(
+        self, scope: tuple[str, str, str, str], texts: Iterable[str]
+    ) -> dict[str, list[float]]:
+        """
+        Look up the results of several texts.
+
+        Args:
+            scope (tuple[str, str, str, str]): Model id, quantization, prompt
+                template and grammar.
+            texts (Iterable[str]): Titles, as passed to the scorer.
+
+        Returns:
+            dict[str, list[float]]: Scores of the texts found, by text.
+        """
+        digest = scope_digest(scope)
+        keys = {result_key(digest, text): text for text in texts}
+        found, chunk = {}, list(keys)
+        for start in range(0, len(chunk), LOOKUP_CHUNK):
+            end = start + LOOKUP_CHUNK
+            part = chunk[start:end]
+            rows = self.conn.execute(
+                "SELECT key, scores FROM results"
+                f" WHERE key IN ({', '.join('?' * len(part))})",
+                part,
+            )
+            found.update({keys[key]: json.loads(scores) for key, scores in rows})
+        return found
+
+    def put_many(
+        self,
+        scope: tuple[str, str, str, str],
+        results: Iterable[tuple[str, list[float]]],
+    ) -> int:
+        """
+        Store (text, scores) results, replacing those already stored.
+
+        Args:
+            scope (tuple[str, str, str, str]): See `get_many`.
+            results (Iterable[tuple[str, list[float]]]): Titles and scores.
+
+        Returns:
+            int: Results written.
+        """
+        digest = scope_digest(scope)
+        model_id, quantization = scope[:2]
+        rows = [
+            (result_key(digest, text), model_id, quantization, json.dumps(scores))
+            for text, scores in results
+        ]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO results (key, model_id, quantization, scores)"
+                " VALUES (?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def evict(self, model_id: str, quantization: Optional[str] = None) -> int:
+        """
+        Drop the results of a model version.
+
+        Args:
+            model_id (str): Model id, as in the model config.
+            quantization (Optional[str]): Only this quantization; None drops
+                every quantization of the model.
+
+        Returns:
+            int: Results dropped.
+        """
+        query, params = "DELETE FROM results WHERE model_id = ?", [model_id]
+        if quantization is not None:
+            query, params = f"{query} AND quantization = ?", [*params, quantization]
+        with self.conn:
+            dropped = self.conn.execute(query, params).rowcount
+        return dropped  # noqa: R504
+
+    def versions(self) -> pd.DataFrame:
+        """Results stored per model id and quantization"""
+        return pd.read_sql(
+            "SELECT model_id, quantization, count(*) AS results, max(created) AS last"
+            " FROM results GROUP BY model_id, quantization ORDER BY model_id",
+            self.conn,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m dss_selc.classify.cache",
+        description="Inspect and evict cached classification results",
+    )
+    parser.add_argument("--path", type=Path, default=CACHE_PATH)
+    parser.add_argument("--evict", metavar="MODEL_ID", help="drop a model's results")
+    parser.add_argument("--quantization", help="only evict this quantization")
+    parser.add_argument("--show", action="store_true", help="results per model")
+    args = parser.parse_args()
+
+    with ResultCache(args.path) as cache:
+        if args.evict:
+            dropped = cache.evict(args.evict, args.quantization)
+            print(f"[*] {dropped} results of {args.evict} dropped")
+        if args.show:
+            print(cache.versions().to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+
+
+def log_path(output: Path) -> Path:
+    """Log directory of an output parquet, e.g. `theme_train_l.log`"""
+    return output.with_suffix(".log")
+
+
+class ResultLog:
+    """
+    Append-only log of the scores of a classification run.
+
+    Every run appends to its own Arrow IPC stream in the log directory, one
+    record batch of article ids and scores per checkpoint, so a checkpoint
+    costs the size of the batch rather than a rewrite of the output. Streams
+    have no footer: after a crash every complete batch reads back and only
+    the one being written is lost.
+
+    Args:
+        path (Path): Log directory, created on the first append.
+        columns (list[str]): Score columns.
+    """
+
+    def __init__(self, path: Path, columns: list[str]) -> None:
+        self.path = Path(path)
+        self.columns = list(columns)
+        self.schema = pa.schema(
+            [("id", pa.string()), *((column, pa.float64()) for column in columns)]
+        )
+        self.sink: Optional[pa.NativeFile] = None
+        self.writer: Optional[pa.ipc.RecordBatchStreamWriter] = None
+
+    def __enter__(self) -> "ResultLog":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.sink.close()
+            self.writer = self.sink = None
+
+    def append(self, ids: list[str], scores: list[list[float]]) -> None:
+        """Write one batch of results; it is on disk when this returns"""
+        if not ids:
+            return
+        if self.writer is None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            name = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.arrow"
+            self.sink = pa.OSFile(str(self.path / name), "wb")
+            self.writer = pa.ipc.new_stream(self.sink, self.schema)
+        arrays = [pa.array(ids, pa.string())]
+        arrays += [pa.array(values, pa.float64()) for values in zip(*scores)]
+        self.writer.write_batch(pa.record_batch(arrays, schema=self.schema))
+
+    def read(self) -> pd.DataFrame:
+        """
+        Every logged result, the latest one per article id.
+
+        Returns:
+            pd.DataFrame: `id` and the score columns.
+        """
+        frames = []
+        for fp in sorted(self.path.glob("*.arrow")):
+            batches = []
+            try:
+                for batch in pa.ipc.open_stream(str(fp)):
+                    batches.append(batch)
+            except (OSError, pa.ArrowInvalid) as e:
+                print(f"[!] {fp.name}: read up to a truncated batch ({e})")
+            if batches:
+                frames.append(pa.Table.from_batches(batches, self.schema).to_pandas())
+        if not frames:
+            return pd.DataFrame(columns=["id", *self.columns])
+        df = pd.concat(frames, ignore_index=True)
+        return df.drop_duplicates("id", keep="last").reset_index(drop=True)
+
+    def clear(self) -> None:
+        """Remove the log, once its results are merged into the output"""
+        self.close()
+        for fp in self.path.glob("*.arrow"):
+            fp.unlink()
+        if self.path.exists():
+            self.path.rmdir()
+
+
+def merge_scores(df: pd.DataFrame, scores: pd.DataFrame, columns: list[str]) -> int:
+    """
+    Write scores into the rows of `df` with the same article id.
+
+    Args:
+        df (pd.DataFrame): Rows with an `id` column, changed in place.
+        scores (pd.DataFrame): `id` and `columns`, one row per id.
+        columns (list[str]): Score columns.
+
+    Returns:
+        int: Rows of `df` updated.
+    """
+    scores = scores.set_index("id")[columns]
+    found = df["id"].isin(scores.index).to_numpy()
+    df.loc[found, columns] = scores.loc[df.loc[found, "id"]].to_numpy()
+    return int(found.sum())
@@ -0,0 +1,160 @@
+import json
+import threading
+import time
+from typing import Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from dss_selc.classify.dispatch import IN_FLIGHT
+from dss_selc.classify.pool import Endpoint, EndpointPool
+from dss_selc.classify.templates import apply_template
+
+# sampling settings sent with every request unless the model config overrides
+OPTIONS = {"temperature": 0.5, "dynatemp_range": 0.0, "cache_prompt": True}
+
+
+class LLMClient:
+    """
+    Client of one llama-server, or of a pool of servers of the same model.
+
+    Requests go through one `requests.Session` whose connection pool holds
+    `in_flight` connections, so concurrent calls from `dispatch` reuse
+    keep-alive connections instead of opening one per title. With several
+    servers every request goes to the least loaded one that answers, see
+    `EndpointPool`.
+
+    With `slots`, each request is sent to a free slot of its server
+    (`id_slot`), where the shared prompt prefix is already in the KV cache.
+
+    Args:
+        url (Union[str, list[str]]): Server root, e.g.
+            "http://localhost:8080", or a list of them.
+        template (str): Chat template, a key of `TEMPLATES`.
+        options (Optional[dict]): Sampling settings added to `OPTIONS`.
+        in_flight (int): Connections kept in the pool, for all servers.
+        timeout (float): Seconds to wait for one completion.
+        slots (Optional[int]): Parallel slots of each server (`-np`) to
+            spread requests over; None lets the servers pick.
+    """
+
+    def __init__(
+        self,
+        url: Union[str, list[str]],
+        template: str,
+        options: Optional[dict] = None,
+        in_flight: int = IN_FLIGHT,
+        timeout: float = 120.0,
+        slots: Optional[int] = None,
+    ) -> None:
+        urls = [url] if isinstance(url, str) else list(url)
+        self.pool = EndpointPool(urls, self.probe, slots)
+        self.template = template
+        self.options = {**OPTIONS, **(options or {})}
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=len(urls), pool_maxsize=in_flight)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "prompt_tokens": 0,
+            "cached_tokens": 0,
+            "fallbacks": 0,
+        }
+
+    def __enter__(self) -> "LLMClient":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+    @property
+    def urls(self) -> list[str]:
+        return [endpoint.url for endpoint in self.pool.endpoints]
+
+    def probe(self, endpoint: Endpoint) -> bool:
+        """Whether a server is up and has its model loaded"""
+        try:
+            response = self.session.get(f"{endpoint.url}/health", timeout=5)
+        except requests.RequestException:
+            return False
+        return response.status_code == 200
+
+    def health(self) -> bool:
+        """Probe every server; whether at least one of them is ready"""
+        return self.pool.check() > 0
+
+    def complete_raw(self, prompt: str, **options: object) -> str:
+        """
+        Complete a prompt that already is in the model's chat template.
+
+        Args:
+            prompt (str): Full prompt.
+            **options: Request fields overriding the client's options.
+
+        Returns:
+            str: Generated text.
+        """
+        return self.request(prompt, **options)["content"]
+
+    def complete(self, prompt: str, **options: object) -> str:
+        """Complete a task prompt, wrapped in the model's chat template"""
+        return self.complete_raw(apply_template(self.template, prompt), **options)
+
+    def request(self, prompt: str, **options: object) -> dict:
+        """POST `/completion` and return the server's whole answer"""
+        payload = {"prompt": prompt, **self.options, **options}
+        endpoint, slot = self.pool.acquire()
+        if slot is not None:
+            payload.setdefault("id_slot", slot)
+        start = time.perf_counter()
+        # any exception (connection, timeout, a broken chunked body) leaves the
+        # server out for a while; the slot is given back whatever happens
+        seconds, down = None, True
+        try:
+            response = self.session.post(
+                f"{endpoint.url}/completion",
+                data=json.dumps(payload),
+                timeout=self.timeout,
+            )
+            # 503: the server is still loading its model
+            down = response.status_code == 503
+            if response.ok:
+                seconds = time.perf_counter() - start
+        finally:
+            self.pool.release(endpoint, slot, seconds, down)
+        response.raise_for_status()
+        answer = response.json()
+        timings = answer.get("timings", {})
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["prompt_tokens"] += timings.get("prompt_n", 0)
+            self.stats["cached_tokens"] += answer.get("tokens_cached", 0)
+        return answer
+
+    def slot_action(self, url: str, slot: int, action: str, filename: str) -> dict:
+        """
+        Save or restore the KV cache of a slot (`--slot-save-path` needed).
+
+        Args:
+            url (str): Server root, one of `urls`.
+            slot (int): Slot id.
+            action (str): "save" or "restore".
+            filename (str): File under the server's slot save path.
+
+        Returns:
+            dict: The server's answer, with `n_saved` or `n_restored`.
+        """
+        response = self.session.post(
+            f"{url}/slots/{slot}",
+            params={"action": action},
+            data=json.dumps({"filename": filename}),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,46 @@
+import json
+from pathlib import Path
+from typing import Optional, Union
+
+from dss_selc.utils import PRJ_PATH
+
+# model -> chat template, "gguf" file (for `dss_selc.classify.servers`),
+# "model_id" and "quantization" of the served weights
+# (the model version results are cached under), optional "options" (sampling
+# settings) and "in_flight" (per server), and per task the server "url" (or a
+# list of servers to balance over) and "output" file
+CONFIG_PATH = PRJ_PATH / "categorize" / "models.json"
+
+
+def load_config(path: Path = CONFIG_PATH) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def get_endpoint(config: dict, model: str, task: str) -> dict:
+    """
+    Settings to run `task` with `model`.
+
+    Args:
+        config (dict): Loaded model config.
+        model (str): Model name, a key of the config.
+        task (str): Task name, a key of `TASKS`.
+
+    Returns:
+        dict: The model's settings with those of the task merged in.
+    """
+    if model not in config:
+        raise ValueError(f"No model {model!r} in the config, have {list(config)}")
+    settings = config[model]
+    if task not in settings:
+        raise ValueError(f"Model {model!r} has no endpoint for task {task!r}")
+    shared = {k: v for k, v in settings.items() if not isinstance(v, dict)}
+    return {"options": settings.get("options", {}), **shared, **settings[task]}
+
+
+def server_urls(
+    endpoint: dict, url: Optional[Union[str, list[str]]] = None
+) -> list[str]:
+    """Servers of an endpoint, or `url` (one or several) when given"""
+    urls = url or endpoint["url"]
+    return [urls] if isinstance(urls, str) else list(urls)
@@ -0,0 +1,112 @@
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Hashable, Iterable, Iterator, Optional
+
+# requests kept in flight; match it to the server's parallel slots (`-np`)
+IN_FLIGHT = int(os.environ.get("DSS_SELC_LLM_IN_FLIGHT", "4"))
+
+
+def call_with_retries(
+    fn: Callable[[object], object],
+    item: object,
+    retries: int = 3,
+    backoff: float = 1.0,
+) -> tuple[object, int]:
+    """
+    Call `fn(item)`, retrying failures with exponential backoff.
+
+    Args:
+        fn (Callable[[object], object]): Request to make.
+        item (object): Its argument.
+        retries (int): Attempts after the first one.
+        backoff (float): Seconds before the first retry, doubled each time.
+
+    Returns:
+        tuple[object, int]: The result and the number of attempts it took.
+            The last exception is raised once every attempt has failed.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return fn(item), attempt + 1
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2**attempt)
+
+
+def dispatch(
+    fn: Callable[[object], object],
+    items: Iterable[tuple[Hashable, object]],
+    in_flight: int = IN_FLIGHT,
+    retries: int = 3,
+    backoff: float = 1.0,
+    ordered: bool = False,
+) -> Iterator[tuple[Hashable, Optional[object], Optional[Exception]]]:
+    """
+    Run `fn` over `items` with a bounded number of calls in flight.
+
+    llama-server batches the requests of its parallel slots together, so a
+    client waiting for each answer before sending the next leaves all but
+    one slot idle. Calls run on a pool of `in_flight` threads; `items` is
+    consumed lazily, only as fast as slots free up, so a generator that
+    skips already labelled rows can feed it directly.
+
+    Args:
+        fn (Callable[[object], object]): Blocking call, e.g. one `/completion`
+            request; anything it raises is retried.
+        items (Iterable[tuple[Hashable, object]]): (key, argument) pairs; the
+            key, e.g. a row number, is handed back with the result.
+        in_flight (int): Calls running at once.
+        retries (int): Retries per item, see `call_with_retries`.
+        backoff (float): Seconds before the first retry.
+        ordered (bool): Yield results in the order of `items` instead of as
+            they complete; at most `4 * in_flight` results wait for a slower
+            predecessor before submission pauses.
+
+    Yields:
+        tuple: (key, result, None) for a success or (key, None, exception)
+            once every attempt for the item has failed.
+
+    Usage:
+        for ind, response, error in dispatch(classify, pending(), in_flight=4):
+            ...
+    """
+    items = iter(items)
+    pending: dict[Future, tuple[int, Hashable]] = {}
+    done: dict[int, tuple] = {}
+    submitted = yielded = 0
+    exhausted = False
+    with ThreadPoolExecutor(max_workers=in_flight) as pool:
+        try:
+            while True:
+                while not exhausted and len(pending) < in_flight:
+                    if ordered and submitted - yielded >= 4 * in_flight:
+                        break
+                    try:
+                        key, item = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    future = pool.submit(call_with_retries, fn, item, retries, backoff)
+                    pending[future] = (submitted, key)
+                    submitted += 1
+                if not pending and not done:
+                    return
+                if pending:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        seq, key = pending.pop(future)
+                        error = future.exception()
+                        result = None if error else future.result()[0]
+                        done[seq] = (key, result, error)
+                if not ordered:
+                    for seq in sorted(done):
+                        yield done.pop(seq)
+                        yielded += 1
+                while yielded in done:
+                    yield done.pop(yielded)
+                    yielded += 1
+        finally:
+            # the caller stopped early: drop what has not started yet
+            pool.shutdown(wait=True, cancel_futures=True)
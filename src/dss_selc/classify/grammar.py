@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+
+# primitive rules, as llama.cpp's json-schema-to-grammar writes them
+PRIMITIVES = {
+    "decimal-part": "[0-9]{1,16}",
+    "integral-part": "[0] | [1-9] [0-9]{0,15}",
+    "number": (
+        '("-"? integral-part) ("." decimal-part)? ([eE] [-+]? integral-part)? space'
+    ),
+    "space": '| " " | "\\n" [ \\t]{0,20}',
+}
+
+
+def load_schema(path: Path) -> dict:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _object_rules(schema: dict) -> tuple[str, dict[str, str]]:
+    """Body of an object rule and the rules it uses, for a flat number schema"""
+    keys = list(schema["properties"])
+    for key in keys:
+        if schema["properties"][key].get("type") != "number":
+            raise ValueError(f"Only number properties are supported, not {key!r}")
+    if set(schema.get("required", keys)) != set(keys):
+        raise ValueError("Every property of the schema must be required")
+    rules = {f"{key}-kv": f'"\\"{key}\\"" space ":" space number' for key in keys}
+    pairs = ' "," space '.join(f"{key}-kv" for key in keys)
+    return f'"{{" space {pairs} "}}" space', rules
+
+
+def _render(rules: dict[str, str]) -> str:
+    return "\n".join(f"{name} ::= {body}" for name, body in sorted(rules.items()))
+
+
+def object_grammar(schema: dict) -> str:
+    """GBNF grammar of one answer object, e.g. `theme_grammar.gbnf`"""
+    body, rules = _object_rules(schema)
+    return _render({**PRIMITIVES, **rules, "root": body})
+
+
+def array_grammar(schema: dict, k: int) -> str:
+    """
+    GBNF grammar of a JSON array of exactly `k` answer objects.
+
+    Args:
+        schema (dict): JSON schema of one answer, e.g. `theme_grammar.json`:
+            an object of required number properties.
+        k (int): Number of objects.
+
+    Returns:
+        str: Grammar whose root is `[obj, obj, ...]`, usable as the
+            `grammar` field of a `/completion` request.
+    """
+    body, rules = _object_rules(schema)
+    items = ' "," space '.join(["item"] * k)
+    return _render(
+        {**PRIMITIVES, **rules, "item": body, "root": f'"[" space {items} "]" space'}
+    )
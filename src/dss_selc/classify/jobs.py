@@ -0,0 +1,356 @@
+import argparse
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import warnings
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from dss_selc.classify.config import CONFIG_PATH, get_endpoint, load_config
+from dss_selc.classify.runner import MODES, model_output, read_input, run_task, shard_of
+from dss_selc.classify.servers import PORT, serve
+from dss_selc.classify.tasks import CLASSIFICATION_PATH, TASKS, get_task
+from dss_selc.data_transform.aggregates import Aggregates
+from dss_selc.data_transform.dedup import propagate_labels
+
+JOBS_PATH = CLASSIFICATION_PATH / "jobs"
+SHARDS = 16
+# seconds between two heartbeats of a worker, and without one after which its
+# shard is handed to another worker
+HEARTBEAT = 60.0
+STALE = 600.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS job (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS shards (
+    shard INTEGER PRIMARY KEY, rows INTEGER, status TEXT DEFAULT 'pending',
+    worker TEXT, attempts INTEGER DEFAULT 0, heartbeat REAL, finished REAL,
+    error TEXT
+);
+"""
+
+
+def job_path(task: str, model: str, mode: str = "json", root: Path = JOBS_PATH) -> Path:
+    return root / (f"{task}-{model}" if mode == "json" else f"{task}-{model}-{mode}")
+
+
+def shard_output(job: Path, shard: int) -> Path:
+    return job / "shards" / f"shard-{shard:05}.parquet"
+
+
+class JobManifest:
+    """
+    Shards of a sharded classification job and the state of each.
+
+    The manifest is a SQLite file in the job directory; workers on several
+    machines can share it over a network file system with working locks.
+    A shard is `pending` until a worker claims it (`running`, with the
+    worker's name and heartbeat) and `done` once its output is written. A
+    running shard whose worker stopped sending heartbeats for `STALE`
+    seconds is claimed again, and resumes from the result log of its
+    output (see `ResultLog`).
+
+    Args:
+        job (Path): Job directory, created if missing.
+    """
+
+    def __init__(self, job: Path) -> None:
+        self.job = Path(job)
+        self.job.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(
+            self.job / "manifest.sqlite", timeout=30, isolation_level=None
+        )
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "JobManifest":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def meta(self) -> dict:
+        """Settings the job was created with"""
+        rows = self.conn.execute("SELECT key, value FROM job")
+        return {key: json.loads(value) for key, value in rows}
+
+    def create(self, meta: dict, rows: np.ndarray) -> bool:
+        """
+        Record the job's settings and its shards' row counts, once.
+
+        Returns:
+            bool: Whether the job was created; False if it already existed.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self.conn.execute("SELECT count(*) FROM shards").fetchone()[0]:
+                return False
+            self.conn.executemany(
+                "INSERT INTO job VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in meta.items()],
+            )
+            self.conn.executemany(
+                "INSERT INTO shards (shard, rows) VALUES (?, ?)",
+                [(shard, int(count)) for shard, count in enumerate(rows)],
+            )
+        finally:
+            self.conn.execute("COMMIT")
+        return True
+
+    def claim(self, worker: str, stale: float = STALE) -> Optional[int]:
+        """Take the next pending (or abandoned) shard; None when none is left"""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT shard FROM shards WHERE status = 'pending'"
+                " OR (status = 'running' AND heartbeat < ?) ORDER BY shard LIMIT 1",
+                (now - stale,),
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE shards SET status = 'running', worker = ?,"
+                    " attempts = attempts + 1, heartbeat = ? WHERE shard = ?",
+                    (worker, now, row[0]),
+                )
+        finally:
+            self.conn.execute("COMMIT")
+        return None if row is None else row[0]
+
+    def heartbeat(self, shard: int, worker: str) -> None:
+        self.conn.execute(
+            "UPDATE shards SET heartbeat = ? WHERE shard = ? AND worker = ?",
+            (time.time(), shard, worker),
+        )
+
+    def finish(self, shard: int, worker: str, error: Optional[str] = None) -> None:
+        """Mark a shard done, or pending again after an `error`"""
+        status = "done" if error is None else "pending"
+        self.conn.execute(
+            "UPDATE shards SET status = ?, finished = ?, error = ?"
+            " WHERE shard = ? AND worker = ?",
+            (status, time.time(), error, shard, worker),
+        )
+
+    def status(self) -> pd.DataFrame:
+        return pd.read_sql("SELECT * FROM shards ORDER BY shard", self.conn)
+
+
+def create_job(
+    task: str,
+    model: str,
+    shards: int = SHARDS,
+    mode: str = "json",
+    batch: int = 1,
+    root: Path = JOBS_PATH,
+) -> Path:
+    """
+    Split a task's input into shards by article id hash.
+
+    Args:
+        task (str): Key of `TASKS`.
+        model (str): Model of the config.
+        shards (int): Number of shards.
+        mode (str): Scoring mode, see `run_task`.
+        batch (int): Titles per request, see `run_task`.
+        root (Path): Directory of the jobs.
+
+    Returns:
+        Path: The job directory; an existing job is left as it is.
+    """
+    spec = get_task(task)
+    job = job_path(task, model, mode, root)
+    ids = read_input(spec, columns=["id"])["id"]
+    rows = np.bincount(shard_of(ids, shards), minlength=shards)
+    meta = {"task": task, "model": model, "shards": shards, "mode": mode}
+    with JobManifest(job) as manifest:
+        if manifest.create({**meta, "batch": batch}, rows):
+            print(f"[*] {job.name}: {len(ids)} rows in {shards} shards")
+        else:
+            print(f"[!] {job.name} exists, left as it is")
+    return job
+
+
+def work(
+    job: Path,
+    worker: Optional[str] = None,
+    config: Optional[dict] = None,
+    in_flight: Optional[int] = None,
+    url: Optional[list[str]] = None,
+    max_shards: Optional[int] = None,
+) -> int:
+    """
+    Claim and classify shards of a job until none is left.
+
+    Each shard is a `run_task` with its own output in the job directory, so
+    an interrupted shard resumes from its result log when it is claimed
+    again. A background thread sends heartbeats while a shard runs. A shard
+    that fails is put back as pending and the worker stops.
+
+    Args:
+        job (Path): Job directory, see `create_job`.
+        worker (Optional[str]): Name recorded in the manifest; host and pid
+            by default.
+        config (Optional[dict]): Model config, `CONFIG_PATH` if None.
+        in_flight (Optional[int]): Concurrent requests per server.
+        url (Optional[list[str]]): Servers to use instead of the configured.
+        max_shards (Optional[int]): Stop after this many shards.
+
+    Returns:
+        int: Shards this worker finished.
+    """
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    with JobManifest(job) as manifest:
+        meta = manifest.meta()
+    if not meta:
+        raise ValueError(f"No job at {job}, see create_job")
+    finished = 0
+    while max_shards is None or finished < max_shards:
+        with JobManifest(job) as manifest:
+            shard = manifest.claim(worker)
+        if shard is None:
+            break
+        print(f"[*] {worker}: shard {shard + 1}/{meta['shards']} of {job.name}")
+        stop = threading.Event()
+        beats = threading.Thread(
+            target=_beat, args=(job, shard, worker, stop), daemon=True
+        )
+        beats.start()
+        try:
+            run_task(
+                meta["task"],
+                meta["model"],
+                config,
+                in_flight,
+                url,
+                mode=meta["mode"],
+                batch=meta["batch"],
+                shard=(shard, meta["shards"]),
+                output=shard_output(job, shard),
+            )
+        except BaseException as e:
+            stop.set()
+            with JobManifest(job) as manifest:
+                manifest.finish(shard, worker, repr(e))
+            raise
+        stop.set()
+        with JobManifest(job) as manifest:
+            manifest.finish(shard, worker)
+        finished += 1
+    print(f"[*] {worker}: {finished} shards done, nothing left to claim")
+    return finished
+
+
+def _beat(job: Path, shard: int, worker: str, stop: threading.Event) -> None:
+    while not stop.wait(HEARTBEAT):
+        # a manifest locked for a while (e.g. on a network file system) must
+        # not end the heartbeats, or the shard is reclaimed while it runs
+        try:
+            with JobManifest(job) as manifest:
+                manifest.heartbeat(shard, worker)
+        except sqlite3.Error as e:
+            print(f"[!] {worker}: heartbeat of shard {shard} failed ({e}), retrying")
+
+
+def merge_job(job: Path, config: Optional[dict] = None) -> Path:
+    """
+    Join the shard outputs of a finished job into the model's output file.
+
+    Rows are put back in input order, labels are copied across
+    near-duplicates of different shards and the aggregates are updated.
+
+    Args:
+        job (Path): Job directory.
+        config (Optional[dict]): Model config, `CONFIG_PATH` if None.
+
+    Returns:
+        Path: The output file, e.g. `solar_theme/theme_train_l.parquet`.
+    """
+    with JobManifest(job) as manifest:
+        meta, status = manifest.meta(), manifest.status()
+    left = status.loc[status["status"] != "done", "shard"].tolist()
+    if left:
+        raise RuntimeError(f"Shards {left} of {job.name} are not done")
+    spec = get_task(meta["task"])
+    endpoint = get_endpoint(
+        load_config() if config is None else config, meta["model"], meta["task"]
+    )
+    columns = list(spec["labels"].values())
+    df = pd.concat(
+        [pd.read_parquet(shard_output(job, shard)) for shard in status["shard"]]
+    )
+    df = df.sort_index().reset_index(drop=True)
+    propagate_labels(df, columns)
+    output = model_output(spec, endpoint, meta["mode"])
+    output.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(output)
+    with Aggregates() as aggregates:
+        aggregates.update_labels(df, columns)
+    print(f"[*] {len(df)} rows of {len(status)} shards written to {output}")
+    return output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m dss_selc.classify.jobs",
+        description="Sharded classification jobs shared by several workers",
+    )
+    parser.add_argument("command", choices=["create", "work", "status", "merge"])
+    parser.add_argument("task", choices=list(TASKS))
+    parser.add_argument("--model", required=True, help="model of the config")
+    parser.add_argument("--mode", choices=MODES, default="json")
+    parser.add_argument("--jobs", type=Path, default=JOBS_PATH)
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH)
+    parser.add_argument("--shards", type=int, default=SHARDS, help="create")
+    parser.add_argument("--batch", type=int, default=1, help="create")
+    parser.add_argument("--worker", help="work: name in the manifest")
+    parser.add_argument("--in-flight", type=int, help="work: per server")
+    parser.add_argument("--url", nargs="+", help="work: servers to use")
+    parser.add_argument("--max-shards", type=int, help="work: stop after these")
+    parser.add_argument(
+        "--serve", type=int, metavar="N", help="work: start N local llama-servers"
+    )
+    parser.add_argument("--port", type=int, default=PORT, help="work: of the first")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore", category=UserWarning)
+    job = job_path(args.task, args.model, args.mode, args.jobs)
+    if args.command == "create":
+        create_job(args.task, args.model, args.shards, args.mode, args.batch, args.jobs)
+    elif args.command == "work" and args.serve:
+        config = load_config(args.config)
+        with serve(
+            config,
+            args.model,
+            args.task,
+            args.serve,
+            args.port,
+            parallel=args.in_flight,
+        ) as urls:
+            work(job, args.worker, config, args.in_flight, urls, args.max_shards)
+    elif args.command == "work":
+        work(
+            job,
+            args.worker,
+            load_config(args.config),
+            args.in_flight,
+            args.url,
+            args.max_shards,
+        )
+    elif args.command == "status":
+        with JobManifest(job) as manifest:
+            print(manifest.status().to_string(index=False))
+    elif args.command == "merge":
+        merge_job(job, load_config(args.config))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import math
+
+# candidates the server reports for the label token; the label letters are
+# all but always among them
+N_PROBS = 20
+# request fields of the logprob mode: one token, its candidates, and no
+# grammar, as the servers default to the JSON answer grammar
+LOGPROB_OPTIONS = {"n_predict": 1, "n_probs": N_PROBS, "grammar": ""}
+
+
+def top_probs(answer: dict) -> dict[str, float]:
+    """
+    Probabilities of the candidates for the first generated token.
+
+    Reads both layouts of llama-server's `completion_probabilities`: the
+    older `probs` list of `tok_str`/`prob` and the OpenAI-style
+    `top_logprobs` list of `token`/`logprob`. Candidates differing only in
+    surrounding whitespace (" A" and "A") are merged.
+    """
+    first = answer["completion_probabilities"][0]
+    if "top_logprobs" in first:
+        candidates = [
+            (c["token"], math.exp(c["logprob"])) for c in first["top_logprobs"]
+        ]
+    else:
+        candidates = [(c["tok_str"], c["prob"]) for c in first["probs"]]
+    probs = {}
+    for token, prob in candidates:
+        probs[token.strip()] = probs.get(token.strip(), 0.0) + prob
+    return probs
+
+
+def choice_probs(answer: dict, choices: dict[str, str]) -> dict[str, float]:
+    """
+    Distribution over the label tokens of a single-token answer.
+
+    Args:
+        answer (dict): `/completion` answer of a request with `n_probs`.
+        choices (dict[str, str]): Answer key -> label token.
+
+    Returns:
+        dict[str, float]: Probability of every key, renormalized over the
+            label tokens so they sum to 1.
+    """
+    probs = top_probs(answer)
+    mass = {key: probs.get(token, 0.0) for key, token in choices.items()}
+    total = sum(mass.values())
+    if total == 0:
+        raise ValueError("None of the label tokens is among the top candidates")
+    return {key: prob / total for key, prob in mass.items()}
@@ -0,0 +1,165 @@
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+
+# seconds an endpoint that stopped answering is left out before it is probed
+DOWN_FOR = 30.0
+# weight of the latest request in an endpoint's moving average latency
+LATENCY_ALPHA = 0.2
+
+
+class Endpoint:
+    """One llama-server of a pool, with what the pool measured of it"""
+
+    def __init__(self, url: str, slots: Optional[int] = None) -> None:
+        self.url = url.rstrip("/")
+        self.slots = slots
+        # slot ids not serving a request; the last released is reused first,
+        # its KV cache holds the latest prompt
+        self.free = list(range(slots)) if slots else []
+        self.outstanding = 0
+        self.latency: Optional[float] = None
+        self.requests = 0
+        self.failures = 0
+        self.down_until = 0.0
+        self.probing = False
+        self.draining = False
+
+    @property
+    def available(self) -> bool:
+        return not self.draining and self.down_until == 0.0
+
+
+class EndpointPool:
+    """
+    llama-server instances serving the same model, balanced per request.
+
+    Each request goes to the available endpoint with the shortest expected
+    wait, (requests in flight + 1) times its moving average latency, so a
+    busy or slow server gets proportionally fewer requests and throughput
+    grows with the number of servers. With `slots`, a request also takes a
+    free slot of its endpoint (`id_slot`), which already holds the shared
+    prompt prefix in its KV cache.
+
+    An endpoint that stops answering (connection error, timeout, broken
+    answer, 503) is left out for `DOWN_FOR` seconds while the caller retries
+    its requests on the others, then probed on `/health` before it gets
+    requests again. `drain` leaves one out by hand: it gets no new requests
+    and those in flight finish.
+
+    Args:
+        urls (list[str]): Server roots.
+        probe (Callable[[Endpoint], bool]): Health check of one endpoint.
+        slots (Optional[int]): Parallel slots (`-np`) of every server; None
+            lets the servers pick.
+    """
+
+    def __init__(
+        self,
+        urls: list[str],
+        probe: Callable[[Endpoint], bool],
+        slots: Optional[int] = None,
+    ) -> None:
+        if not urls:
+            raise ValueError("An endpoint pool needs at least one server")
+        self.endpoints = [Endpoint(url, slots) for url in urls]
+        self.probe = probe
+        self.lock = threading.Lock()
+
+    def check(self, endpoints: Optional[list[Endpoint]] = None) -> int:
+        """Probe endpoints (all by default), update them and count those up"""
+        up = 0
+        for endpoint in endpoints or self.endpoints:
+            ok = self.probe(endpoint)
+            with self.lock:
+                endpoint.probing = False
+                endpoint.down_until = 0.0 if ok else time.monotonic() + DOWN_FOR
+            up += ok
+        return up
+
+    def drain(self, url: str) -> None:
+        """Send no new requests to the endpoint at `url`"""
+        for endpoint in self.endpoints:
+            if endpoint.url == url.rstrip("/"):
+                endpoint.draining = True
+
+    def wake(self, now: Optional[float] = None) -> None:
+        """Probe the endpoints left out until before `now` (all if None)"""
+        due = float("inf") if now is None else now
+        with self.lock:
+            waking = [
+                e
+                for e in self.endpoints
+                if 0.0 < e.down_until <= due and not (e.draining or e.probing)
+            ]
+            for endpoint in waking:
+                endpoint.probing = True
+        if waking:
+            self.check(waking)
+
+    def pick(self) -> Optional[tuple[Endpoint, Optional[int]]]:
+        with self.lock:
+            ready = [e for e in self.endpoints if e.available]
+            if not ready:
+                return None
+            known = [e.latency for e in ready if e.latency is not None]
+            default = sum(known) / len(known) if known else 1.0
+
+            def wait(e: Endpoint) -> float:
+                latency = default if e.latency is None else e.latency
+                return (e.outstanding + 1) * latency
+
+            best = min(ready, key=wait)
+            best.outstanding += 1
+            return best, best.free.pop() if best.free else None
+
+    def acquire(self) -> tuple[Endpoint, Optional[int]]:
+        """
+        Pick the endpoint (and slot) for one request.
+
+        Returns:
+            tuple[Endpoint, Optional[int]]: The endpoint, counted as having
+                one more request in flight until `release`, and a free slot.
+        """
+        self.wake(time.monotonic())
+        choice = self.pick()
+        if choice is None:
+            # every server is out: probe them now instead of waiting DOWN_FOR
+            self.wake()
+            choice = self.pick()
+        if choice is None:
+            raise requests.ConnectionError("No llama-server of the pool is up")
+        return choice
+
+    def release(
+        self,
+        endpoint: Endpoint,
+        slot: Optional[int],
+        seconds: Optional[float] = None,
+        down: bool = False,
+    ) -> None:
+        """
+        Return what `acquire` gave out.
+
+        Args:
+            endpoint (Endpoint): Endpoint of the request.
+            slot (Optional[int]): Its slot.
+            seconds (Optional[float]): Duration of an answered request, added
+                to the latency average.
+            down (bool): The server did not answer; leave it out for a while.
+        """
+        with self.lock:
+            endpoint.outstanding -= 1
+            if slot is not None:
+                endpoint.free.append(slot)
+            if down:
+                endpoint.failures += 1
+                endpoint.down_until = time.monotonic() + DOWN_FOR
+            elif seconds is not None:
+                endpoint.requests += 1
+                if endpoint.latency is None:
+                    endpoint.latency = seconds
+                else:
+                    endpoint.latency += LATENCY_ALPHA * (seconds - endpoint.latency)
@@ -0,0 +1,40 @@
+from typing import Any, Callable, Iterable
+
+from spacy_llm.registry import registry
+
+from dss_selc.classify.client import LLMClient
+from dss_selc.classify.dispatch import IN_FLIGHT, dispatch
+
+
+@registry.llm_models("CustomRESTModel.v1")
+def custom_rest_model(
+    url: str, config: dict[str, Any], template: str = "llama3"
+) -> Callable[[Iterable[Iterable[str]]], Iterable[Iterable[str]]]:
+    """
+    spacy-llm model backed by llama-server, for `[components.llm.model]`.
+
+    Importing this module registers it; the prompts of each batch of docs
+    are sent `IN_FLIGHT` at a time.
+
+    Args:
+        url (str): `/completion` endpoint or server root.
+        config (dict[str, Any]): Sampling settings sent with every prompt.
+        template (str): Chat template, a key of `TEMPLATES`.
+    """
+    client = LLMClient(url.removesuffix("/completion"), template, config)
+
+    def query_llm(prompts: Iterable[Iterable[str]]) -> Iterable[Iterable[str]]:
+        prompts = [list(prompts_for_doc) for prompts_for_doc in prompts]
+        flat = [
+            ((doc, k), prompt)
+            for doc, prompts_for_doc in enumerate(prompts)
+            for k, prompt in enumerate(prompts_for_doc)
+        ]
+        result = [[None] * len(prompts_for_doc) for prompts_for_doc in prompts]
+        for (doc, k), answer, error in dispatch(client.complete, flat, IN_FLIGHT):
+            if error is not None:
+                raise error
+            result[doc][k] = answer
+        return result
+
+    return query_llm
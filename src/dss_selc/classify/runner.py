@@ -0,0 +1,320 @@
+import zlib
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import requests
+
+from dss_selc.classify.cache import ResultCache
+from dss_selc.classify.checkpoint import ResultLog, log_path, merge_scores
+from dss_selc.classify.client import LLMClient
+from dss_selc.classify.config import get_endpoint, load_config, server_urls
+from dss_selc.classify.dispatch import IN_FLIGHT, dispatch
+from dss_selc.classify.scorer import batched, make_scorer, prompt_layout
+from dss_selc.classify.tasks import get_task
+from dss_selc.data_transform.aggregates import UNLABELLED, Aggregates
+from dss_selc.data_transform.dataset import read_articles
+from dss_selc.data_transform.dedup import duplicate_mask, propagate_labels
+
+# results per checkpoint, appended to the run's `ResultLog`
+COMMIT_EVERY = 10
+# "json": the model writes a JSON object of scores; "logprobs": it writes one
+# label token and the scores are its candidates' probabilities
+MODES = ("json", "logprobs")
+
+
+def shard_of(ids: pd.Series, shards: int) -> np.ndarray:
+    """Shard of every article id, the same on every run and machine"""
+    hashes = (zlib.crc32(id_.encode()) % shards for id_ in ids)
+    return np.fromiter(hashes, dtype=np.int64, count=len(ids))
+
+
+def read_input(spec: dict, columns: Optional[list[str]] = None) -> pd.DataFrame:
+    """
+    Rows a task classifies: its input parquet, or the article dataset.
+
+    Args:
+        spec (dict): Task spec, see `TASKS`.
+        columns (Optional[list[str]]): Columns to read, all by default.
+
+    Raises:
+        ValueError: The input has no `id` column; it was written before the
+            dataset had article ids and has to be rebuilt from it.
+    """
+    if spec["input"] is None:
+        return read_articles(columns=columns)
+    if "id" not in pq.read_schema(spec["input"]).names:
+        raise ValueError(
+            f"{spec['input']} has no id column, it predates the article ids of"
+            " the dataset; rebuild it from the current dataset (run the solar"
+            " task and its Bayesian classifier again)"
+        )
+    return pd.read_parquet(spec["input"], columns=columns)
+
+
+def load_rows(
+    spec: dict, output: Path, shard: Optional[tuple[int, int]] = None
+) -> pd.DataFrame:
+    """
+    Resume from `output`, or start from the task input with empty labels.
+
+    Args:
+        spec (dict): Task spec, see `TASKS`.
+        output (Path): Output parquet of the run.
+        shard (Optional[tuple[int, int]]): (index, count): keep only the
+            input rows of this shard, see `shard_of`. Rows keep their input
+            row numbers as index, so shards merge back in input order.
+    """
+    if output.exists():
+        print("df exist, will start from it.")
+        df = pd.read_parquet(output)
+        if "id" not in df:
+            raise ValueError(
+                f"{output} has no id column, it predates the article ids of the"
+                " dataset; move it away to classify the input again"
+            )
+        return df
+    print("df doesn't exist, starting from scratch.")
+    df = read_input(spec)
+    if shard is not None:
+        index, count = shard
+        df = df[shard_of(df["id"], count) == index]
+    for column in spec["labels"].values():
+        df[column] = UNLABELLED
+    return df
+
+
+def pending_rows(
+    df: pd.DataFrame, spec: dict, duplicates: np.ndarray
+) -> Iterator[tuple[int, str]]:
+    """Row numbers and titles still to classify, in order"""
+    columns = list(spec["labels"].values())
+    last = df.columns.get_loc(columns[-1])
+    gate = df.columns.get_loc(columns[0]) - 1
+    title = df.columns.get_loc("title")
+    for ind in range(len(df)):
+        if spec["limit"] is not None and ind > spec["limit"]:
+            print("Reached End, exiting!")
+            return
+        if df.iloc[ind, last] != UNLABELLED:
+            print(f"[{ind:>05}/{len(df):>05}] Already categorized")
+            continue
+        if duplicates[ind]:
+            print(f"[{ind:>05}/{len(df):>05}] Near-duplicate, copying labels later")
+            continue
+        if spec["gate"] is not None and df.iloc[ind, gate] < spec["gate"]:
+            print(f"[{ind:>05}/{len(df):>05}] Not solar-related")
+            continue
+        yield ind, df.iloc[ind, title]
+
+
+def model_output(spec: dict, endpoint: dict, mode: str = "json") -> Path:
+    """Output parquet of a task run with one model"""
+    output = Path(spec["output"]) / endpoint["output"]
+    if mode == "logprobs":
+        return output.with_name(f"{output.stem}_lp{output.suffix}")
+    return output
+
+
+def restore_slots(client: LLMClient, files: list[str]) -> None:
+    for url in client.urls:
+        for slot, filename in enumerate(files):
+            try:
+                answer = client.slot_action(url, slot, "restore", filename)
+                restored = answer["n_restored"]
+            except (requests.RequestException, KeyError) as e:
+                print(f"[!] {url} slot {slot}: nothing restored from {filename} ({e})")
+                continue
+            print(f"[*] {url} slot {slot}: {restored} cached tokens restored")
+
+
+def save_slots(client: LLMClient, files: list[str]) -> None:
+    for url in client.urls:
+        for slot, filename in enumerate(files):
+            try:
+                client.slot_action(url, slot, "save", filename)
+            except requests.RequestException as e:
+                print(f"[!] {url} slot {slot}: could not save to {filename} ({e})")
+
+
+def run_task(
+    task: str,
+    model: str,
+    config: Optional[dict] = None,
+    in_flight: Optional[int] = None,
+    url: Optional[Union[str, list[str]]] = None,
+    slot_cache: bool = False,
+    mode: str = "json",
+    batch: int = 1,
+    cache: bool = True,
+    shard: Optional[tuple[int, int]] = None,
+    output: Optional[Path] = None,
+) -> pd.DataFrame:
+    """
+    Classify the titles of a task's rows with one model.
+
+    Scores are appended to a `ResultLog` next to the output file every
+    `COMMIT_EVERY` titles and joined to the rows by article id at the end,
+    when the output is written once. Rows labelled in the output file or in
+    the log of an interrupted run are kept, so a run resumes where it
+    stopped; near-duplicates get the labels of their cluster at the end and
+    the aggregates are updated.
+
+    Prompts are a static prefix (template, instructions, answer schema) and
+    the title with a short tail, see `split_prompt`; each request is sent to
+    a free slot of its server (unless the model sets "pin_slots": false),
+    where the prefix is in the KV cache, so only the title is evaluated.
+    Requests are balanced over the servers of the endpoint, see
+    `EndpointPool`.
+
+    Args:
+        task (str): Key of `TASKS`.
+        model (str): Model of the config.
+        config (Optional[dict]): Model config, `CONFIG_PATH` if None.
+        in_flight (Optional[int]): Concurrent requests per server; defaults
+            to the model's "in_flight", then `IN_FLIGHT`.
+        url (Optional[Union[str, list[str]]]): Server, or servers to balance
+            over, to use instead of the configured ones.
+        slot_cache (bool): Restore the KV cache of the server slots saved by
+            the last run with this model and task before starting, and save
+            it at the end; the server needs `--slot-save-path`.
+        mode (str): "json" asks for the JSON scores of the task's `format`;
+            "logprobs" asks for a single label token (`label_prompt`) and
+            writes the normalized probabilities of the task's `choices`,
+            to the output file with an "_lp" suffix.
+        batch (int): Titles per request in the JSON mode, see `make_scorer`.
+        cache (bool): Take the scores of titles already classified with the
+            same model version, prompt and grammar from the `ResultCache`
+            instead of asking the server, and store the new ones there. The
+            model version is the endpoint's "model_id" and "quantization".
+        shard (Optional[tuple[int, int]]): (index, count): classify only the
+            rows of one shard of the input, ignoring the task's `limit`; see
+            `dss_selc.classify.jobs`.
+        output (Optional[Path]): Output parquet instead of the model's.
+
+    Returns:
+        pd.DataFrame: The labelled rows, as written to the output file.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+    spec = get_task(task)
+    endpoint = get_endpoint(load_config() if config is None else config, model, task)
+    if output is None:
+        output = model_output(spec, endpoint, mode)
+    if shard is not None:
+        spec = {**spec, "limit": None}
+    output.parent.mkdir(parents=True, exist_ok=True)
+    keys, columns = list(spec["labels"]), list(spec["labels"].values())
+    urls = server_urls(endpoint, url)
+    per_server = in_flight or endpoint.get("in_flight", IN_FLIGHT)
+    in_flight = per_server * len(urls)
+    slots = per_server if endpoint.get("pin_slots", True) else None
+    # slots hold the KV cache of a prompt prefix, which differs between layouts
+    layout = f"{mode}-batch" if batch > 1 else mode
+    slot_files = [f"{model}-{task}-{layout}-{slot}.bin" for slot in range(per_server)]
+
+    with LLMClient(
+        urls, endpoint["template"], endpoint["options"], in_flight, slots=slots
+    ) as client:
+        if not client.health():
+            raise RuntimeError(f"No llama-server of {urls} is ready")
+        for server in client.pool.endpoints:
+            if not server.available:
+                print(f"[!] {server.url} is not ready, left out for now")
+        print(f"[*] {task} with {model} at {', '.join(urls)}, {in_flight} in flight")
+        if slot_cache:
+            restore_slots(client, slot_files)
+
+        score = make_scorer(client, spec, mode, batch)
+        df = load_rows(spec, output, shard)
+        log = ResultLog(log_path(output), columns)
+        recovered = log.read()
+        if len(recovered):
+            merged = merge_scores(df, recovered, columns)
+            print(f"[*] {merged} results recovered from {log.path}")
+        duplicates = duplicate_mask(df)
+        ids = df["id"].to_numpy()
+        titles = df["title"].to_numpy()
+        rows = list(pending_rows(df, spec, duplicates))
+        version = (endpoint.get("model_id", model), endpoint.get("quantization", ""))
+        scope = (*version, *prompt_layout(client.template, spec, mode, batch))
+        results = ResultCache() if cache else None
+        # article id -> scores of this run, merged into `df` at the end
+        labelled = {}
+        if results is not None:
+            hits = results.get_many(scope, (text for _, text in rows))
+            labelled.update(
+                {ids[ind]: hits[text] for ind, text in rows if text in hits}
+            )
+            missing = [(ind, text) for ind, text in rows if text not in hits]
+            print(
+                f"[*] {len(rows) - len(missing)} titles from the result cache,"
+                f" {len(missing)} to classify"
+            )
+            rows = missing
+
+        fresh = []
+
+        def checkpoint() -> None:
+            log.append([ids[ind] for ind, _ in fresh], [s for _, s in fresh])
+            if results is not None:
+                results.put_many(scope, [(titles[ind], s) for ind, s in fresh])
+            fresh.clear()
+
+        done = 0
+        chunks = batched(rows, batch)
+        for inds, chunk_scores, error in dispatch(score, chunks, in_flight):
+            if error is not None:
+                for ind in inds:
+                    print(
+                        f"[{ind:>05}/{len(df):>05}] Failed, left for the next run:"
+                        f" {error!r}"
+                    )
+                continue
+            for ind, scores in zip(inds, chunk_scores):
+                tag = f"[{ind:>05}/{len(df):>05}]"
+                labels = " ".join(f"{k}: {score}" for k, score in zip(keys, scores))
+                print(f"{tag} {titles[ind]}")
+                print(f"{tag} {labels}")
+                labelled[ids[ind]] = scores
+                fresh.append((ind, scores))
+                done += 1
+                if done % COMMIT_EVERY == 0:
+                    print(f"{tag} Checkpoint")
+                    checkpoint()
+        checkpoint()
+        log.close()
+        if results is not None:
+            results.close()
+        if slot_cache:
+            save_slots(client, slot_files)
+        stats = client.stats
+        if done:
+            print(
+                f"[*] {done} titles in {stats['requests']} requests, "
+                f"{stats['prompt_tokens'] / done:.1f} prompt tokens evaluated and"
+                f" {stats['cached_tokens'] / done:.1f} reused from the cache per"
+                f" title, {stats['fallbacks']} batches retried title by title"
+            )
+        if len(urls) > 1:
+            for server in client.pool.endpoints:
+                latency = server.latency or 0.0
+                print(
+                    f"[*] {server.url}: {server.requests} requests, {latency:.2f} s"
+                    f" recent latency, {server.failures} times unreachable"
+                )
+
+    if labelled:
+        scores = pd.DataFrame(
+            [[id_, *scores] for id_, scores in labelled.items()],
+            columns=["id", *columns],
+        )
+        merge_scores(df, scores, columns)
+    propagate_labels(df, columns)
+    df.to_parquet(output)
+    log.clear()
+    with Aggregates() as aggregates:
+        aggregates.update_labels(df, columns)
+    return df
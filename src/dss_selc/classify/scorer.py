@@ -0,0 +1,130 @@
+import json
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from dss_selc.classify.client import LLMClient
+from dss_selc.classify.grammar import array_grammar, load_schema
+from dss_selc.classify.logprobs import LOGPROB_OPTIONS, choice_probs
+from dss_selc.classify.tasks import read_prompt
+from dss_selc.classify.templates import split_prompt
+
+# answer format of a batched prompt; it does not name the batch size, so the
+# prefix stays the same for a short last batch and only the grammar changes
+BATCH_FORMAT = """
+a JSON array with one object per numbered text, in the same order, each of
+the form:
+{format}"""
+
+
+def batched(items: Iterable[tuple], k: int) -> Iterator[tuple[tuple, list]]:
+    """Group (key, item) pairs into (keys, items) chunks of up to `k`"""
+    keys, chunk = [], []
+    for key, item in items:
+        keys.append(key)
+        chunk.append(item)
+        if len(chunk) == k:
+            yield tuple(keys), chunk
+            keys, chunk = [], []
+    if chunk:
+        yield tuple(keys), chunk
+
+
+def _prompt_parts(path: Path, frmt: str, template: str) -> tuple[str, str]:
+    prompt = read_prompt(path).format(frmt=frmt, text="{text}")
+    return split_prompt(template, prompt)
+
+
+def prompt_layout(
+    template: str, spec: dict, mode: str = "json", batch: int = 1
+) -> tuple[str, str]:
+    """
+    Prompt and grammar a scorer of `make_scorer` answers with.
+
+    Returns:
+        tuple[str, str]: The prompt in the chat template with a `{text}`
+            placeholder, and the grammar: the server's answer grammar for
+            single titles, the answer schema the batch grammars are built
+            from, or the logprob request fields.
+    """
+    if mode == "logprobs":
+        parts = _prompt_parts(spec["label_prompt"], "", template)
+        grammar = json.dumps(LOGPROB_OPTIONS, sort_keys=True)
+    elif batch == 1:
+        parts = _prompt_parts(spec["prompt"], spec["format"], template)
+        grammar = read_prompt(spec["grammar"])
+    else:
+        frmt = BATCH_FORMAT.format(format=spec["format"])
+        parts = _prompt_parts(spec["prompt"], frmt, template)
+        grammar = read_prompt(spec["schema"])
+    return "{text}".join(parts), grammar
+
+
+def make_scorer(
+    client: LLMClient,
+    spec: dict,
+    mode: str = "json",
+    batch: int = 1,
+) -> Callable[[list[str]], list[list[float]]]:
+    """
+    Build the function scoring a chunk of titles for a task.
+
+    Args:
+        client (LLMClient): Server client; its template lays out the prompts.
+        spec (dict): Task spec, see `TASKS`.
+        mode (str): "json" or "logprobs", see `run_task`.
+        batch (int): Titles per request in the JSON mode. Chunks of several
+            titles go out as a numbered list with a grammar forcing a JSON
+            array of exactly that many answers (see `array_grammar`), so the
+            instructions are evaluated once per chunk; a chunk whose answer
+            does not parse is scored again one title at a time.
+
+    Returns:
+        Callable[[list[str]], list[list[float]]]: Scores of every title, in
+            the order of the task's `labels`.
+    """
+    keys = list(spec["labels"])
+    if mode == "logprobs":
+        if batch > 1:
+            raise ValueError("The logprob mode scores one title per request")
+        prefix, suffix = _prompt_parts(spec["label_prompt"], "", client.template)
+
+        def score_label(title: str) -> list[float]:
+            answer = client.request(prefix + title + suffix, **LOGPROB_OPTIONS)
+            probs = choice_probs(answer, spec["choices"])
+            return [probs[key] for key in keys]
+
+        return lambda titles: [score_label(title) for title in titles]
+
+    prefix, suffix = _prompt_parts(spec["prompt"], spec["format"], client.template)
+
+    def score_one(title: str) -> list[float]:
+        answer = json.loads(client.complete_raw(prefix + title + suffix))
+        return [float(answer[key]) for key in keys]
+
+    if batch == 1:
+        return lambda titles: [score_one(title) for title in titles]
+
+    frmt = BATCH_FORMAT.format(format=spec["format"])
+    batch_prefix, batch_suffix = _prompt_parts(spec["prompt"], frmt, client.template)
+    schema = load_schema(spec["schema"])
+    grammars = {k: array_grammar(schema, k) for k in range(2, batch + 1)}
+
+    def score_batch(titles: list[str]) -> list[list[float]]:
+        if len(titles) == 1:
+            return [score_one(titles[0])]
+        text = "\n".join(
+            f"{n}. {' '.join(title.split())}" for n, title in enumerate(titles, 1)
+        )
+        prompt = batch_prefix + text + batch_suffix
+        content = client.complete_raw(prompt, grammar=grammars[len(titles)])
+        try:
+            answer = json.loads(content)
+            if len(answer) != len(titles):
+                raise ValueError(f"{len(answer)} answers for {len(titles)} titles")
+            return [[float(item[key]) for key in keys] for item in answer]
+        except (ValueError, KeyError, TypeError):
+            with client.lock:
+                client.stats["fallbacks"] += 1
+            return [score_one(title) for title in titles]
+
+    return score_batch
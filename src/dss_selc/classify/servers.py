@@ -0,0 +1,322 @@
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import Iterator, Optional
+
+import requests
+
+from dss_selc.classify.config import CONFIG_PATH, get_endpoint, load_config
+from dss_selc.classify.dispatch import IN_FLIGHT
+from dss_selc.classify.tasks import CLASSIFICATION_PATH, TASKS, get_task
+
+LLAMA_SERVER = os.environ.get("DSS_SELC_LLAMA_SERVER", "llama-server")
+SERVERS_PATH = CLASSIFICATION_PATH / "servers"
+PORT = 8080
+# CPU threads of one box, split between the servers started on it
+THREADS = 12
+# slots of a server; the same default as the requests a client pins to the
+# slots of each server (`DSS_SELC_LLM_IN_FLIGHT`), so `id_slot` always exists
+PARALLEL = IN_FLIGHT
+# context tokens per slot
+SLOT_CTX = 2000
+N_PREDICT = 1800
+# seconds between two checks of the servers, and the longest wait before
+# restarting one that keeps crashing
+POLL = 0.5
+MAX_BACKOFF = 60.0
+
+
+class LlamaServer:
+    """
+    One llama-server process.
+
+    Args:
+        model (Path): GGUF file.
+        port (int): Port to listen on.
+        threads (int): CPU threads (`-t`).
+        parallel (int): Parallel slots (`-np`).
+        grammar (Optional[Path]): Default answer grammar (`--grammar-file`).
+        host (str): Interface to listen on; "::" accepts other machines.
+        log (Optional[Path]): File the server's output goes to.
+        slot_save_path (Optional[Path]): Where slot KV caches are saved and
+            restored; next to the model by default.
+    """
+
+    def __init__(
+        self,
+        model: Path,
+        port: int = PORT,
+        threads: int = THREADS,
+        parallel: int = PARALLEL,
+        grammar: Optional[Path] = None,
+        host: str = "::",
+        log: Optional[Path] = None,
+        slot_save_path: Optional[Path] = None,
+    ) -> None:
+        self.model = Path(model)
+        self.port = port
+        self.threads = threads
+        self.parallel = parallel
+        self.grammar = grammar
+        self.host = host
+        self.log = log or SERVERS_PATH / f"{self.model.stem}-{port}.log"
+        self.slot_save_path = slot_save_path or self.model.parent / "slots"
+        self.process: Optional[subprocess.Popen] = None
+        self.started = 0.0
+        self.restarts = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://localhost:{self.port}"
+
+    def command(self) -> list[str]:
+        command = [
+            LLAMA_SERVER,
+            *("-m", str(self.model), "-cb"),
+            *("-np", str(self.parallel), "-t", str(self.threads)),
+            *("-c", str(SLOT_CTX * self.parallel), "-n", str(N_PREDICT)),
+            *("--port", str(self.port), "--host", self.host),
+            *("--threads-http", str(self.threads)),
+            *("--slot-save-path", str(self.slot_save_path)),
+        ]
+        if self.grammar is not None:
+            command += ["--grammar-file", str(self.grammar)]
+        return command
+
+    def start(self) -> None:
+        self.log.parent.mkdir(parents=True, exist_ok=True)
+        self.slot_save_path.mkdir(parents=True, exist_ok=True)
+        with open(self.log, "ab") as log:
+            # own session: Ctrl+C reaches the manager, which stops the server
+            self.process = subprocess.Popen(
+                self.command(),
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+        self.started = time.monotonic()
+
+    def running(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def ready(self) -> bool:
+        """Whether the server answers `/health` with its model loaded"""
+        try:
+            return requests.get(f"{self.url}/health", timeout=2).status_code == 200
+        except requests.RequestException:
+            return False
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """SIGTERM, then SIGKILL if the server has not exited after `timeout`"""
+        if not self.running():
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+
+class ServerManager:
+    """
+    Start llama-servers, wait for them and keep them running.
+
+    A watchdog thread restarts servers that exit, waiting twice as long
+    before each restart of a server that crashed soon after starting (up to
+    `MAX_BACKOFF` seconds). Leaving the context stops all of them. Clients
+    balance over the servers with `EndpointPool`, which leaves out a
+    crashed server until it answers `/health` again.
+
+    Args:
+        servers (list[LlamaServer]): Servers to manage.
+
+    Usage:
+        with ServerManager(servers) as manager:
+            manager.wait_ready()
+            run_task("theme", "llama", url=manager.urls)
+    """
+
+    def __init__(self, servers: list[LlamaServer]) -> None:
+        self.servers = servers
+        self.stopping = threading.Event()
+        self.watchdog = threading.Thread(target=self._watch, daemon=True)
+
+    def __enter__(self) -> "ServerManager":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    @property
+    def urls(self) -> list[str]:
+        return [server.url for server in self.servers]
+
+    def start(self) -> None:
+        for server in self.servers:
+            print(f"[*] Starting {' '.join(server.command())}")
+            try:
+                server.start()
+            except (OSError, subprocess.SubprocessError):
+                # `__exit__` does not run when `__enter__` fails
+                self.stop()
+                raise
+        self.watchdog.start()
+
+    def wait_ready(self, count: int = 1, timeout: float = 600.0) -> list[str]:
+        """
+        Wait until `count` servers answer `/health`.
+
+        Returns:
+            list[str]: URLs of the ready servers; the others keep loading.
+        """
+        deadline = time.monotonic() + timeout
+        start = time.monotonic()
+        while time.monotonic() < deadline:
+            ready = [server.url for server in self.servers if server.ready()]
+            if len(ready) >= min(count, len(self.servers)):
+                waited = time.monotonic() - start
+                print(f"[*] {len(ready)} llama-servers ready after {waited:.1f}s")
+                return ready
+            time.sleep(POLL)
+        raise RuntimeError(f"No llama-server ready after {timeout:.0f}s")
+
+    def _watch(self) -> None:
+        due: dict[int, float] = {}
+        while not self.stopping.wait(POLL):
+            for server in self.servers:
+                if server.running() or self.stopping.is_set():
+                    continue
+                if server.port not in due:
+                    code = server.process.returncode
+                    uptime = time.monotonic() - server.started
+                    # a server that ran for a while is not crashing at startup
+                    if uptime > MAX_BACKOFF:
+                        server.restarts = 0
+                    backoff = min(2**server.restarts, MAX_BACKOFF)
+                    print(
+                        f"[!] llama-server :{server.port} exited with {code} after"
+                        f" {uptime:.0f}s, restarting in {backoff:.0f}s"
+                    )
+                    due[server.port] = time.monotonic() + backoff
+                elif time.monotonic() >= due[server.port]:
+                    server.restarts += 1
+                    try:
+                        server.start()
+                    except (OSError, subprocess.SubprocessError) as e:
+                        backoff = min(2**server.restarts, MAX_BACKOFF)
+                        print(
+                            f"[!] llama-server :{server.port} failed to restart"
+                            f" ({e}), retrying in {backoff:.0f}s"
+                        )
+                        due[server.port] = time.monotonic() + backoff
+                        continue
+                    del due[server.port]
+
+    def stop(self) -> None:
+        self.stopping.set()
+        if self.watchdog.is_alive():
+            self.watchdog.join()
+        for server in self.servers:
+            server.stop()
+        print(f"[*] {len(self.servers)} llama-servers stopped")
+
+
+def model_servers(
+    endpoint: dict,
+    instances: int = 1,
+    port: int = PORT,
+    threads: Optional[int] = None,
+    parallel: Optional[int] = None,
+    grammar: Optional[Path] = None,
+) -> list[LlamaServer]:
+    """
+    Servers for a model endpoint on this machine.
+
+    Args:
+        endpoint (dict): Settings of the model and task, see `get_endpoint`;
+            its "gguf" is the model file.
+        instances (int): Servers to start, on consecutive ports.
+        port (int): Port of the first one.
+        threads (Optional[int]): CPU threads of each; `THREADS` split
+            between them by default.
+        parallel (Optional[int]): Slots of each; the model's "in_flight",
+            then `PARALLEL` by default.
+        grammar (Optional[Path]): Default answer grammar.
+    """
+    if "gguf" not in endpoint:
+        raise ValueError('The model has no "gguf" file in the config')
+    threads = threads or max(1, THREADS // instances)
+    parallel = parallel or endpoint.get("in_flight", PARALLEL)
+    return [
+        LlamaServer(endpoint["gguf"], port + i, threads, parallel, grammar)
+        for i in range(instances)
+    ]
+
+
+@contextmanager
+def serve(
+    config: dict,
+    model: str,
+    task: str,
+    instances: int = 1,
+    port: int = PORT,
+    threads: Optional[int] = None,
+    parallel: Optional[int] = None,
+) -> Iterator[list[str]]:
+    """
+    Run local servers of a model for a task while the block runs.
+
+    The block starts as soon as one server is ready; the others join the
+    client's pool as they finish loading. SIGTERM stops the servers like
+    Ctrl+C does.
+
+    Yields:
+        list[str]: URLs of all the servers.
+
+    Usage:
+        with serve(load_config(), "llama", "theme", instances=2) as urls:
+            run_task("theme", "llama", url=urls)
+    """
+    endpoint = get_endpoint(config, model, task)
+    grammar = get_task(task)["grammar"]
+    servers = model_servers(endpoint, instances, port, threads, parallel, grammar)
+    previous = signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        with ServerManager(servers) as manager:
+            manager.wait_ready()
+            yield manager.urls
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m dss_selc.classify.servers",
+        description="Run and supervise llama-servers for a model until Ctrl+C",
+    )
+    parser.add_argument("task", choices=list(TASKS), help="sets the grammar")
+    parser.add_argument("--model", required=True, help="model of the config")
+    parser.add_argument("--config", type=Path, default=CONFIG_PATH)
+    parser.add_argument("--instances", type=int, default=1)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--threads", type=int, help="per server")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    servers = (config, args.model, args.task, args.instances, args.port, args.threads)
+    # Ctrl+C stops the servers and exits without a traceback
+    with suppress(KeyboardInterrupt), serve(*servers):
+        while True:
+            time.sleep(60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+from dss_selc.data_transform.aggregates import SOLAR_THRESHOLD, THEMES
+from dss_selc.utils import DUMP_PATH, PRJ_PATH
+
+CLASSIFICATION_PATH = DUMP_PATH / "classification"
+# solar probabilities of the Bayesian classifier, the input of the theme task
+BAYESIAN_PATH = CLASSIFICATION_PATH / "solar_category/solar_predicted_bayesian.parquet"
+
+# What each classification asks and where its rows come from. Keys:
+#   prompt   task prompt, with `{frmt}` (the JSON answer schema) and `{text}`
+#   format   JSON schema the answer must follow
+#   labels   answer key -> output column, appended after the input columns
+#            and filled with `UNLABELLED` until the title is classified
+#   input    parquet of the rows to classify; None reads the article dataset
+#   output   directory of the per-model outputs
+#   gate     classify only rows whose last input column (the solar
+#            probability of the Bayesian classifier) is at least this
+#   limit    stop after this row
+#   grammar  GBNF grammar constraining the answer, set on the server
+#   schema   JSON schema of the answer, from which batch grammars are built
+#   label_prompt, choices
+#            logprob mode: prompt asking for a single label token, and
+#            answer key -> that token
+TASKS = {
+    "solar": {
+        "prompt": PRJ_PATH / "categorize/solar/solar_prompt.txt",
+        "format": """
+{
+    "solar": "number",
+    "notSolar": "number"
+}
+""",
+        "labels": {"solar": "solar_p", "notSolar": "not_solar_p"},
+        "input": None,
+        "output": DUMP_PATH / "solar_category",
+        "gate": None,
+        "limit": None,
+        "grammar": PRJ_PATH / "categorize/solar/grammar/solar_grammar.gbnf",
+        "schema": PRJ_PATH / "categorize/solar/grammar/solar_grammar.json",
+        "label_prompt": PRJ_PATH / "categorize/solar/solar_label_prompt.txt",
+        "choices": {"solar": "A", "notSolar": "B"},
+    },
+    "theme": {
+        "prompt": PRJ_PATH / "categorize/theme/theme_prompt.txt",
+        "format": """
+{
+    "pr": "number",
+    "mi": "number",
+    "ti": "number",
+    "pa": "number",
+    "fi": "number"
+}
+""",
+        "labels": {theme: theme for theme in THEMES},
+        "input": BAYESIAN_PATH,
+        "output": CLASSIFICATION_PATH / "solar_theme",
+        "gate": SOLAR_THRESHOLD,
+        "limit": 5000,
+        "grammar": PRJ_PATH / "categorize/theme/grammar/theme_grammar.gbnf",
+        "schema": PRJ_PATH / "categorize/theme/grammar/theme_grammar.json",
+        "label_prompt": PRJ_PATH / "categorize/theme/theme_label_prompt.txt",
+        "choices": dict(zip(THEMES, "ABCDE")),
+    },
+}
+
+
+def get_task(task: str) -> dict:
+    """Spec of `task`, raising a ValueError for unknown tasks"""
+    if task not in TASKS:
+        raise ValueError(f"No classification task {task!r}, see TASKS")
+    return TASKS[task]
+
+
+def read_prompt(path: Path) -> str:
+    with open(path, "r") as f:
+        return f.read()
@@ -0,0 +1,57 @@
+# chat template of each model family; `{prompt}` is replaced by the task prompt
+TEMPLATES = {
+    "llama3": """
+<|begin_of_text|><|start_header_id|>system<|end_header_id|>
+<|eot_id|><|start_header_id|>user<|end_header_id|>
+{prompt}
+<|eot_id|><|start_header_id|>assistant<|end_header_id|>
+""",
+    "gemma2": """<start_of_turn>user
+{prompt}<end_of_turn>
+<start_of_turn>model
+""",
+    "mistral": "<s>[INST]{prompt}[/INST]",
+    "phi3": """
+<|system|>
+You are a helpful assistant.<|end|>
+<|user|>
+{prompt}<|end|>
+<|assistant|>
+""",
+}
+
+
+def get_template(name: str) -> str:
+    """Template `name`, raising a ValueError for unknown templates"""
+    if name not in TEMPLATES:
+        raise ValueError(f"No chat template {name!r}, see TEMPLATES")
+    return TEMPLATES[name]
+
+
+def apply_template(name: str, prompt: str) -> str:
+    return get_template(name).format(prompt=prompt)
+
+
+def split_prompt(name: str, prompt: str) -> tuple[str, str]:
+    """
+    Split a task prompt in template `name` around the article text.
+
+    llama-server reuses the KV cache of the longest prefix a request shares
+    with what its slot processed last, so everything before the title is
+    kept byte-identical across articles and only the title and the short
+    tail after it are evaluated per request.
+
+    Args:
+        name (str): Key of `TEMPLATES`.
+        prompt (str): Task prompt with a single `{text}` field left.
+
+    Returns:
+        tuple[str, str]: Static prefix and the suffix following the text;
+            the full prompt of an article is `prefix + text + suffix`.
+    """
+    marker = "\x00"
+    if prompt.count("{text}") != 1:
+        raise ValueError("A task prompt needs exactly one {text} field")
+    full = apply_template(name, prompt.replace("{text}", marker))
+    prefix, suffix = full.split(marker)
+    return prefix, suffix
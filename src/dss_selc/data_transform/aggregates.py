@@ -0,0 +1,250 @@
+import argparse
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from dss_selc.data_transform.dataset import DATASET_PATH, read_articles
+from dss_selc.utils import DUMP_PATH
+
+AGGREGATES_PATH = DUMP_PATH / "scraper" / "aggregates.sqlite"
+THEMES = ["pr", "mi", "ti", "pa", "fi"]
+LABELS = ["solar_p", *THEMES]
+# the categorize scripts only theme articles at least this likely to be solar
+SOLAR_THRESHOLD = 0.69
+# placeholder the categorize scripts write before an article is labelled
+UNLABELLED = 999.0
+# month of undated articles; NULL would never meet the rollups' primary keys,
+# so every change would add a row instead of updating one
+UNDATED = "0000-00"
+
+
+def _rollup(sign: str, row: str) -> str:
+    """Statements adding (sign "+") or removing ("-") one fact's contribution"""
+    themed = f"{row}.pr IS NOT NULL"
+    sums = ", ".join(f"{sign}coalesce({row}.{t}, 0)" for t in THEMES)
+    updates = ", ".join(f"{t} = {t} + excluded.{t}" for t in THEMES)
+    solar = f"coalesce({row}.solar_p >= {SOLAR_THRESHOLD}, 0)"
+    return f"""
+    INSERT INTO volume VALUES ({row}.source, {row}.month, {sign}1)
+        ON CONFLICT DO UPDATE SET articles = articles + excluded.articles;
+    INSERT INTO themes VALUES ({row}.month, {sign}({themed}), {sums})
+        ON CONFLICT DO UPDATE SET labelled = labelled + excluded.labelled, {updates};
+    INSERT INTO solar VALUES (
+        {row}.month,
+        {sign}({row}.solar_p IS NOT NULL),
+        {sign}{solar},
+        {sign}coalesce({row}.solar_p, 0)
+    ) ON CONFLICT DO UPDATE SET
+        labelled = labelled + excluded.labelled,
+        solar = solar + excluded.solar,
+        solar_p = solar_p + excluded.solar_p;
+    """
+
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS facts (
+    id TEXT PRIMARY KEY, source TEXT, month TEXT,
+    solar_p REAL, {", ".join(f"{t} REAL" for t in THEMES)}
+);
+CREATE TABLE IF NOT EXISTS volume (
+    source TEXT, month TEXT, articles INTEGER, PRIMARY KEY (source, month)
+);
+CREATE TABLE IF NOT EXISTS themes (
+    month TEXT PRIMARY KEY, labelled INTEGER,
+    {", ".join(f"{t} REAL" for t in THEMES)}
+);
+CREATE TABLE IF NOT EXISTS solar (
+    month TEXT PRIMARY KEY, labelled INTEGER, solar INTEGER, solar_p REAL
+);
+CREATE TRIGGER IF NOT EXISTS facts_insert AFTER INSERT ON facts BEGIN
+    {_rollup("+", "NEW")}
+END;
+CREATE TRIGGER IF NOT EXISTS facts_delete AFTER DELETE ON facts BEGIN
+    {_rollup("-", "OLD")}
+END;
+CREATE TRIGGER IF NOT EXISTS facts_update AFTER UPDATE ON facts BEGIN
+    {_rollup("-", "OLD")}
+    {_rollup("+", "NEW")}
+END;
+"""
+
+
+class Aggregates:
+    """
+    Rollups of the articles and their labels, maintained incrementally.
+
+    One row per article in `facts` (source, month, solar and theme
+    probabilities) feeds per-month tables through triggers: every inserted,
+    deleted or changed fact adds or removes its own contribution, so an
+    update costs time in the number of changed articles and reads cost time
+    in the number of months.
+
+    Tables:
+        volume  articles per source and month
+        themes  labelled articles and summed theme probabilities per month
+        solar   labelled articles, articles above `SOLAR_THRESHOLD` and summed
+                solar probabilities per month
+
+    Args:
+        path (Path): SQLite file, created if missing.
+    """
+
+    def __init__(self, path: Path = AGGREGATES_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+        with self.conn:
+            # files written before `UNDATED` hold undated facts with a NULL
+            # month; the update moves their rollups to UNDATED
+            self.conn.execute(
+                "UPDATE facts SET month = ? WHERE month IS NULL", (UNDATED,)
+            )
+            for table in ("volume", "themes", "solar"):
+                self.conn.execute(f"DELETE FROM {table} WHERE month IS NULL")
+
+    def __enter__(self) -> "Aggregates":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def update_articles(self, df: pd.DataFrame) -> dict[str, int]:
+        """
+        Bring `facts` in line with the current articles.
+
+        Args:
+            df (pd.DataFrame): Every article, with `id`, `source` and `date`.
+
+        Returns:
+            dict[str, int]: Articles added, moved (new source or month) and
+                removed.
+        """
+        month = df["date"].dt.strftime("%Y-%m").astype(object)
+        rows = zip(df["id"], df["source"].astype(str), month.fillna(UNDATED))
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS temp.incoming")
+            self.conn.execute(
+                "CREATE TEMP TABLE incoming (id TEXT PRIMARY KEY, source, month)"
+            )
+            self.conn.executemany("INSERT INTO incoming VALUES (?, ?, ?)", rows)
+            removed = self.conn.execute(
+                "DELETE FROM facts WHERE id NOT IN (SELECT id FROM incoming)"
+            ).rowcount
+            moved = self.conn.execute(
+                "UPDATE facts SET source = i.source, month = i.month"
+                " FROM incoming AS i WHERE facts.id = i.id"
+                " AND (facts.source IS NOT i.source OR facts.month IS NOT i.month)"
+            ).rowcount
+            added = self.conn.execute(
+                "INSERT INTO facts (id, source, month) SELECT id, source, month"
+                " FROM incoming WHERE id NOT IN (SELECT id FROM facts)"
+            ).rowcount
+            self.conn.execute("DROP TABLE incoming")
+        return {"added": added, "moved": moved, "removed": removed}
+
+    def sync(self, root: Path = DATASET_PATH) -> dict[str, int]:
+        """`update_articles` from the dataset, reading only id, source and date"""
+        columns = ["id", "source", "date"]
+        return self.update_articles(read_articles(root, columns=columns))
+
+    def update_labels(self, df: pd.DataFrame, columns: list[str] = LABELS) -> int:
+        """
+        Record the labels of a categorize output.
+
+        Args:
+            df (pd.DataFrame): Articles with an `id` column; `UNLABELLED`
+                placeholders are stored as missing labels. Articles unknown
+                to `facts` are skipped.
+            columns (list[str]): Labels to take from `df`, among `LABELS`;
+                those missing from `df` are left alone.
+
+        Returns:
+            int: Articles whose labels changed.
+        """
+        columns = [c for c in LABELS if c in columns and c in df]
+        labels = df[columns].where(df[columns] != UNLABELLED).astype(object)
+        labels = labels.where(labels.notna(), None)
+        rows = zip(df["id"], *(labels[c] for c in columns))
+        assign = ", ".join(f"{c} = i.{c}" for c in columns)
+        differs = " OR ".join(f"facts.{c} IS NOT i.{c}" for c in columns)
+        with self.conn:
+            self.conn.execute("DROP TABLE IF EXISTS temp.incoming")
+            self.conn.execute(
+                "CREATE TEMP TABLE incoming"
+                f" (id TEXT PRIMARY KEY, {', '.join(columns)})"
+            )
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO incoming VALUES (?{', ?' * len(columns)})",
+                rows,
+            )
+            changed = self.conn.execute(
+                f"UPDATE facts SET {assign} FROM incoming AS i"
+                f" WHERE facts.id = i.id AND ({differs})"
+            ).rowcount
+            self.conn.execute("DROP TABLE incoming")
+        return changed  # noqa: R504
+
+    def volume(self) -> pd.DataFrame:
+        """Articles per month (rows) and source (columns), undated excluded"""
+        df = pd.read_sql(
+            "SELECT * FROM volume WHERE articles != 0 AND month != ?",
+            self.conn,
+            params=(UNDATED,),
+        )
+        df = df.pivot(index="month", columns="source", values="articles")
+        return df.fillna(0).astype(int)
+
+    def themes(self) -> pd.DataFrame:
+        """Mean theme probabilities of the themed articles, per month"""
+        means = ", ".join(f"{t} / labelled AS {t}" for t in THEMES)
+        return pd.read_sql(
+            f"SELECT month, labelled, {means} FROM themes"
+            " WHERE labelled > 0 AND month != ? ORDER BY month",
+            self.conn,
+            params=(UNDATED,),
+            index_col="month",
+        )
+
+    def solar_share(self) -> pd.DataFrame:
+        """Share of labelled articles about solar, and mean `solar_p`, per month"""
+        return pd.read_sql(
+            "SELECT month, labelled, CAST(solar AS REAL) / labelled AS share,"
+            " solar_p / labelled AS mean_solar_p FROM solar"
+            " WHERE labelled > 0 AND month != ? ORDER BY month",
+            self.conn,
+            params=(UNDATED,),
+            index_col="month",
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m dss_selc.data_transform.aggregates",
+        description="Update and print the precomputed DSS aggregates",
+    )
+    parser.add_argument("--path", type=Path, default=AGGREGATES_PATH)
+    parser.add_argument("--dataset", type=Path, default=DATASET_PATH)
+    parser.add_argument("--sync", action="store_true", help="sync articles first")
+    parser.add_argument("--labels", type=Path, nargs="*", default=[])
+    parser.add_argument(
+        "--show", choices=["volume", "themes", "solar_share"], action="append"
+    )
+    args = parser.parse_args()
+
+    with Aggregates(args.path) as aggregates:
+        if args.sync:
+            print(f"[*] Articles: {aggregates.sync(args.dataset)}")
+        for fp in args.labels:
+            changed = aggregates.update_labels(pd.read_parquet(fp))
+            print(f"[*] {fp.name}: {changed} articles relabelled")
+        for name in args.show or []:
+            print(getattr(aggregates, name)().to_string())
+
+
+if __name__ == "__main__":
+    main()
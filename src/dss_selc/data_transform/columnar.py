@@ -0,0 +1,108 @@
+import math
+from typing import Callable, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from dss_selc.data_transform.dates import normalize_dates_arrow
+from dss_selc.data_transform.sources import get_source
+
+# typed article table; `source` repeats one value per source and `body` can
+# outgrow the 2 GB offsets of `string` once all sources are concatenated
+ARTICLE_SCHEMA = pa.schema(
+    [
+        ("url", pa.string()),
+        ("title", pa.string()),
+        ("summary", pa.string()),
+        ("body", pa.large_string()),
+        ("date", pa.timestamp("ns")),
+        ("kws", pa.list_(pa.string())),
+        ("source", pa.dictionary(pa.int32(), pa.string())),
+        ("id", pa.string()),
+    ]
+)
+
+
+def as_list(value: object) -> list:
+    """Wrap scalars in a list, missing values become []"""
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str):
+        return [value]
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return []
+    return [str(value)]
+
+
+def _getter(path: str) -> Callable[[object], object]:
+    """Resolve a dotted path into an article, None if any step is missing"""
+    keys = path.split(".")
+    if len(keys) == 1:
+        (key,) = keys
+        return lambda article: article.get(key)
+
+    def get(article: object) -> object:
+        for key in keys:
+            if not isinstance(article, dict):
+                return None
+            article = article.get(key)
+        return article
+
+    return get
+
+
+def source_table(
+    source: str,
+    articles: dict,
+    on_dates: Optional[Callable[[str, dict], None]] = None,
+) -> pa.Table:
+    """
+    Build the typed article table of one source straight from its store.
+
+    The source's entry in `SOURCES` says where each column is found; columns
+    are gathered path by path into Arrow arrays, dates are parsed with
+    `normalize_dates_arrow` and ids are joined with a compute kernel, so
+    every source goes through the same code and no pandas object column is
+    ever created.
+
+    Args:
+        source (str): Key of `SOURCES`.
+        articles (dict): The source's store.
+        on_dates (Optional[Callable[[str, dict], None]]): Called with the
+            source and its date report.
+
+    Returns:
+        pa.Table: Rows of the source, with `ARTICLE_SCHEMA`.
+    """
+    spec = get_source(source)
+    required = [_getter(path) for path in spec["require"]]
+    keys, values = [], []
+    for key, article in articles.items():
+        if all(get(article) for get in required):
+            keys.append(key)
+            values.append(article)
+    data = {}
+    for column, path in spec["fields"].items():
+        get = _getter(path)
+        data[column] = [get(article) for article in values]
+    for column in spec["lists"]:
+        data[column] = [as_list(value) for value in data[column]]
+
+    arrays = {}
+    for field in ARTICLE_SCHEMA:
+        # dates stay raw strings until they are parsed below
+        kind = pa.string() if field.name == "date" else field.type
+        if field.name in data:
+            arrays[field.name] = pa.array(data[field.name], kind)
+        else:
+            arrays[field.name] = pa.nulls(len(values), kind)
+    arrays["date"], report = normalize_dates_arrow(arrays["date"], source)
+    if on_dates is not None:
+        on_dates(source, report)
+    arrays["source"] = pa.DictionaryArray.from_arrays(
+        pa.array(np.zeros(len(values), np.int32)), pa.array([source])
+    )
+    keys = pa.array(keys, pa.string())
+    arrays["id"] = pc.binary_join_element_wise(f"{source}/", keys, "")
+    return pa.table(arrays, schema=ARTICLE_SCHEMA)
@@ -1,177 +1,408 @@
-import json
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Any, Optional
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Union
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from dateutil import parser
 
+from dss_selc.data_transform import incremental
+from dss_selc.data_transform.aggregates import Aggregates
+from dss_selc.data_transform.columnar import as_list, source_table
+from dss_selc.data_transform.dataset import write_dataset, write_dataset_batches
+from dss_selc.data_transform.dedup import cluster_articles
+from dss_selc.data_transform.facets import build_keyword_index
+from dss_selc.data_transform.incremental import SourceCache, article_hash
+from dss_selc.data_transform.search import SearchIndex
+from dss_selc.utils import store
+
+COLUMNS = ["url", "title", "summary", "body", "date", "kws", "source"]
+# what `cluster_articles` reads, without loading bodies
+CLUSTER_COLUMNS = ["title", "summary", "date", "id"]
+# processed rows, as staged by the streaming transform
+ROW_SCHEMA = pa.schema(
+    [
+        *((c, pa.string()) for c in ("url", "title", "summary", "body")),
+        ("date", pa.timestamp("ns")),
+        ("kws", pa.list_(pa.string())),
+        ("source", pa.string()),
+        ("id", pa.string()),
+    ]
+)
+# dataset rows, in the order of `save_to_parquet` (`id` last)
+DATASET_SCHEMA = pa.schema(
+    [
+        *(f for f in ROW_SCHEMA if f.name != "id"),
+        ("cluster_id", pa.string()),
+        ("id", pa.string()),
+        ("year", pa.int16()),
+        ("month", pa.int8()),
+    ]
+)
+
 
 class DataProcessor:
-    def __init__(self, json_files: dict[str, str]) -> None:
+    """
+    Build the article table from the scraper stores.
+
+    Args:
+        json_files (dict[str, str]): Stores of the JSON-LD sources (ec, eec,
+            nleec); every store is mapped to rows as `sources.SOURCES` says.
+        cache_dir (Optional[Path]): Keep per-source frames here and only
+            reprocess articles whose store changed; None rebuilds everything.
+        batch_size (Optional[int]): Stream the stores this many articles at a
+            time instead of loading each one whole, so memory stays bounded
+            by the batch; cannot be combined with `cache_dir`.
+        workers (Optional[int]): Process sources in a pool of this many
+            processes; None processes them one after another.
+        engine (str): Both engines build typed Arrow tables per source (see
+            `columnar`); "pandas" converts them to DataFrames, "arrow" keeps
+            them to the end and only hands titles and summaries to pandas,
+            for clustering. The arrow engine cannot be combined with
+            `cache_dir` or `batch_size`.
+        index_path (Optional[Path]): Full-text index to bring up to date with
+            the dataset after each transform, see `search.SearchIndex`.
+        facets_path (Optional[Path]): Rebuild the keyword index here after
+            each transform, see `facets.KeywordIndex`.
+        aggregates_path (Optional[Path]): Rollups to bring up to date with the
+            dataset after each transform, see `aggregates.Aggregates`.
+    """
+
+    def __init__(
+        self,
+        json_files: dict[str, str],
+        cache_dir: Optional[Path] = None,
+        batch_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        engine: str = "pandas",
+        index_path: Optional[Path] = None,
+        facets_path: Optional[Path] = None,
+        aggregates_path: Optional[Path] = None,
+    ) -> None:
+        if cache_dir is not None and batch_size is not None:
+            raise ValueError("Streaming cannot be combined with a cache_dir")
+        if workers is not None and batch_size is not None:
+            raise ValueError("Streaming cannot be combined with workers")
+        if engine not in ("pandas", "arrow"):
+            raise ValueError(f"Unknown engine {engine!r}")
+        if engine == "arrow" and (cache_dir is not None or batch_size is not None):
+            raise ValueError("The arrow engine has no cached or streaming mode")
         self.json_files = json_files
-        self.json_data = {}
-        self.data = []
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+        self.workers = workers
+        self.engine = engine
+        self.index_path = index_path
+        self.facets_path = facets_path
+        self.aggregates_path = aggregates_path
         self.df = None
+        self.date_report = {}
+        self.cache_report = {}
+        self.timings = {}
 
     @staticmethod
-    def load_json(file_path: str) -> list | dict:
-        with open(file_path, "r") as f:
-            return json.load(f)
+    def load_json(file_path: str) -> Union[list, dict]:
+        return store.load(file_path)
 
     @staticmethod
-    def ensure_list(value: Optional[list | str]) -> list:
-        if isinstance(value, list):
-            return value
-        if isinstance(value, str):
-            return [value]
-        if pd.isna(value):
-            return []
-        return [str(value)]
-
-    @staticmethod
-    def process_article(
-        k: str,
-        v: dict[str, Any],
-        source: str,
-    ) -> Optional[dict[str, Any]]:
-        try:
-            if source in ["eec", "nleec"]:
-                v = v.get("data", {})
-                if not v or (source == "nleec" and "articleBody" not in v):
-                    return None
-
-            article = {
-                "url": v.get("url"),
-                "title": v.get("headline"),
-                "summary": v.get("description"),
-                "body": v.get("articleBody"),
-                "date": v.get("datePublished"),
-                "kws": DataProcessor.ensure_list(v.get("keywords")),
-                "source": source,
-            }
-
-            return article
-        except Exception as e:
-            print(f"Error processing article {k}: {str(e)}")
-            return None
+    def ensure_list(value: Optional[Union[list, str]]) -> list:
+        return as_list(value)
 
     @staticmethod
     def parse_date(date_string: str) -> datetime:
         return parser.parse(date_string)
 
-    def load_json_data(self) -> None:
-        self.json_data = {k: self.load_json(v) for k, v in self.json_files.items()}
+    def record_dates(self, source: str, report: dict) -> None:
+        # streamed sources are normalized batch by batch, sum the counts
+        empty = {**dict.fromkeys(report, 0), "examples": []}
+        total = self.date_report.setdefault(source, empty)
+        for key in ("rows", "missing", "fast", "slow", "failed"):
+            total[key] += report[key]
+        total["examples"] = (total["examples"] + report["examples"])[:5]
 
-    def process_articles(self) -> None:
-        for source, articles in self.json_data.items():
-            for k, v in articles.items():
-                article = self.process_article(k, v, source)
-                if article is not None:
-                    self.data.append(article)
+    def report_dates(self) -> None:
+        for source, report in self.date_report.items():
+            if report["failed"]:
+                print(
+                    f"[!] {source}: {report['failed']}/{report['rows']} dates"
+                    f" unparsed, e.g. {report['examples']}"
+                )
 
-    def create_dataframe(self) -> None:
-        self.df = pd.DataFrame(self.data)
-        self.df["kws"] = self.df["kws"].apply(self.ensure_list)
+    def source_frame(self, source: str, articles: dict) -> pd.DataFrame:
+        """Rows of one source's articles, with normalized dates and an `id`"""
+        table = source_table(source, articles, self.record_dates)
+        return table.cast(ROW_SCHEMA).to_pandas()
 
-        def parse_date(date_str: str) -> Optional[datetime.date]:
-            try:
-                return parser.parse(date_str).date()
-            except Exception:
-                return None
+    def cached_frame(self, source: str, path: str) -> pd.DataFrame:
+        """
+        Rows of one source, reprocessing only articles added or changed since
+        the last run.
 
-        self.df["date"] = self.df["date"].apply(parse_date)
-        self.df["date"] = pd.to_datetime(self.df["date"])
+        Args:
+            source (str): Source name.
+            path (str): Store of the source.
+
+        Returns:
+            pd.DataFrame: Rows of the source, with the `_hash` of each raw article.
+        """
+        cache = SourceCache(self.cache_dir / source)
+        fingerprint = incremental.fingerprint(path, cache.fingerprint)
+        if incremental.same_content(fingerprint, cache.fingerprint):
+            self.cache_report[source] = "unchanged"
+            if fingerprint != cache.fingerprint:
+                # touched, e.g. rewritten by a scraper: keep the new mtime so
+                # the next run does not hash the store again
+                cache.record(fingerprint)
+            return cache.frame()
+        articles = self.load_json(path)
+        hashes = {f"{source}/{k}": article_hash(v) for k, v in articles.items()}
+        known = cache.hashes()
+        changed = {
+            k: v
+            for k, v in articles.items()
+            if known.get(f"{source}/{k}") != hashes[f"{source}/{k}"]
+        }
+        if not changed:
+            # rewritten by a scraper without new or changed articles
+            self.cache_report[source] = "0 new/changed"
+            return cache.update(cache.frame().iloc[:0], fingerprint, set(hashes))
+        delta = self.source_frame(source, changed)
+        delta["_hash"] = delta["id"].map(hashes)
+        self.cache_report[source] = f"{len(delta)} new/changed"
+        return cache.update(delta, fingerprint, set(hashes))
 
-    def process_additional_sources(self, src_dict: dict[str, str]) -> None:
-        # Process Mercom data
-        with open(src_dict["mercom"], "r") as f:
-            mercom = pd.read_json(f).transpose().reset_index(drop=True)
-
-        mercom = mercom[["url", "title", "body", "date", "categories"]]
-        mercom.columns = ["url", "title", "body", "date", "kws"]
-        mercom["source"] = "mercom"
-        mercom["date"] = pd.to_datetime(mercom["date"]).dt.date
-
-        # Process Saur data
-        with open(src_dict["saur"], "r") as f:
-            saur = pd.read_json(f).transpose().reset_index(drop=True)
-
-        saur = saur[["url", "title", "summary", "body", "date_published", "key_words"]]
-        saur.columns = ["url", "title", "summary", "body", "date", "kws"]
-        saur["source"] = "saur"
-        saur["date"] = saur["date"].str.replace(
-            r"(\d+)(st|nd|rd|th)", r"\1", regex=True
-        )
-        saur["date"] = pd.to_datetime(saur["date"], format="%a, %b %d, %Y").dt.date
-
-        # Process PV Magazine data
-        with open(src_dict["pvmag"], "r") as f:
-            pvmag = pd.read_json(f).transpose().reset_index(drop=True)
-
-        pvmag = pvmag[
-            [
-                "url",
-                "title",
-                "summary",
-                "body",
-                "date_published",
-                "key_words",
-            ]
-        ]
-        pvmag.columns = ["url", "title", "summary", "body", "date", "kws"]
-        pvmag["source"] = "pvmag"
-        pvmag["date"] = pd.to_datetime(pvmag["date"]).dt.date
-
-        with open(src_dict["pvmag_global"], "r") as f:
-            pvmag_gl = pd.read_json(f).transpose().reset_index(drop=True)
-
-        pvmag_gl = pvmag_gl[
-            [
-                "url",
-                "title",
-                "summary",
-                "body",
-                "date_published",
-                "key_words",
-            ]
-        ]
-        pvmag_gl.columns = ["url", "title", "summary", "body", "date", "kws"]
-        pvmag_gl["source"] = "pvmag_global"
-        pvmag_gl["date"] = pd.to_datetime(pvmag_gl["date"], utc=True).dt.date
-
-        with open(src_dict["pvmag_us"], "r") as f:
-            pvmag_us = pd.read_json(f).transpose().reset_index(drop=True)
-
-        pvmag_us = pvmag_us[
-            [
-                "url",
-                "title",
-                "summary",
-                "body",
-                "date_published",
-                "key_words",
-            ]
-        ]
-        pvmag_us.columns = ["url", "title", "summary", "body", "date", "kws"]
-        pvmag_us["source"] = "pvmag_us"
-        pvmag_us["date"] = pd.to_datetime(pvmag_us["date"], utc=True).dt.date
-
-        # Combine all dataframes
-        self.df = pd.concat(
-            [self.df, mercom, saur, pvmag, pvmag_gl, pvmag_us], axis=0
-        ).reset_index(drop=True)
+    def iter_source_frames(self, source: str, path: str) -> Iterator[pd.DataFrame]:
+        """Rows of one source, `batch_size` articles at a time"""
+        batch = {}
+        for key, article in store.iter_items(path):
+            batch[key] = article
+            if len(batch) == self.batch_size:
+                yield self.source_frame(source, batch)
+                batch = {}
+        if batch:
+            yield self.source_frame(source, batch)
 
+    def load_source(self, source: str, path: str) -> Union[pd.DataFrame, pa.Table]:
+        """Rows of one source, from its cache if there is one, timed"""
+        start = time.perf_counter()
+        if self.engine == "arrow":
+            articles = self.load_json(path)
+            frame = source_table(source, articles, self.record_dates)
+        elif self.cache_dir is None:
+            frame = self.source_frame(source, self.load_json(path))
+        else:
+            frame = self.cached_frame(source, path)
+        self.timings[source] = time.perf_counter() - start
+        return frame  # noqa: R504
+
+    def load_all(self, sources: dict[str, str]) -> list[Union[pd.DataFrame, pa.Table]]:
+        """
+        Rows of every source, in order; from the worker pool if there is one.
+
+        Args:
+            sources (dict[str, str]): Source name -> store.
+
+        Returns:
+            list[Union[pd.DataFrame, pa.Table]]: One part per source; Arrow tables
+                when they come from workers or the arrow engine.
+        """
+        self.date_report = {}
+        if self.workers is None:
+            return [self.load_source(s, p) for s, p in sources.items()]
+        with ProcessPoolExecutor(self.workers) as pool:
+            results = list(
+                pool.map(
+                    _load_source_table,
+                    [self] * len(sources),
+                    *zip(*sources.items()),
+                )
+            )
+        for _, date_report, cache_report, timings in results:
+            self.date_report.update(date_report)
+            self.cache_report.update(cache_report)
+            self.timings.update(timings)
+        return [table for table, *_ in results]
+
+    def load_sources(self, src_dict: dict[str, str]) -> None:
+        parts = self.load_all({**self.json_files, **src_dict})
+        if self.workers is not None:
+            # columns a source lacks (Mercom's summary) come back as nulls
+            parts = [pa.concat_tables(parts, promote_options="default").to_pandas()]
+        self.df = pd.concat(parts, ignore_index=True)[[*COLUMNS, "id"]]
         # Ensure all dates in the combined DataFrame are date objects
         self.df["date"] = pd.to_datetime(self.df["date"])
+        self.report_dates()
+
+    def cluster_duplicates(self) -> None:
+        # near-duplicates across sources share a cluster_id, the id of their
+        # earliest article, which is the one the classifiers send to the LLM
+        self.df["cluster_id"] = cluster_articles(self.df)
 
     def save_to_parquet(self, output_path: str) -> None:
-        self.df.to_parquet(output_path)
+        # `id` goes last, the categorize scripts address columns by position
+        columns = [c for c in self.df.columns if c != "id"] + ["id"]
+        written = write_dataset(self.df[columns], output_path)
+        print(f"[*] Wrote {len(written)} changed partitions to {output_path}")
+        self.update_indexes(output_path)
+
+    def stream_transform(self, src_dict: dict[str, str], output_path: str) -> None:
+        """
+        `transform` with bounded memory, for stores too large to load whole.
+
+        Articles are processed `batch_size` at a time and staged in a single
+        Parquet file; clustering then reads back only `CLUSTER_COLUMNS`, and
+        the dataset is written from the staged record batches.
+
+        Args:
+            src_dict (dict[str, str]): Stores of the flat-dict sources.
+            output_path (str): Dataset directory.
+        """
+        self.date_report = {}
+        output_path = Path(output_path)
+        staging = output_path.with_name(f".{output_path.name}-rows.parquet")
+        staging.parent.mkdir(parents=True, exist_ok=True)
+        with pq.ParquetWriter(staging, ROW_SCHEMA) as writer:
+            for source, path in {**self.json_files, **src_dict}.items():
+                start = time.perf_counter()
+                for frame in self.iter_source_frames(source, path):
+                    writer.write_table(
+                        pa.Table.from_pandas(
+                            frame.reindex(columns=ROW_SCHEMA.names),
+                            schema=ROW_SCHEMA,
+                            preserve_index=False,
+                        )
+                    )
+                self.timings[source] = time.perf_counter() - start
+        self.report_dates()
+
+        staged = pq.ParquetFile(staging)
+        texts = staged.read(columns=CLUSTER_COLUMNS).to_pandas()
+        cluster_ids = cluster_articles(texts).to_numpy()
+        rows, clusters = len(texts), len(set(cluster_ids))
+        del texts
+
+        batches = staged.iter_batches(batch_size=self.batch_size)
+        written = self.write_batches(batches, cluster_ids, output_path)
+        staging.unlink()
+        print(f"[*] Wrote {len(written)} changed partitions to {output_path}")
+        self.update_indexes(output_path)
+        self.report_timings()
+        print(f"Processed {rows} articles in {clusters} clusters")
+
+    def arrow_transform(self, src_dict: dict[str, str], output_path: str) -> None:
+        """
+        `transform` on typed Arrow tables, for `engine="arrow"`.
+
+        Args:
+            src_dict (dict[str, str]): Stores of the flat-dict sources.
+            output_path (str): Dataset directory.
+        """
+        tables = self.load_all({**self.json_files, **src_dict})
+        # every part has ARTICLE_SCHEMA, chunks keep their own dictionaries
+        table = pa.concat_tables(tables)
+        self.report_dates()
+        texts = table.select(CLUSTER_COLUMNS).to_pandas()
+        cluster_ids = cluster_articles(texts).to_numpy()
+        written = self.write_batches(table.to_batches(), cluster_ids, output_path)
+        print(f"[*] Wrote {len(written)} changed partitions to {output_path}")
+        self.update_indexes(output_path)
+        self.report_timings()
+        clusters = len(set(cluster_ids))
+        print(f"Processed {len(table)} articles in {clusters} clusters")
+
+    @staticmethod
+    def write_batches(
+        batches: Iterable[pa.RecordBatch],
+        cluster_ids: np.ndarray,
+        output_path: str,
+    ) -> list[str]:
+        """
+        Write article batches with their cluster ids to the dataset.
+
+        Columns are cast to `DATASET_SCHEMA`, so the files are the same
+        whichever path built the batches.
+
+        Args:
+            batches (Iterable[pa.RecordBatch]): Article rows, in table order.
+            cluster_ids (np.ndarray): Cluster id of every row, in the same order.
+            output_path (str): Dataset directory.
+
+        Returns:
+            list[str]: Partition directories written.
+        """
+
+        def with_partitions() -> Iterator[pa.RecordBatch]:
+            offset = 0
+            for batch in batches:
+                start, offset = offset, offset + len(batch)
+                date = batch.column("date")
+                columns = {
+                    **{c: batch.column(c) for c in batch.schema.names},
+                    "cluster_id": pa.array(cluster_ids[start:offset], pa.string()),
+                    "year": pc.fill_null(pc.year(date), 0),
+                    "month": pc.fill_null(pc.month(date), 0),
+                }
+                yield pa.RecordBatch.from_arrays(
+                    [columns[f.name].cast(f.type) for f in DATASET_SCHEMA],
+                    schema=DATASET_SCHEMA,
+                )
+
+        return write_dataset_batches(with_partitions(), DATASET_SCHEMA, output_path)
+
+    def update_indexes(self, output_path: str) -> None:
+        if self.index_path is not None:
+            with SearchIndex(self.index_path) as index:
+                report = index.update(output_path)
+            print(
+                f"[*] Search index: {report['indexed']} articles indexed,"
+                f" {report['removed']} removed"
+            )
+        if self.facets_path is not None:
+            facets = build_keyword_index(output_path)
+            facets.save(self.facets_path)
+            print(f"[*] Keyword index: {len(facets)} keywords")
+        if self.aggregates_path is not None:
+            with Aggregates(self.aggregates_path) as aggregates:
+                report = aggregates.sync(output_path)
+            print(
+                f"[*] Aggregates: {report['added']} articles added,"
+                f" {report['moved']} moved, {report['removed']} removed"
+            )
+
+    def report_timings(self) -> None:
+        for source, seconds in self.timings.items():
+            status = self.cache_report.get(source)
+            status = f" ({status})" if status is not None else ""
+            print(f"[*] {source}: {seconds:.2f}s{status}")
 
     def transform(self, src_dict: dict[str, str], output_path: str) -> None:
-        self.load_json_data()
-        self.process_articles()
-        self.create_dataframe()
-        self.process_additional_sources(src_dict)
+        if self.batch_size is not None:
+            self.stream_transform(src_dict, output_path)
+            return
+        if self.engine == "arrow":
+            self.arrow_transform(src_dict, output_path)
+            return
+        self.load_sources(src_dict)
+        self.cluster_duplicates()
         self.save_to_parquet(output_path)
+        self.report_timings()
+
+        clusters = self.df["cluster_id"].nunique()
+        print(f"Processed {len(self.df)} articles in {clusters} clusters")
+
 
-        print(f"Processed {len(self.df)} articles")
+def _load_source_table(
+    processor: DataProcessor,
+    source: str,
+    path: str,
+) -> tuple[pa.Table, dict, dict, dict]:
+    """Process one source in a worker; frames travel back as Arrow tables"""
+    table = processor.load_source(source, path)
+    if isinstance(table, pd.DataFrame):
+        table = pa.Table.from_pandas(table, preserve_index=False)
+    return table, processor.date_report, processor.cache_report, processor.timings
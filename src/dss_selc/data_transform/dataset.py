@@ -0,0 +1,239 @@
+import hashlib
+import json
+import shutil
+from pathlib import Path
+from typing import Iterable, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from dss_selc.utils import DUMP_PATH
+
+DATASET_PATH = DUMP_PATH / "scraper" / "articles"
+PARTITIONING = ds.partitioning(
+    pa.schema([("source", pa.string()), ("year", pa.int16()), ("month", pa.int8())]),
+    flavor="hive",
+)
+# article bodies average a few KB, so keep row groups to a few tens of MB
+ROW_GROUP_SIZE = 8192
+COMPRESSION = "zstd"
+MANIFEST = "_partitions.json"
+
+
+def partition_dir(source: str, year: int, month: int) -> str:
+    return f"source={source}/year={year}/month={month}"
+
+
+def _partition_hashes(df: pd.DataFrame) -> dict[str, str]:
+    """Content hash of every partition, to skip rewriting unchanged ones"""
+    text = df.drop(columns=["kws", "date"])
+    # NaN and None both mean missing, whichever path built the frame
+    text = text.astype(object).where(text.notna(), None).astype(str)
+    # lists when freshly processed, numpy arrays when read back from a cache
+    text["kws"] = df["kws"].map(
+        lambda kws: "" if kws is None else "\x1f".join(map(str, kws))
+    )
+    text["date"] = df["date"].astype("int64").astype(str)
+    rows = pd.util.hash_pandas_object(text, index=False)
+    keys = [partition_dir(*key) for key in zip(df.source, df.year, df.month)]
+    return {
+        key: hashlib.sha1(group.to_numpy().tobytes()).hexdigest()[:16]
+        for key, group in rows.groupby(pd.Series(keys, index=rows.index))
+    }
+
+
+def read_manifest(root: Path = DATASET_PATH) -> dict:
+    """Column order and partition hashes recorded by the last `write_dataset`"""
+    fp = Path(root) / MANIFEST
+    if not fp.exists():
+        return {"columns": [], "partitions": {}}
+    with fp.open("r") as f:
+        return json.load(f)
+
+
+def write_dataset(df: pd.DataFrame, root: Path = DATASET_PATH) -> list[str]:
+    """
+    Write articles as a Hive-partitioned Parquet dataset.
+
+    Rows are partitioned by `source`, `year` and `month` of their date and
+    sorted by date inside each file; files are zstd-compressed with column
+    statistics, so readers can prune both partitions and row groups. Rows
+    without a date go to `year=0/month=0`. Only partitions whose content
+    changed since the last write are rewritten; cluster ids are part of the
+    content, and since they are article ids (see `cluster_articles`) a new
+    article only changes the partitions of its own cluster.
+
+    Args:
+        df (pd.DataFrame): Article table, with a datetime `date` column.
+        root (Path): Dataset directory.
+
+    Returns:
+        list[str]: Partition directories written.
+    """
+    root = Path(root)
+    df = df.copy()
+    df["year"] = df["date"].dt.year.fillna(0).astype("int16")
+    df["month"] = df["date"].dt.month.fillna(0).astype("int8")
+    df = df.sort_values(["source", "date"], kind="stable").reset_index(drop=True)
+
+    previous = read_manifest(root)["partitions"]
+    hashes = _partition_hashes(df)
+    changed = [k for k, v in hashes.items() if previous.get(k) != v]
+    keys = pd.Series([partition_dir(*key) for key in zip(df.source, df.year, df.month)])
+    _write_partitions(df[keys.isin(changed)], root)
+    _finish(root, list(df.columns), previous, hashes)
+    return changed
+
+
+def write_dataset_batches(
+    batches: Iterable[pa.RecordBatch],
+    schema: pa.Schema,
+    root: Path = DATASET_PATH,
+) -> list[str]:
+    """
+    Write articles to the dataset like `write_dataset`, from record batches.
+
+    Batches are first split into partitions under a staging directory next to
+    `root`, then each partition is read back on its own, sorted by date and
+    hashed, so memory stays bounded by the largest source-month rather than
+    by the whole table. The output is the same as `write_dataset`'s.
+
+    Args:
+        batches (Iterable[pa.RecordBatch]): Article rows with `year` and
+            `month` columns, in store order.
+        schema (pa.Schema): Schema of the batches.
+        root (Path): Dataset directory.
+
+    Returns:
+        list[str]: Partition directories written.
+    """
+    root = Path(root)
+    staging = root.with_name(f".{root.name}-staging")
+    shutil.rmtree(staging, ignore_errors=True)
+    ds.write_dataset(
+        pa.RecordBatchReader.from_batches(schema, batches),
+        staging,
+        format="parquet",
+        partitioning=PARTITIONING,
+        preserve_order=True,
+    )
+    previous = read_manifest(root)["partitions"]
+    hashes, changed = {}, []
+    dataset = ds.dataset(staging, format="parquet", partitioning=PARTITIONING)
+    for fragment in dataset.get_fragments():
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        df = fragment.to_table(schema=dataset.schema).to_pandas()
+        df = df.assign(**keys)[schema.names]
+        df = df.sort_values("date", kind="stable", ignore_index=True)
+        key = partition_dir(keys["source"], keys["year"], keys["month"])
+        hashes.update(_partition_hashes(df))
+        if previous.get(key) != hashes[key]:
+            changed.append(key)
+            _write_partitions(df, root)
+    shutil.rmtree(staging, ignore_errors=True)
+    _finish(root, schema.names, previous, hashes)
+    return changed
+
+
+def _write_partitions(df: pd.DataFrame, root: Path) -> None:
+    """Replace the partitions `df` has rows in with its rows"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if not len(table):
+        return
+    ds.write_dataset(
+        table,
+        root,
+        format="parquet",
+        partitioning=PARTITIONING,
+        existing_data_behavior="delete_matching",
+        basename_template="part-{i}.parquet",
+        file_options=ds.ParquetFileFormat().make_write_options(
+            compression=COMPRESSION,
+            write_statistics=True,
+        ),
+        min_rows_per_group=min(ROW_GROUP_SIZE, len(table)),
+        max_rows_per_group=ROW_GROUP_SIZE,
+    )
+
+
+def _finish(root: Path, columns: list[str], previous: dict, hashes: dict) -> None:
+    """Drop partitions that are gone and record the new manifest"""
+    for key in set(previous) - set(hashes):
+        shutil.rmtree(root / key, ignore_errors=True)
+    root.mkdir(parents=True, exist_ok=True)
+    columns = [c for c in columns if c not in ("year", "month")]
+    with (root / MANIFEST).open("w") as f:
+        json.dump({"columns": columns, "partitions": hashes}, f, indent=4)
+
+
+def read_articles(
+    root: Path = DATASET_PATH,
+    sources: Optional[list[str]] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    columns: Optional[list[str]] = None,
+) -> pd.DataFrame:
+    """
+    Read articles from the partitioned dataset, pruning what the filters rule out.
+
+    Args:
+        root (Path): Dataset directory written by `write_dataset`.
+        sources (Optional[list[str]]): Keep only these sources.
+        start (Optional[str]): First date to keep, anything `pd.Timestamp` takes.
+        end (Optional[str]): Last date to keep, inclusive.
+        columns (Optional[list[str]]): Columns to read, all by default.
+
+    Returns:
+        pd.DataFrame: Matching articles, by source and date, without the
+            `year`/`month` partition columns.
+
+    Usage:
+        df = read_articles(sources=["mercom", "saur"], start="2023-01-01")
+    """
+    dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+    year, month, date = pc.field("year"), pc.field("month"), pc.field("date")
+    expr = None
+    conditions = []
+    if sources is not None:
+        conditions.append(pc.field("source").isin(sources))
+    # year/month prune partitions, the date bound prunes row groups inside them
+    if start is not None:
+        start = pd.Timestamp(start)
+        same_year = (year == start.year) & (month >= start.month)
+        conditions.append((year > start.year) | same_year)
+        conditions.append(date >= pa.scalar(start, pa.timestamp("ns")))
+    if end is not None:
+        end = pd.Timestamp(end)
+        same_year = (year == end.year) & (month <= end.month)
+        conditions.append((year < end.year) | same_year)
+        conditions.append(date <= pa.scalar(end, pa.timestamp("ns")))
+    for condition in conditions:
+        expr = condition if expr is None else expr & condition
+    # partition columns come last in the dataset schema, restore the table order
+    names = read_manifest(root)["columns"] or dataset.schema.names
+    names = [n for n in names if n not in ("year", "month")]
+    table = dataset.to_table(columns=columns or names, filter=expr)
+    df = table.to_pandas()
+    if "source" in df:
+        df["source"] = df["source"].astype(str)
+    order = [c for c in ("source", "date") if c in df]
+    return df.sort_values(order, kind="stable", ignore_index=True) if order else df
+
+
+def dataset_info(root: Path = DATASET_PATH) -> pd.DataFrame:
+    """Rows, row groups and size of every file of the dataset"""
+    rows = []
+    for fp in sorted(Path(root).rglob("*.parquet")):
+        meta = pq.ParquetFile(fp).metadata
+        rows.append(
+            {
+                "file": str(fp.relative_to(root)),
+                "rows": meta.num_rows,
+                "row_groups": meta.num_row_groups,
+                "bytes": fp.stat().st_size,
+            }
+        )
+    return pd.DataFrame(rows)
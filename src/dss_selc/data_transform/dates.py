@@ -0,0 +1,88 @@
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from dateutil import parser
+
+from dss_selc.data_transform.sources import SOURCES
+
+# date spec of every source, see `SOURCES`
+DATE_FORMATS = {source: spec["date"] for source, spec in SOURCES.items()}
+
+# `pc.strptime` has no ISO 8601 mode, try the shapes the sources use in turn;
+# naive times count as UTC
+ARROW_ISO8601 = ("%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d")
+
+
+def _slow_parse(date_string: str, utc: bool) -> Optional[pd.Timestamp]:
+    try:
+        date = pd.Timestamp(parser.parse(date_string))
+    except (ValueError, OverflowError):
+        return None
+    if utc and date.tzinfo is not None:
+        date = date.tz_convert("UTC")
+    return date.tz_localize(None).normalize()
+
+
+def normalize_dates_arrow(dates: pa.Array, source: str) -> tuple[pa.Array, dict]:
+    """
+    Parse the publication dates of one source to midnight timestamps.
+
+    The source's entry in `DATE_FORMATS` is applied to the whole array with
+    `pyarrow.compute` kernels; only rows it cannot parse fall back to
+    `dateutil`, once per distinct string.
+
+    Args:
+        dates (pa.Array): Raw date strings, nulls for missing ones.
+        source (str): Key of `DATE_FORMATS`; unknown sources use the slow path.
+
+    Returns:
+        tuple[pa.Array, dict]: `timestamp[ns]` dates (null where parsing
+            failed), and counts of rows parsed by the fast path, the slow
+            path and neither, with a few failed examples.
+    """
+    dates = dates.cast(pa.string())
+    if not len(dates):
+        # `pc.sum` of an empty array is null, not 0
+        report = dict.fromkeys(("rows", "missing", "fast", "slow", "failed"), 0)
+        return pa.nulls(0, pa.timestamp("ns")), {**report, "examples": []}
+    spec = DATE_FORMATS.get(source, {})
+    utc = spec.get("utc", False)
+    present = pc.is_valid(dates)
+    strings = dates
+    if "clean" in spec:
+        pattern, replacement = spec["clean"]
+        strings = pc.replace_substring_regex(
+            strings, pattern=pattern, replacement=replacement
+        )
+    if "prefix" in spec:
+        strings = pc.utf8_slice_codeunits(strings, 0, spec["prefix"])
+    formats = ARROW_ISO8601 if spec.get("format") == "ISO8601" else ()
+    if "format" in spec and not formats:
+        formats = (spec["format"],)
+    parsed = pa.nulls(len(dates), pa.timestamp("ns"))
+    for fmt in formats:
+        attempt = pc.strptime(strings, format=fmt, unit="ns", error_is_null=True)
+        parsed = pc.coalesce(parsed, attempt.cast(pa.timestamp("ns")))
+    parsed = pc.floor_temporal(parsed, unit="day")
+    fast_count = pc.count(parsed).as_py()
+
+    retry = pc.and_(pc.is_null(parsed), present)
+    if pc.any(retry).as_py():
+        raw = pc.filter(dates, retry)
+        slow = {s: _slow_parse(s, utc) for s in pc.unique(raw).to_pylist()}
+        values = pa.array([slow[s] for s in raw.to_pylist()], pa.timestamp("ns"))
+        parsed = pc.replace_with_mask(parsed, retry, values)
+    failed = pc.and_(pc.is_null(parsed), present)
+    retried = pc.sum(retry, min_count=0).as_py()
+    failed_count = pc.sum(failed, min_count=0).as_py()
+    report = {
+        "rows": len(dates),
+        "missing": dates.null_count,
+        "fast": fast_count,
+        "slow": retried - failed_count,
+        "failed": failed_count,
+        "examples": pc.unique(pc.filter(dates, failed)).to_pylist()[:5],
+    }
+    return parsed, report
@@ -0,0 +1,190 @@
+import re
+import zlib
+from itertools import combinations
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_SIZE = 5
+THRESHOLD = 0.5
+# short headlines share many shingles by chance, so matching on titles alone
+# takes a closer match
+TITLE_THRESHOLD = 0.8
+MAX_BUCKET = 50
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9 ]+", " ", text.lower())).strip()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """Deterministic 32-bit hashes of the character n-grams of `text`"""
+    text = normalize(text)
+    if len(text) < size:
+        text = text.ljust(size)
+    grams = {"".join(g) for g in zip(*(text[k:] for k in range(size)))}
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64)
+
+
+class MinHasher:
+    """
+    MinHash signatures from `num_perm` multiply-shift hash functions.
+
+    Args:
+        num_perm (int): Signature length.
+        seed (int): Seed of the hash coefficients, fixed so that signatures are
+            comparable across runs.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1) -> None:
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        high = np.iinfo(np.uint64).max
+        self.a = rng.integers(0, high, num_perm, dtype=np.uint64, endpoint=True) | 1
+        self.b = rng.integers(0, high, num_perm, dtype=np.uint64, endpoint=True)
+
+    def _hash(self, k: int, hashes: np.ndarray) -> np.ndarray:
+        # (a * x + b) mod 2**64, keeping the high 32 bits; uint64 wraps silently
+        return ((self.a[k] * hashes + self.b[k]) >> np.uint64(32)).astype(np.uint32)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        return np.array([self._hash(k, hashes).min() for k in range(self.num_perm)])
+
+    def signatures(self, texts: Iterable[str]) -> np.ndarray:
+        """Signatures of many texts at once, one hash function at a time"""
+        grams = [shingles(t) for t in texts]
+        if not grams:
+            return np.empty((0, self.num_perm), dtype=np.uint32)
+        offsets = np.r_[0, np.cumsum([len(g) for g in grams[:-1]])]
+        hashes = np.concatenate(grams)
+        sigs = np.empty((len(grams), self.num_perm), dtype=np.uint32)
+        for k in range(self.num_perm):
+            sigs[:, k] = np.minimum.reduceat(self._hash(k, hashes), offsets)
+        return sigs
+
+
+def _lsh_candidates(sigs: np.ndarray, bands: int) -> Iterable[tuple[int, int]]:
+    """
+    Yield candidate pairs that agree on all rows of at least one band.
+
+    Buckets are formed per band with `np.unique` over the band's bytes, so the
+    work is linear in the number of documents; pairs are only generated inside
+    buckets (capped at `MAX_BUCKET` members compared against each other).
+    """
+    rows = sigs.shape[1] // bands
+    for band in range(bands):
+        cols = slice(band * rows, (band + 1) * rows)
+        chunk = np.ascontiguousarray(sigs[:, cols])
+        keys = chunk.view(np.dtype((np.void, chunk.dtype.itemsize * rows))).ravel()
+        _, inverse = np.unique(keys, return_inverse=True)
+        order = np.argsort(inverse.ravel(), kind="stable")
+        starts = np.r_[0, np.flatnonzero(np.diff(inverse.ravel()[order])) + 1]
+        ends = np.r_[starts[1:], len(order)]
+        for start, end in zip(starts[ends - starts > 1], ends[ends - starts > 1]):
+            members = order[start:end]
+            if len(members) > MAX_BUCKET:
+                yield from ((members[0], m) for m in members[1:])
+            else:
+                yield from combinations(members, 2)
+
+
+def _find(parent: np.ndarray, i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_articles(
+    df: pd.DataFrame,
+    threshold: float = THRESHOLD,
+    num_perm: int = NUM_PERM,
+    bands: int = BANDS,
+    title_threshold: float = TITLE_THRESHOLD,
+) -> pd.Series:
+    """
+    Assign a near-duplicate cluster id to every article.
+
+    Two articles are linked when the MinHash estimate of the Jaccard similarity
+    of their shingles is at least `threshold` over title + summary, or at least
+    `title_threshold` over the title alone (Mercom has no summary, and
+    summaries differ more across sources than titles do). LSH banding keeps the
+    candidate search sub-quadratic; linked articles are merged with union-find.
+    A title-only link also needs the titles of the two clusters' first rows to
+    match, so headlines cannot chain unrelated articles into one cluster.
+
+    Args:
+        df (pd.DataFrame): Articles with `title` and `summary` columns, and
+            `id` and `date` when there are.
+        threshold (float): Minimum estimated Jaccard similarity.
+        num_perm (int): MinHash signature length, a multiple of `bands`.
+        bands (int): LSH bands; with r = num_perm / bands rows per band, pairs
+            above roughly (1 / bands) ** (1 / r) similarity become candidates.
+        title_threshold (float): Minimum similarity of the titles alone.
+
+    Returns:
+        pd.Series: Cluster ids aligned with `df.index`. A cluster's id is the
+            `id` of its representative, its earliest article (by date, then
+            id), so ids do not change when unrelated articles are added.
+            Without an `id` column, ids are row positions.
+    """
+    titles = df["title"].fillna("").astype(str)
+    summaries = df["summary"].fillna("").astype(str)
+    hasher = MinHasher(num_perm)
+    parent = np.arange(len(df))
+    for texts, least, direct in (
+        (titles + " " + summaries, threshold, False),
+        (titles, title_threshold, True),
+    ):
+        sigs = hasher.signatures(texts)
+        for i, j in _lsh_candidates(sigs, bands):
+            ri, rj = _find(parent, i), _find(parent, j)
+            if ri == rj or np.mean(sigs[i] == sigs[j]) < least:
+                continue
+            if direct and np.mean(sigs[ri] == sigs[rj]) < least:
+                continue
+            parent[max(ri, rj)] = min(ri, rj)
+    roots = [_find(parent, i) for i in range(len(df))]
+    rows = pd.DataFrame(
+        {
+            "root": roots,
+            "date": pd.to_datetime(df["date"]).to_numpy() if "date" in df else pd.NaT,
+            "id": df["id"].astype(str).to_numpy() if "id" in df else range(len(df)),
+        }
+    )
+    # earliest row of every cluster, rows without a date last
+    first = rows.sort_values(["root", "date", "id"]).drop_duplicates("root")
+    ids = first.set_index("root")["id"].loc[roots].astype(str).to_numpy()
+    return pd.Series(ids, index=df.index, name="cluster_id")
+
+
+def duplicate_mask(df: pd.DataFrame) -> np.ndarray:
+    """
+    True for rows that are not the representative of their cluster.
+
+    A cluster whose representative is not in `df` (e.g. filtered out of a
+    task's input) keeps its first row instead.
+    """
+    if "cluster_id" not in df:
+        return np.zeros(len(df), dtype=bool)
+    clusters = df["cluster_id"].astype(str)
+    if "id" in df:
+        # representatives first, the stable sort keeps the rest in order
+        order = np.argsort(df["id"].astype(str) != clusters, kind="stable")
+    else:
+        order = np.arange(len(df))
+    mask = np.empty(len(df), dtype=bool)
+    mask[order] = clusters.iloc[order].duplicated().to_numpy()
+    return mask
+
+
+def propagate_labels(df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """Copy the representative's values of `columns` to the rest of its cluster"""
+    if "cluster_id" in df:
+        kept = df.loc[~duplicate_mask(df)].set_index("cluster_id")[columns]
+        df[columns] = kept.loc[df["cluster_id"]].to_numpy()
+    return df
@@ -0,0 +1,219 @@
+import argparse
+import re
+from functools import reduce
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from dss_selc.data_transform.dataset import DATASET_PATH, read_articles
+from dss_selc.utils import DUMP_PATH
+
+FACETS_PATH = DUMP_PATH / "scraper" / "keywords.npz"
+# posting deltas are stored in the narrowest of these that fits the term
+WIDTHS = (np.uint8, np.uint16, np.uint32)
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Lowercase, drop a leading '#' and collapse whitespace"""
+    return re.sub(r"\s+", " ", str(keyword).strip().lstrip("#").lower()).strip()
+
+
+def _width(deltas: np.ndarray) -> int:
+    top = deltas.max(initial=0)
+    return next(k for k, dtype in enumerate(WIDTHS) if top <= np.iinfo(dtype).max)
+
+
+def encode_postings(
+    postings: list[np.ndarray],
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, list[np.ndarray]]:
+    """
+    Delta-encode sorted posting lists, each in the narrowest dtype that fits.
+
+    Args:
+        postings (list[np.ndarray]): Sorted article numbers of every term.
+
+    Returns:
+        tuple: Width (index into `WIDTHS`), start and length of every list,
+            and the concatenated deltas of each width.
+    """
+    deltas = [np.diff(p, prepend=0) for p in postings]
+    width = np.array([_width(d) for d in deltas], dtype=np.uint8)
+    length = np.array([len(d) for d in deltas], dtype=np.int64)
+    start = np.zeros(len(deltas), dtype=np.int64)
+    data = []
+    for k, dtype in enumerate(WIDTHS):
+        members = np.flatnonzero(width == k)
+        start[members] = np.cumsum(length[members]) - length[members]
+        parts = [deltas[m].astype(dtype) for m in members]
+        data.append(np.concatenate(parts) if parts else np.empty(0, dtype))
+    return width, start, length, data
+
+
+class KeywordIndex:
+    """
+    Keyword -> articles index, with delta-encoded posting lists.
+
+    Articles are numbered 0..n-1 in dataset order (by source and date); the
+    posting list of a keyword is the sorted numbers of its articles, stored
+    as differences between neighbours in the narrowest unsigned dtype that
+    holds them (see `encode_postings`), so common tags on dense numbers take
+    a byte per article.
+
+    Args:
+        terms (np.ndarray): Normalized keywords, sorted.
+        ids (np.ndarray): Article id of every number.
+        months (np.ndarray): Publication month of every number, as months
+            since year 0 (`year * 12 + month - 1`); -1 when undated.
+        width, start, length, data: Encoded postings, see `encode_postings`.
+    """
+
+    def __init__(
+        self,
+        terms: np.ndarray,
+        ids: np.ndarray,
+        months: np.ndarray,
+        width: np.ndarray,
+        start: np.ndarray,
+        length: np.ndarray,
+        data: list[np.ndarray],
+    ) -> None:
+        self.terms = terms
+        self.ids = ids
+        self.months = months
+        self.width = width
+        self.start = start
+        self.length = length
+        self.data = data
+        self.lookup = {term: k for k, term in enumerate(terms.tolist())}
+
+    def save(self, path: Path = FACETS_PATH) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp.npz")
+        np.savez(
+            tmp,
+            terms=self.terms,
+            ids=self.ids,
+            months=self.months,
+            width=self.width,
+            start=self.start,
+            length=self.length,
+            **{f"data{k}": data for k, data in enumerate(self.data)},
+        )
+        tmp.replace(path)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(data.nbytes for data in self.data)
+
+    def postings(self, keyword: str) -> np.ndarray:
+        """Sorted article numbers tagged `keyword`, empty if it is unknown"""
+        k = self.lookup.get(normalize_keyword(keyword))
+        if k is None:
+            return np.empty(0, dtype=np.int64)
+        start, stop = self.start[k], self.start[k] + self.length[k]
+        return np.cumsum(self.data[self.width[k]][start:stop], dtype=np.int64)
+
+    def all_of(self, keywords: Iterable[str]) -> np.ndarray:
+        """Articles tagged with every keyword; shortest lists are joined first"""
+        lists = sorted((self.postings(k) for k in keywords), key=len)
+        if not lists:
+            return np.empty(0, dtype=np.int64)
+        return reduce(lambda a, b: np.intersect1d(a, b, assume_unique=True), lists)
+
+    def any_of(self, keywords: Iterable[str]) -> np.ndarray:
+        """Articles tagged with at least one keyword"""
+        lists = [self.postings(k) for k in keywords]
+        return np.unique(np.concatenate(lists)) if lists else np.empty(0, np.int64)
+
+    def article_ids(self, postings: np.ndarray) -> np.ndarray:
+        return self.ids[postings]
+
+    def counts_by_month(self, postings: np.ndarray) -> pd.Series:
+        """Number of the given articles per publication month, undated excluded"""
+        months = self.months[postings]
+        months, counts = np.unique(months[months >= 0], return_counts=True)
+        index = pd.PeriodIndex.from_ordinals(months - 1970 * 12, freq="M")
+        return pd.Series(counts, index=index, name="articles")
+
+    def top(self, n: int = 20) -> pd.Series:
+        """Most used keywords and their article counts"""
+        order = np.argsort(-self.length, kind="stable")[:n]
+        return pd.Series(self.length[order], index=self.terms[order], name="articles")
+
+
+def index_keywords(df: pd.DataFrame) -> KeywordIndex:
+    """
+    Index the keywords of an article table.
+
+    Args:
+        df (pd.DataFrame): Articles with `id`, `kws` and `date` columns.
+
+    Returns:
+        KeywordIndex: Index over the rows of `df`, numbered in order.
+    """
+    counts = df["kws"].map(lambda kws: 0 if kws is None else len(kws))
+    rows = np.repeat(np.arange(len(df)), counts.to_numpy())
+    flat = [k for kws in df["kws"] if kws is not None for k in kws]
+    terms = pd.Series(flat, dtype=object).map(normalize_keyword)
+    pairs = pd.DataFrame({"term": terms, "row": rows})
+    pairs = pairs[pairs["term"] != ""].drop_duplicates()
+    pairs = pairs.sort_values(["term", "row"], kind="stable")
+    grouped = pairs.groupby("term", sort=True)["row"]
+    postings = [group.to_numpy(np.int64) for _, group in grouped]
+    date = df["date"]
+    months = (date.dt.year * 12 + date.dt.month - 1).fillna(-1).astype(np.int32)
+    return KeywordIndex(
+        np.array(list(grouped.groups), dtype=str),
+        df["id"].to_numpy(dtype=str),
+        months.to_numpy(),
+        *encode_postings(postings),
+    )
+
+
+def build_keyword_index(root: Path = DATASET_PATH) -> KeywordIndex:
+    """Index the article dataset, reading only its `id`, `kws` and `date`"""
+    return index_keywords(read_articles(root, columns=["id", "kws", "date"]))
+
+
+def load_keyword_index(path: Path = FACETS_PATH) -> KeywordIndex:
+    with np.load(path) as f:
+        encoded = [f[name] for name in ("width", "start", "length")]
+        data = [f[f"data{k}"] for k in range(len(WIDTHS))]
+        return KeywordIndex(f["terms"], f["ids"], f["months"], *encoded, data)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m dss_selc.data_transform.facets",
+        description="Filter and count articles by keyword",
+    )
+    parser.add_argument("--all", nargs="+", default=[], help="tagged with all")
+    parser.add_argument("--any", nargs="+", default=[], help="tagged with any")
+    parser.add_argument("--top", type=int, help="list the most used keywords")
+    parser.add_argument("--path", type=Path, default=FACETS_PATH)
+    parser.add_argument("--build", action="store_true", help="rebuild first")
+    args = parser.parse_args()
+
+    if args.build:
+        build_keyword_index().save(args.path)
+    index = load_keyword_index(args.path)
+    print(f"[*] {len(index)} keywords, {index.nbytes / 2**10:.1f} KiB of postings")
+    if args.top:
+        print(index.top(args.top).to_string())
+    if args.all or args.any:
+        hits = index.all_of(args.all) if args.all else None
+        if args.any:
+            matches = index.any_of(args.any)
+            hits = matches if hits is None else np.intersect1d(hits, matches)
+        print(index.counts_by_month(hits).to_string())
+        print(f"[*] {len(hits)} articles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+from dss_selc.utils import store
+
+# rewrite a source's cache as a single part once it has this many deltas
+MAX_PARTS = 8
+# bump when DataProcessor changes how rows are built, to drop old caches
+CACHE_VERSION = 2
+
+
+def fingerprint(path: Path, previous: Optional[dict] = None) -> Optional[dict]:
+    """
+    Identify the current content of a store file.
+
+    Size and mtime are compared first; the SHA-1 of the file is only computed
+    when they differ from `previous`, so stores are not hashed on every run.
+    Stores rewritten with the same content get a new mtime but the same
+    SHA-1, see `same_content`.
+
+    Args:
+        path (Path): Store path, any format suffix.
+        previous (Optional[dict]): Fingerprint recorded by the last run.
+
+    Returns:
+        Optional[dict]: `{"file", "size", "mtime_ns", "sha1"}`, None if the
+            store does not exist.
+    """
+    fp = store.find(path)
+    if fp is None:
+        return None
+    stat = fp.stat()
+    current = {"file": fp.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if previous is not None and all(previous.get(k) == v for k, v in current.items()):
+        return previous
+    sha1 = hashlib.sha1()
+    with fp.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(block)
+    return {**current, "sha1": sha1.hexdigest()}
+
+
+def same_content(current: Optional[dict], previous: Optional[dict]) -> bool:
+    """Whether two fingerprints are of the same bytes, whatever their mtimes"""
+    if current is None or previous is None:
+        return current is previous
+    keys = ("file", "size", "sha1")
+    return all(current.get(k) == previous.get(k) for k in keys)
+
+
+def article_hash(article: dict) -> str:
+    """Stable hash of one raw article, to spot articles rewritten by a scraper"""
+    data = json.dumps(article, sort_keys=True, default=list).encode()
+    return hashlib.sha1(data).hexdigest()[:16]
+
+
+class SourceCache:
+    """
+    Processed rows of one source, stored as a base part plus delta parts.
+
+    Layout:
+        manifest.json       {"version", "fingerprint", "parts", "next_part"}
+        part-NNNNN.parquet  processed rows with their `id` and raw `_hash`
+
+    Rows of later parts replace earlier rows with the same `id` but keep the
+    position the article first appeared at, so the output order is stable.
+
+    Args:
+        root (Path): Directory of this source's cache.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.manifest_path = self.root / "manifest.json"
+        self.manifest = {
+            "version": CACHE_VERSION,
+            "fingerprint": None,
+            "parts": [],
+            "next_part": 0,
+        }
+        if self.manifest_path.exists():
+            with self.manifest_path.open("r") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == CACHE_VERSION:
+                self.manifest = manifest
+            else:
+                # old parts are overwritten as new ones are numbered from 0
+                self.manifest["parts"] = []
+        self._frame = None
+
+    @property
+    def fingerprint(self) -> Optional[dict]:
+        return self.manifest["fingerprint"]
+
+    def frame(self) -> pd.DataFrame:
+        """All cached rows, latest version of each article"""
+        if self._frame is None:
+            parts = [pd.read_parquet(self.root / p) for p in self.manifest["parts"]]
+            if not parts:
+                return pd.DataFrame(columns=["id", "_hash"])
+            frame = pd.concat(parts, ignore_index=True)
+            first = frame.drop_duplicates("id", keep="first")["id"]
+            latest = frame.drop_duplicates("id", keep="last").set_index("id")
+            self._frame = latest.loc[first].reset_index()[frame.columns]
+        return self._frame
+
+    def hashes(self) -> dict[str, str]:
+        frame = self.frame()
+        return dict(zip(frame["id"], frame["_hash"]))
+
+    def _write_part(self, frame: pd.DataFrame) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        name = f"part-{self.manifest['next_part']:>05}.parquet"
+        frame.to_parquet(self.root / name, index=False)
+        self.manifest["parts"].append(name)
+        self.manifest["next_part"] += 1
+
+    def update(
+        self,
+        delta: pd.DataFrame,
+        fingerprint: dict,
+        ids: Optional[set[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Append new or modified rows and record the store they came from.
+
+        Args:
+            delta (pd.DataFrame): Processed rows with `id` and `_hash` columns.
+            fingerprint (dict): Fingerprint of the store `delta` was read from.
+            ids (Optional[set[str]]): Every id currently in the store; cached
+                rows of articles no longer in it are dropped.
+
+        Returns:
+            pd.DataFrame: The updated rows of the source.
+        """
+        if len(delta):
+            self._write_part(delta)
+        self._frame = None
+        frame = self.frame()
+        stale = ids is not None and not frame["id"].isin(ids).all()
+        if stale:
+            frame = frame[frame["id"].isin(ids)].reset_index(drop=True)
+        if stale or len(self.manifest["parts"]) > MAX_PARTS:
+            old = self.manifest["parts"]
+            self.manifest["parts"] = []
+            self._write_part(frame)
+            for name in old:
+                (self.root / name).unlink(missing_ok=True)
+            self._frame = frame
+        self.record(fingerprint)
+        return frame
+
+    def record(self, fingerprint: dict) -> None:
+        """Save the manifest with the fingerprint of the store last read"""
+        self.manifest["fingerprint"] = fingerprint
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self.manifest_path.open("w") as f:
+            json.dump(self.manifest, f, indent=4)
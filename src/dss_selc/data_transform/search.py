@@ -0,0 +1,248 @@
+import argparse
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from dss_selc.data_transform.dataset import (
+    DATASET_PATH,
+    PARTITIONING,
+    partition_dir,
+    read_manifest,
+)
+from dss_selc.utils import DUMP_PATH
+
+INDEX_PATH = DUMP_PATH / "scraper" / "search.sqlite"
+# BM25 weight of title, summary and body; a title hit counts most
+WEIGHTS = (4.0, 2.0, 1.0)
+TEXT_COLUMNS = ["title", "summary", "body"]
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    rowid INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    source TEXT,
+    date TEXT,
+    part TEXT,
+    hash TEXT,
+    seen INTEGER
+);
+CREATE INDEX IF NOT EXISTS docs_source_date ON docs (source, date);
+CREATE INDEX IF NOT EXISTS docs_part ON docs (part);
+CREATE VIRTUAL TABLE IF NOT EXISTS fts USING fts5 (
+    title, summary, body, tokenize = 'porter unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def _row_hash(row: tuple) -> str:
+    data = "\x1f".join("" if v is None else str(v) for v in row)
+    return hashlib.sha1(data.encode()).hexdigest()[:16]
+
+
+class SearchIndex:
+    """
+    SQLite FTS5 index over the title, summary and body of the articles.
+
+    Tables:
+        docs   article id, source, date (YYYY-MM-DD), dataset partition and
+               content hash, by FTS rowid
+        fts    the indexed text, tokenized with the Porter stemmer
+        meta   partition hashes of the dataset when it was last indexed
+
+    Args:
+        path (Path): SQLite file, created if missing.
+    """
+
+    def __init__(self, path: Path = INDEX_PATH) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _meta(self, key: str, default: object) -> object:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,))
+        row = row.fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def _set_meta(self, key: str, value: object) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, json.dumps(value))
+        )
+
+    def _upsert(self, df: pd.DataFrame, part: str, run: int) -> int:
+        """Index the rows of one partition, returns how many changed"""
+        known = dict(
+            self.conn.execute(
+                "SELECT id, hash FROM docs WHERE part = ?", (part,)
+            ).fetchall()
+        )
+        dates = df["date"].dt.strftime("%Y-%m-%d").astype(object)
+        dates = dates.where(df["date"].notna(), None)
+        rows = zip(df["id"], df["source"], dates, *(df[c] for c in TEXT_COLUMNS))
+        changed = 0
+        for id_, source, date, *texts in rows:
+            texts = [None if pd.isna(t) else t for t in texts]
+            digest = _row_hash((source, date, *texts))
+            if known.get(id_) == digest:
+                self.conn.execute("UPDATE docs SET seen = ? WHERE id = ?", (run, id_))
+                continue
+            # a changed or moved article: replace both its doc row and its text
+            old = self.conn.execute("SELECT rowid FROM docs WHERE id = ?", (id_,))
+            old = old.fetchone()
+            if old is not None:
+                self.conn.execute("DELETE FROM fts WHERE rowid = ?", old)
+                self.conn.execute("DELETE FROM docs WHERE rowid = ?", old)
+            cursor = self.conn.execute(
+                "INSERT INTO docs (id, source, date, part, hash, seen)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (id_, source, date, part, digest, run),
+            )
+            self.conn.execute(
+                "INSERT INTO fts (rowid, title, summary, body) VALUES (?, ?, ?, ?)",
+                (cursor.lastrowid, *texts),
+            )
+            changed += 1
+        return changed
+
+    def update(self, root: Path = DATASET_PATH) -> dict[str, int]:
+        """
+        Bring the index in line with the article dataset.
+
+        Only partitions whose hash in the dataset manifest changed since the
+        last update are read, and inside them only rows whose content hash
+        changed are reindexed; articles no longer in the dataset are removed.
+
+        Args:
+            root (Path): Dataset directory written by `write_dataset`.
+
+        Returns:
+            dict[str, int]: Partitions read, rows (re)indexed and removed.
+        """
+        partitions = read_manifest(root)["partitions"]
+        previous = self._meta("partitions", {})
+        changed = [k for k, v in partitions.items() if previous.get(k) != v]
+        gone = [k for k in previous if k not in partitions]
+        run = int(self._meta("run", 0)) + 1
+        indexed = 0
+        with self.conn:
+            if changed:
+                dataset = ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+                columns = ["id", "date", *TEXT_COLUMNS]
+                for fragment in dataset.get_fragments():
+                    keys = ds.get_partition_keys(fragment.partition_expression)
+                    part = partition_dir(keys["source"], keys["year"], keys["month"])
+                    if part not in changed:
+                        continue
+                    table = fragment.to_table(columns=columns, schema=dataset.schema)
+                    df = table.to_pandas().assign(source=keys["source"])
+                    indexed += self._upsert(df, part, run)
+            # rows of re-read partitions that were not seen have gone or moved
+            stale = [*changed, *gone]
+            removed = 0
+            for part in stale:
+                rowids = self.conn.execute(
+                    "SELECT rowid FROM docs WHERE part = ? AND seen != ?", (part, run)
+                ).fetchall()
+                self.conn.executemany("DELETE FROM fts WHERE rowid = ?", rowids)
+                self.conn.executemany("DELETE FROM docs WHERE rowid = ?", rowids)
+                removed += len(rowids)
+            self._set_meta("partitions", partitions)
+            self._set_meta("run", run)
+        return {"partitions": len(changed), "indexed": indexed, "removed": removed}
+
+    def search(
+        self,
+        query: str,
+        sources: Optional[list[str]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: int = 20,
+    ) -> pd.DataFrame:
+        """
+        Rank articles matching a full-text query by BM25.
+
+        Args:
+            query (str): FTS5 query: words (stemmed, all required), "phrases",
+                OR, NOT, NEAR(...) and column filters such as `title: solar`.
+            sources (Optional[list[str]]): Keep only these sources.
+            start (Optional[str]): First date to keep, anything
+                `pd.Timestamp` takes.
+            end (Optional[str]): Last date to keep, inclusive.
+            limit (int): Number of results.
+
+        Returns:
+            pd.DataFrame: `id`, `score` (higher is better), `source`, `date`
+                and `title` of the best matches, best first.
+
+        Usage:
+            index.search("rooftop solar subsidy", sources=["mercom"], start="2024")
+        """
+        where, params = ["fts MATCH ?"], [query]
+        if sources is not None:
+            where.append(f"d.source IN ({', '.join('?' * len(sources))})")
+            params.extend(sources)
+        if start is not None:
+            where.append("d.date >= ?")
+            params.append(pd.Timestamp(start).strftime("%Y-%m-%d"))
+        if end is not None:
+            where.append("d.date <= ?")
+            params.append(pd.Timestamp(end).strftime("%Y-%m-%d"))
+        sql = (
+            f"SELECT d.id, -bm25(fts, {', '.join(map(str, WEIGHTS))}) AS score,"
+            " d.source, d.date, fts.title"
+            " FROM fts JOIN docs d ON d.rowid = fts.rowid"
+            f" WHERE {' AND '.join(where)} ORDER BY score DESC LIMIT ?"
+        )
+        rows = self.conn.execute(sql, (*params, limit)).fetchall()
+        return pd.DataFrame(rows, columns=["id", "score", "source", "date", "title"])
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT count(*) FROM docs").fetchone()[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m dss_selc.data_transform.search",
+        description="Full-text search over the transformed articles",
+    )
+    parser.add_argument("query", nargs="?", help="FTS5 query")
+    parser.add_argument("--source", action="append", dest="sources")
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--index", type=Path, default=INDEX_PATH)
+    parser.add_argument("--dataset", type=Path, default=DATASET_PATH)
+    parser.add_argument("--update", action="store_true", help="reindex first")
+    args = parser.parse_args()
+
+    with SearchIndex(args.index) as index:
+        if args.update:
+            report = index.update(args.dataset)
+            print(f"[*] Index: {report}, {len(index)} articles")
+        if args.query is None:
+            return
+        start = time.perf_counter()
+        hits = index.search(args.query, args.sources, args.start, args.end, args.limit)
+        elapsed = (time.perf_counter() - start) * 1000
+        with pd.option_context("display.max_colwidth", 80, "display.width", 160):
+            print(hits.to_string(index=False))
+        print(f"[*] {len(hits)} hits in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
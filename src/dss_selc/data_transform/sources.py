@@ -0,0 +1,107 @@
+ORDINAL_SUFFIX = r"(\d+)(st|nd|rd|th)"
+
+# column -> schema.org NewsArticle key, for the JSON-LD sources
+JSONLD_FIELDS = {
+    "url": "url",
+    "title": "headline",
+    "summary": "description",
+    "body": "articleBody",
+    "date": "datePublished",
+    "kws": "keywords",
+}
+# column -> key of the flat article dicts of the listing scrapers
+LISTING_FIELDS = {
+    "url": "url",
+    "title": "title",
+    "summary": "summary",
+    "body": "body",
+    "date": "date_published",
+    "kws": "key_words",
+}
+
+
+def _under(prefix: str, fields: dict[str, str]) -> dict[str, str]:
+    return {column: f"{prefix}.{path}" for column, path in fields.items()}
+
+
+# How each source's store maps to the article table. Keys:
+#   fields   column -> dotted path into a stored article; absent columns and
+#            paths that do not resolve become nulls
+#   lists    columns coerced to lists: scalars are wrapped, missing values
+#            become []
+#   require  paths that must resolve to a non-empty value to keep an article
+#   date     how the source writes its publication date:
+#              format  strftime format of the (cleaned) string
+#              prefix  keep only the first n characters, e.g. the local date
+#                      of an ISO 8601 timestamp, so mixed UTC offsets need no
+#                      tz handling
+#              clean   (pattern, replacement) applied before parsing
+#              utc     convert to UTC before taking the date
+SOURCES = {
+    # JSON-LD datePublished, "2024-07-10T18:05:00+05:30"
+    "ec": {
+        "fields": JSONLD_FIELDS,
+        "lists": ["kws"],
+        "require": [],
+        "date": {"format": "%Y-%m-%d", "prefix": 10},
+    },
+    # the JSON-LD is stored under "data" once the article page was fetched
+    "eec": {
+        "fields": _under("data", JSONLD_FIELDS),
+        "lists": ["kws"],
+        "require": ["data"],
+        "date": {"format": "%Y-%m-%d", "prefix": 10},
+    },
+    "nleec": {
+        "fields": _under("data", JSONLD_FIELDS),
+        "lists": ["kws"],
+        "require": ["data", "data.articleBody"],
+        "date": {"format": "%Y-%m-%d", "prefix": 10},
+    },
+    # WordPress GraphQL, "2024-07-10T18:05:00"; no summary
+    "mercom": {
+        "fields": {
+            "url": "url",
+            "title": "title",
+            "body": "body",
+            "date": "date",
+            "kws": "categories",
+        },
+        "lists": [],
+        "require": [],
+        "date": {"format": "%Y-%m-%d", "prefix": 10},
+    },
+    # "Wed, Jul 10th, 2024"
+    "saur": {
+        "fields": LISTING_FIELDS,
+        "lists": [],
+        "require": [],
+        "date": {"format": "%a, %b %d, %Y", "clean": (ORDINAL_SUFFIX, r"\1")},
+    },
+    # <time datetime="2024-07-10T18:05:00+05:30">
+    "pvmag": {
+        "fields": LISTING_FIELDS,
+        "lists": [],
+        "require": [],
+        "date": {"format": "%Y-%m-%d", "prefix": 10},
+    },
+    "pvmag_global": {
+        "fields": LISTING_FIELDS,
+        "lists": [],
+        "require": [],
+        "date": {"format": "ISO8601", "utc": True},
+    },
+    "pvmag_us": {
+        "fields": LISTING_FIELDS,
+        "lists": [],
+        "require": [],
+        "date": {"format": "ISO8601", "utc": True},
+    },
+}
+
+
+def get_source(source: str) -> dict:
+    """Mapping of `source`, raising a ValueError for unknown sources"""
+    if source not in SOURCES:
+        raise ValueError(f"No schema mapping for source {source!r}, see SOURCES")
+    return SOURCES[source]
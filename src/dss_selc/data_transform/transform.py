@@ -1,4 +1,10 @@
+from typing import Optional
+
+from dss_selc.data_transform.aggregates import AGGREGATES_PATH
 from dss_selc.data_transform.data_processor import DataProcessor
+from dss_selc.data_transform.dataset import DATASET_PATH
+from dss_selc.data_transform.facets import FACETS_PATH
+from dss_selc.data_transform.search import INDEX_PATH
 from dss_selc.utils import DUMP_PATH
 
 json_files = {
@@ -6,16 +12,50 @@ json_files = {
     "eec": DUMP_PATH / "scraper/eec/renewable-news.json",
     "nleec": DUMP_PATH / "scraper/nleec/renewable.json",
 }
+other_sources = {
+    "mercom": DUMP_PATH / "scraper/mercom/mercom.json",
+    "saur": DUMP_PATH / "scraper/saur/saur.json",
+    "pvmag": DUMP_PATH / "scraper/pvmag/pvmag.json",
+    "pvmag_global": DUMP_PATH / "scraper/pvmag/pvmag_global.json",
+    "pvmag_us": DUMP_PATH / "scraper/pvmag/pvmag_usa.json",
+}
 
 
-def transform_data() -> None:
-    transformer = DataProcessor(json_files)
+def transform_data(
+    incremental: bool = False,
+    batch_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    engine: str = "pandas",
+    search_index: bool = True,
+    facets: bool = True,
+    aggregates: bool = True,
+) -> None:
+    """
+    Rebuild the partitioned article dataset from the scraper dumps.
 
-    other_sources = {
-        "mercom": DUMP_PATH / "scraper/mercom/mercom.json",
-        "saur": DUMP_PATH / "scraper/saur/saur.json",
-        "pvmag": DUMP_PATH / "scraper/pvmag/pvmag.json",
-        "pvmag_global": DUMP_PATH / "scraper/pvmag/pvmag_global.json",
-        "pvmag_us": DUMP_PATH / "scraper/pvmag/pvmag_usa.json",
-    }
-    transformer.transform(other_sources, DUMP_PATH / "scraper/articles.parquet")
+    Args:
+        incremental (bool): Reuse the rows of unchanged sources and process
+            only new or changed articles of the others.
+        batch_size (Optional[int]): Stream the dumps this many articles at a
+            time to bound memory; not combinable with `incremental`.
+        workers (Optional[int]): Process the sources in parallel, in this many
+            worker processes.
+        engine (str): "pandas" or "arrow", see `DataProcessor`.
+        search_index (bool): Keep the full-text index at `INDEX_PATH` up to
+            date with the dataset.
+        facets (bool): Rebuild the keyword index at `FACETS_PATH`.
+        aggregates (bool): Keep the rollups at `AGGREGATES_PATH` up to date
+            with the dataset.
+    """
+    cache_dir = DUMP_PATH / "scraper/transform_cache" if incremental else None
+    transformer = DataProcessor(
+        json_files,
+        cache_dir,
+        batch_size,
+        workers,
+        engine,
+        index_path=INDEX_PATH if search_index else None,
+        facets_path=FACETS_PATH if facets else None,
+        aggregates_path=AGGREGATES_PATH if aggregates else None,
+    )
+    transformer.transform(other_sources, DATASET_PATH)
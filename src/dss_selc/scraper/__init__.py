@@ -10,6 +10,9 @@ from dss_selc.scraper.pvmag import PvMagScraper
 from dss_selc.scraper.pvmag_global import PvMagGlobalScraper
 from dss_selc.scraper.pvmag_usa import PvMagUSAScraper
 from dss_selc.scraper.saur import SaurScraper
+from dss_selc.utils.log import fields, get_logger
+
+log = get_logger("scraper")
 
 
 class Scraper:
@@ -24,13 +27,13 @@ class Scraper:
         self.saur = SaurScraper()
 
     def fetch_ec(self) -> None:
-        print(" Economic Times ".center(50, "="))
+        log.info(" Economic Times ".center(50, "="))
         self.ec.fetch_ec("hybrid")
         self.ec.fetch_ec("renewable-regulation")
         self.ec.fetch_ec("solar")
 
     def fetch_eec(self) -> None:
-        print(" Energy Economic Times ".center(50, "="))
+        log.info(" Energy Economic Times ".center(50, "="))
         self.eec.fetch_articles("all-news")
         self.eec.fetch_articles("renewable-news")
         self.eec.fetch_articles("economy-news")
@@ -39,31 +42,31 @@ class Scraper:
         self.eec.fetch_articles("power-news")
 
     def fetch_nleec(self) -> None:
-        print(" Energy Economic Times Newsletter ".center(50, "="))
+        log.info(" Energy Economic Times Newsletter ".center(50, "="))
         self.nleec.fetch_newsletters()
         self.nleec.fetch_articles()
 
     def fetch_mercom(self) -> None:
-        print(" Mercom ".center(50, "="))
+        log.info(" Mercom ".center(50, "="))
         self.mrcm.fetch_articles()
 
     def fetch_pvinda(self) -> None:
-        print(" PV Mag India ".center(50, "="))
+        log.info(" PV Mag India ".center(50, "="))
         self.pvindia.fetch_articles()
         self.cautious_fetch(self.pvindia.fetch_body)
 
     def fetch_pvusa(self) -> None:
-        print(" PV Mag USA ".center(50, "="))
+        log.info(" PV Mag USA ".center(50, "="))
         self.pvusa.fetch_articles()
         self.cautious_fetch(self.pvusa.fetch_body)
 
     def fetch_pvglobal(self) -> None:
-        print(" PV Mag Global ".center(50, "="))
+        log.info(" PV Mag Global ".center(50, "="))
         self.pvglobal.fetch_articles()
         self.cautious_fetch(self.pvglobal.fetch_body)
 
     def fetch_saur(self) -> None:
-        print(" Saur ".center(50, "="))
+        log.info(" Saur ".center(50, "="))
         self.cautious_fetch(self.saur.fetch_articles)
         self.cautious_fetch(self.saur.fetch_body)
 
@@ -82,13 +85,21 @@ class Scraper:
             method()
         except Exception as e:
             ts += 2
-            print(f"Sleeping for {min(300, ts)}s\n{str(e)=}")
             exc_type, _, exc_tb = sys.exc_info()
             fname = traceback.extract_tb(exc_tb)[-1][0]
             line_number = traceback.extract_tb(exc_tb)[-1][1]
-            print(f"Exception type: {exc_type}")
-            print(f"File name: {fname}:{line_number}")
-            print(f"Error message: {str(e)}")
+            log.error(
+                f"Sleeping for {min(300, ts)}s\n{str(e)=}\n"
+                f"Exception type: {exc_type}\n"
+                f"File name: {fname}:{line_number}\n"
+                f"Error message: {str(e)}",
+                extra=fields(
+                    method=method.__qualname__,
+                    exc_type=exc_type.__name__,
+                    file=f"{fname}:{line_number}",
+                    backoff=min(300, ts),
+                ),
+            )
 
             time.sleep(min(300, ts))
             self.cautious_fetch(method, ts)
@@ -0,0 +1,75 @@
+import argparse
+from pathlib import Path
+from typing import Optional
+
+from dss_selc.scraper.jsonld import ARTICLE_FIELDS, RawArchive, project
+from dss_selc.utils import store
+from dss_selc.utils.log import get_logger
+
+log = get_logger("scraper.compact")
+
+
+def compact_listing(
+    fp: Path,
+    fields: tuple[str, ...] = ARTICLE_FIELDS,
+    archive: Optional[RawArchive] = None,
+) -> int:
+    """
+    Project the `data` payloads of an existing EEC/NLEEC dump in place.
+
+    Payloads without keys outside `fields` are already projected and left
+    alone, so running it again archives and rewrites nothing.
+
+    Args:
+        fp (Path): Listing store, `{article_id: {..., "data": {...}}}`; it is
+            rewritten in the configured store format.
+        fields (tuple[str, ...]): JSON-LD keys to keep.
+        archive (Optional[RawArchive]): Where to keep the full payloads first.
+
+    Returns:
+        int: Number of payloads projected.
+    """
+    articles = store.load(fp)
+    keep = set(fields)
+    full = [
+        (k, v["data"])
+        for k, v in articles.items()
+        if v.get("data") and not set(v["data"]) <= keep
+    ]
+    if not full:
+        return 0
+    if archive is not None:
+        archive.extend(iter(full))
+    for k, data in full:
+        articles[k]["data"] = project(data, fields)
+    store.dump(articles, fp)
+    return len(full)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m dss_selc.scraper.compact",
+        description="Shrink existing EEC/NLEEC dumps to the fields used downstream",
+    )
+    parser.add_argument("listings", nargs="+", type=Path)
+    parser.add_argument(
+        "--no-raw",
+        action="store_true",
+        help="drop the full payloads instead of archiving them under raw/",
+    )
+    args = parser.parse_args()
+    for fp in args.listings:
+        before = store.find(fp).stat().st_size
+        name = store.base_path(fp).name
+        archive = None
+        if not args.no_raw:
+            archive = RawArchive(fp.parent / "raw" / f"{name}.jsonl.gz")
+        count = compact_listing(fp, archive=archive)
+        log.info(
+            f"{name}: projected {count} payloads, {before / 2**20:.1f} MB"
+            f" -> {store.find(fp).stat().st_size / 2**20:.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,10 @@ from typing import Any, Optional
 import requests
 from bs4 import BeautifulSoup
 
-from dss_selc.utils import DUMP_PATH, PROXIES, USE_SOCKS
+from dss_selc.utils import DUMP_PATH, PROXIES, USE_SOCKS, store
+from dss_selc.utils.log import Progress, get_logger
+
+log = get_logger("scraper.ec")
 
 
 class ECScraper:
@@ -74,7 +77,7 @@ class ECScraper:
             proxies=PROXIES if USE_SOCKS is True else None,
         )
         if resp.status_code != 200:
-            print(f"[!] {resp.status_code} Error fetching article: {url}")
+            log.warning(f"{resp.status_code} Error fetching article: {url}")
             return None
         soup = BeautifulSoup(resp.text, "html.parser")
         script_tag = soup.find_all("script", type="application/ld+json")[1]
@@ -82,10 +85,10 @@ class ECScraper:
             details = script_tag.string.replace("\n", "").replace("\t", "")
             data = json.loads(details)
         except JSONDecodeError:
-            print(repr(script_tag.string))
+            log.error(repr(script_tag.string))
             raise
         headline = data.get("headline", "Headline DNE")
-        print(f"[*] [{len(self.ec_articles) + 1}] {headline}")
+        log.debug(f"[{len(self.ec_articles) + 1}] {headline}")
         return data
 
     def _get_article_listings(self, soup: BeautifulSoup) -> bool:
@@ -101,22 +104,25 @@ class ECScraper:
         """
         article_listings = soup.find_all("li")
         if len(article_listings) == 0:
-            print("[!] Reached EOL. Scraping Done.")
+            log.info("Reached EOL. Scraping Done.")
             return False
 
         for element in article_listings:
             if (meta := self._get_article_meta(element)) is None:
-                print("[!] Error in extracting metadata.")
+                log.warning("Error in extracting metadata.")
+                self.progress.update("failed")
                 continue
             article_id = meta["url"].split("/")[-1].split(".")[0]
             if article_id in self.ec_articles:
-                print("[!] Duplicate Spotted. List is upto date. Exiting")
+                log.info("Duplicate Spotted. List is upto date. Exiting")
                 return False
             article_detail = self._get_article_details(meta["url"])
             if article_detail is None:
-                print("[!] Error in extracting details.")
+                log.warning("Error in extracting details.")
+                self.progress.update("failed")
                 continue
             self.ec_articles[article_id] = article_detail
+            self.progress.update("fetched")
         return True
 
     def _dump_listing(self, topic: str) -> None:
@@ -127,9 +133,8 @@ class ECScraper:
             topic (str): Article topic
         """
 
-        with open(self.ecdir / f"{topic}.json", "w") as f:
-            json.dump(self.ec_articles, f, indent=4)
-        print(f"[*] Dumped {len(self.ec_articles):>04} {topic} articles.")
+        store.dump(self.ec_articles, self.ecdir / f"{topic}.json")
+        log.info(f"Dumped {len(self.ec_articles):>04} {topic} articles.")
 
     def _load_listing(self, topic: str) -> None:
         """
@@ -141,15 +146,13 @@ class ECScraper:
 
         fp = self.ecdir / f"{topic}.json"
 
-        if fp.exists():
-            print(f"[*] {fp.name} exist, loading it.")
-            with fp.open("r") as file:
-                self.ec_articles = json.load(file)
-            print(f"[*] {len(self.ec_articles)} articles loaded")
+        if store.exists(fp):
+            log.info(f"{fp.name} exist, loading it.")
+            self.ec_articles = store.load(fp)
+            log.info(f"{len(self.ec_articles)} articles loaded")
         else:
-            fp.touch()
             self.ec_articles = {}
-            print(f"[*] {fp.name} does not exist, creating one.")
+            log.info(f"{fp.name} does not exist, creating one.")
 
     def fetch_ec(self, topic: str) -> None:
         """
@@ -163,6 +166,7 @@ class ECScraper:
         self._load_listing(topic)
         cmfid_url = ECScraper.EC_CMFID_URL.get(topic)
         page_count = 0
+        self.progress = Progress(log, f"ec {topic}")
         while True:
             page_count += 1
             requrl = cmfid_url.format(pg=page_count)
@@ -172,8 +176,8 @@ class ECScraper:
                 proxies=PROXIES if USE_SOCKS is True else None,
             )
             if response.status_code != 200:
-                print(
-                    f"[*] [{len(self.ec_articles):>04}] URL: {response.url}\n"
+                log.warning(
+                    f"[{len(self.ec_articles):>04}] URL: {response.url}\n"
                     f"Status Code: {(response.status_code)}"
                 )
                 continue
@@ -181,4 +185,5 @@ class ECScraper:
             if self._get_article_listings(soup) is False or None:
                 break
             self._dump_listing(topic)
+        self.progress.close()
         self._dump_listing(topic)
@@ -6,7 +6,11 @@ from typing import Any, Optional
 import requests
 from bs4 import BeautifulSoup
 
-from dss_selc.utils import DUMP_PATH, PROXIES, USE_SOCKS
+from dss_selc.scraper.jsonld import ARTICLE_FIELDS, RawArchive, project
+from dss_selc.utils import DUMP_PATH, PROXIES, USE_SOCKS, store
+from dss_selc.utils.log import Progress, get_logger
+
+log = get_logger("scraper.eec")
 
 
 class EECScraper:
@@ -26,6 +30,10 @@ class EECScraper:
     }
     ENERGY_BASE = "https://energy.economictimes.indiatimes.com"
     AJAX_CALL_URL = "https://energy.economictimes.indiatimes.com/ajax/call"
+    # JSON-LD keys stored with each article, None stores the whole payload
+    DATA_FIELDS = ARTICLE_FIELDS
+    # also append the full payload to raw/{topic}.jsonl.gz
+    KEEP_RAW = True
 
     def __init__(self) -> None:
         """Initialize Scraper object and create scraper directory"""
@@ -43,18 +51,17 @@ class EECScraper:
         """
 
         fp = self.eecdir / f"{topic}.json"
+        self.raw = RawArchive(self.eecdir / "raw" / f"{topic}.jsonl.gz")
 
-        if fp.exists():
-            print(f"[*] {fp.name} exist, loading it.")
-            with fp.open("r") as file:
-                self.eec_articles = json.load(file)
-            print(f"[*] {len(self.eec_articles)} articles loaded")
+        if store.exists(fp):
+            log.info(f"{fp.name} exist, loading it.")
+            self.eec_articles = store.load(fp)
+            log.info(f"{len(self.eec_articles)} articles loaded")
             self.first_time = False
         else:
-            fp.touch()
             self.first_time = True
             self.eec_articles = {}
-            print(f"[*] {fp.name} does not exist, creating one.")
+            log.info(f"{fp.name} does not exist, creating one.")
 
     def _dump_listing(self, topic: str) -> None:
         """
@@ -64,9 +71,8 @@ class EECScraper:
             topic (str): Article topic
         """
 
-        with open(self.eecdir / f"{topic}.json", "w") as f:
-            json.dump(self.eec_articles, f, indent=4)
-        print(f"[*] Dumped {len(self.eec_articles):>04} {topic} articles.")
+        store.dump(self.eec_articles, self.eecdir / f"{topic}.json")
+        log.info(f"Dumped {len(self.eec_articles):>04} {topic} articles.")
 
     def _get_meta(self, soup: BeautifulSoup) -> Optional[str]:
         """
@@ -90,7 +96,7 @@ class EECScraper:
         summary = re.sub(r"\s+", " ", soup.find("p").get_text()).strip()
         article_id = url.split("/")[-1].partition("?")[0]
         if article_id in self.eec_articles and self.first_time is False:
-            print(f"[!] [{len(self.eec_articles):>04}] Duplicate Spotted, exiting.")
+            log.info(f"[{len(self.eec_articles):>04}] Duplicate Spotted, exiting.")
             return None
         self.eec_articles[article_id] = {
             "url": url,
@@ -107,12 +113,14 @@ class EECScraper:
             article_id (str): Unique identifier for the article.
 
         Retrieves the full article page, extracts detailed information
-        from the JSON-LD script tag, and adds it to the article's data.
+        from the JSON-LD script tag, and adds its `DATA_FIELDS` to the
+        article's data.
         """
         url = self.eec_articles[article_id]["url"]
         response = requests.get(url, proxies=PROXIES if USE_SOCKS is True else None)
         if response.status_code != 200:
-            print(f"[!] {response.status_code} {url=}")
+            log.warning(f"{response.status_code} {url=}")
+            self.progress.update("failed")
             return
         soup = BeautifulSoup(response.text, "html.parser")
         script_tag = soup.find_all("script", type="application/ld+json")[1]
@@ -120,11 +128,15 @@ class EECScraper:
             data = json.loads(script_tag.string)
 
         except JSONDecodeError:
-            print(f"[!] Decoding Error for {article_id}")
+            log.warning(f"Decoding Error for {article_id}")
+            self.progress.update("failed")
             return
         headline = data.get("headline", "Dummy Headline")
-        self.eec_articles[article_id]["data"] = data
-        print(f"[*] [{len(self.eec_articles)}] {headline}")
+        if self.KEEP_RAW is True:
+            self.raw.append(article_id, data)
+        self.eec_articles[article_id]["data"] = project(data, self.DATA_FIELDS)
+        log.debug(f"[{len(self.eec_articles)}] {headline}")
+        self.progress.update("fetched")
 
     def _get_articles(self, resp_json: dict) -> Optional[bool]:
         """
@@ -216,9 +228,10 @@ class EECScraper:
         """
         self._load_listing(topic)
         page_count = 0
+        self.progress = Progress(log, f"eec {topic}")
         while True:
             page_count += 1
-            print(f"[*] Scraping page {page_count}")
+            log.debug(f"Scraping page {page_count}")
             params = self._get_pararms(page_count, topic)
             response = requests.get(
                 self.AJAX_CALL_URL,
@@ -227,16 +240,17 @@ class EECScraper:
                 proxies=PROXIES if USE_SOCKS is True else None,
             )
             if response.status_code != 200:
-                print(
-                    f"[*] [{len(self.eec_articles):>04}] URL: {response.url}\n"
+                log.warning(
+                    f"[{len(self.eec_articles):>04}] URL: {response.url}\n"
                     f"Status Code: {(response.status_code)}"
                 )
                 continue
             resp_json = response.json()
             if resp_json["data"]["has_reached_end"] is True:
-                print("[!] Reached last page, stopping.")
+                log.info("Reached last page, stopping.")
                 break
             if self._get_articles(resp_json) is None:
                 break
             self._dump_listing(topic)
+        self.progress.close()
         self._dump_listing(topic)
@@ -0,0 +1,61 @@
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+# the only JSON-LD keys the transform reads, see data_transform.sources
+ARTICLE_FIELDS = (
+    "url",
+    "headline",
+    "description",
+    "articleBody",
+    "datePublished",
+    "keywords",
+)
+
+
+def project(data: dict[str, Any], fields: Optional[tuple[str, ...]]) -> dict:
+    """
+    Keep only `fields` of a JSON-LD payload.
+
+    Args:
+        data (dict[str, Any]): Parsed JSON-LD object.
+        fields (Optional[tuple[str, ...]]): Keys to keep, None keeps everything.
+
+    Returns:
+        dict: The projected payload; missing keys are simply left out.
+    """
+    if fields is None:
+        return data
+    return {k: data[k] for k in fields if k in data}
+
+
+class RawArchive:
+    """
+    Append-only, gzip-compressed JSON-lines archive of full payloads.
+
+    Every `append` adds a gzip member holding one `{"id": ..., "data": ...}`
+    line, so the file stays valid if the scraper dies mid-run.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    def append(self, article_id: str, data: dict[str, Any]) -> None:
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        with gzip.open(self.path, "at") as f:
+            f.write(json.dumps({"id": article_id, "data": data}) + "\n")
+
+    def extend(self, records: Iterator[tuple[str, dict[str, Any]]]) -> None:
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        with gzip.open(self.path, "at") as f:
+            for article_id, data in records:
+                f.write(json.dumps({"id": article_id, "data": data}) + "\n")
+
+    def __iter__(self) -> Iterator[tuple[str, dict[str, Any]]]:
+        if not self.path.exists():
+            return
+        with gzip.open(self.path, "rt") as f:
+            for line in f:
+                record = json.loads(line)
+                yield record["id"], record["data"]
@@ -1,10 +1,12 @@
-import json
 from typing import Optional
 
 import requests
 from bs4 import BeautifulSoup
 
-from dss_selc.utils import DUMP_PATH, PROXIES, USE_SOCKS
+from dss_selc.utils import DUMP_PATH, PROXIES, USE_SOCKS, store
+from dss_selc.utils.log import Progress, get_logger
+
+log = get_logger("scraper.mercom")
 
 
 class MrcmScraper:
@@ -72,29 +74,26 @@ class MrcmScraper:
 
     def _load_listing(self) -> None:
         fp = self.mcmdir / "mercom.json"
-        if fp.exists():
-            print(f"[*] {fp.name} exist, loading it.")
-            with fp.open("r") as file:
-                self.mcm_articles = json.load(file)
-            print(f"[*] {len(self.mcm_articles):>05} articles loaded")
+        if store.exists(fp):
+            log.info(f"{fp.name} exist, loading it.")
+            self.mcm_articles = store.load(fp)
+            log.info(f"{len(self.mcm_articles):>05} articles loaded")
             # self.first_time = False
 
         else:
-            fp.touch()
             self.mcm_articles = {}
-            print(f"[*] {fp.name} does not exist, creating one.")
+            log.info(f"{fp.name} does not exist, creating one.")
             # self.first_time = True
 
     def _dump_listing(self) -> None:
-        with open(self.mcmdir / "mercom.json", "w") as f:
-            json.dump(self.mcm_articles, f, indent=4)
-        print(f"[*] Dumped {len(self.mcm_articles):>05} mercom articles.")
+        store.dump(self.mcm_articles, self.mcmdir / "mercom.json")
+        log.info(f"Dumped {len(self.mcm_articles):>05} mercom articles.")
 
     def _add_articles(self, response: requests.Response) -> Optional[bool]:
         try:
             resp_json = response.json()
         except Exception as e:
-            print(f"[!] [{len(self.mcm_articles):>05}] JSON Error! {str(e)}")
+            log.warning(f"[{len(self.mcm_articles):>05}] JSON Error! {str(e)}")
             return None
 
         articles = resp_json["data"]["posts"]["nodes"]
@@ -104,11 +103,12 @@ class MrcmScraper:
         for article in articles:
             article_id = article["id"]
             if article_id in self.mcm_articles:
-                print(f"\t[*] {article_id} already scraped.")
-                print("\t[!] List is upto date, exiting.")
+                log.info(f"{article_id} already scraped.")
+                log.info("List is upto date, exiting.")
                 return False
             content = article["content"]
             if content is None:
+                self.progress.update("empty")
                 continue
             soup = BeautifulSoup(content, "html.parser")
             ab = " ".join(p.get_text(strip=True).strip() for p in soup.find_all("p"))
@@ -121,17 +121,19 @@ class MrcmScraper:
                 "author": article["author"]["node"]["name"],
             }
             self.mcm_articles[article_id] = article_info
-            print(
-                f"\t[*] [{len(self.mcm_articles):>05}] "
+            log.debug(
+                f"[{len(self.mcm_articles):>05}] "
                 f"[{article['date']}] {article_info['title']}"
             )
+            self.progress.update("fetched")
         return True
 
     def fetch_articles(self) -> None:
         self._load_listing()
         offset = 0
+        self.progress = Progress(log, "mercom")
         while True:
-            print(f"[*] Offset = {offset}")
+            log.debug(f"Offset = {offset}")
             variables = {"offset": offset, "size": 15}
             payload = {"query": MrcmScraper.GRAPHQL_QUERY, "variables": variables}
 
@@ -143,13 +145,14 @@ class MrcmScraper:
             )
 
             if response.status_code != 200:
-                print(
-                    f"[!] [{len(self.mcm_articles):>05}] "
+                log.warning(
+                    f"[{len(self.mcm_articles):>05}] "
                     f"{offset=} {response.status_code=}"
                 )
             if self._add_articles(response) is False:
-                print("[?] Probably reached EOL, exiting.")
+                log.info("Probably reached EOL, exiting.")
                 break
             self._dump_listing()
             offset += 15
+        self.progress.close()
         self._dump_listing()
@@ -2,20 +2,17 @@ import json
 import re
 import time
 from datetime import datetime, timedelta
-from typing import Any, Generator, Iterable, Union
+from typing import Generator
 
 import requests
 from bs4 import BeautifulSoup
 
 from dss_selc.scraper.eec import EECScraper
-from dss_selc.utils import DUMP_PATH, PROXIES, USE_SOCKS
+from dss_selc.scraper.jsonld import ARTICLE_FIELDS, RawArchive, project
+from dss_selc.utils import DUMP_PATH, PROXIES, USE_SOCKS, store
+from dss_selc.utils.log import Progress, fields, get_logger
 
-
-class SetEncoder(json.JSONEncoder):
-    def default(self, obj: Iterable) -> Union[list, Any]:
-        if isinstance(obj, set):
-            return list(obj)
-        return json.JSONEncoder.default(self, obj)
+log = get_logger("scraper.nleec")
 
 
 def date_range(
@@ -41,6 +38,9 @@ class NLEECScraper:
         ENERGY_BASE (str): Base URL for the Energy section.
         NL_BASE (str): Base URL for newsletters.
         AJAX_CALL_URL (str): URL for AJAX calls.
+        PAUSE_TIME (float): Seconds to wait after listing the link counts.
+        DATA_FIELDS (tuple): JSON-LD keys stored per article, None keeps all.
+        KEEP_RAW (bool): Also archive the full JSON-LD payloads.
 
     Methods:
         fetch_articles(): Fetches articles from categorized newsletter links.
@@ -59,6 +59,7 @@ class NLEECScraper:
     - ./dump/scraper/nleec/: Root directory for scraped data
     - newsletter.json: Stores all newsletter data
     - {category}.json: Stores articles for each category
+    - raw/{category}.jsonl.gz: Full JSON-LD payloads, if KEEP_RAW is set
     - errors.json: Stores IDs of articles that couldn't be scraped
 
     Usage:
@@ -93,6 +94,9 @@ class NLEECScraper:
     ENERGY_BASE = "https://energy.economictimes.indiatimes.com"
     NL_BASE = url = ENERGY_BASE + "/newsletter?for_date={date}&activity_id=35"
     AJAX_CALL_URL = "https://energy.economictimes.indiatimes.com/ajax/call"
+    PAUSE_TIME = 5.0
+    DATA_FIELDS = ARTICLE_FIELDS
+    KEEP_RAW = True
 
     def __init__(self) -> None:
         """
@@ -118,16 +122,15 @@ class NLEECScraper:
         """
 
         fp = self.nleecdir / f"{topic}.json"
+        self.raw = RawArchive(self.nleecdir / "raw" / f"{topic}.jsonl.gz")
 
-        if fp.exists():
-            print(f"[*] {fp.name} exist, loading it.")
-            with fp.open("r") as file:
-                self.eec_articles = json.load(file)
-            print(f"[*] {len(self.eec_articles)} articles loaded")
+        if store.exists(fp):
+            log.info(f"{fp.name} exist, loading it.")
+            self.eec_articles = store.load(fp)
+            log.info(f"{len(self.eec_articles)} articles loaded")
         else:
-            fp.touch()
             self.eec_articles = {}
-            print(f"[*] {fp.name} does not exist, creating one.")
+            log.info(f"{fp.name} does not exist, creating one.")
 
     def _dump_listing(self, topic: str) -> None:
         """
@@ -139,9 +142,8 @@ class NLEECScraper:
         Writes the current article data to a JSON file.
         """
 
-        with open(self.nleecdir / f"{topic}.json", "w") as f:
-            json.dump(self.eec_articles, f, indent=4)
-        print(f"[*] Dumped {len(self.eec_articles):>04} {topic} articles.")
+        store.dump(self.eec_articles, self.nleecdir / f"{topic}.json")
+        log.info(f"Dumped {len(self.eec_articles):>04} {topic} articles.")
 
     def _load_errors(self) -> None:
         """
@@ -150,16 +152,14 @@ class NLEECScraper:
         Reads from a JSON file if it exists, otherwise initializes an empty list.
         """
         fp = self.nleecdir / "errors.json"
-        if fp.exists():
-            print(f"[*] {fp.name} exist, loading it.")
-            with fp.open("r") as file:
-                self.faulty_ids = json.load(file)
-            print(f"[*] Loaded {len(self.faulty_ids)} faulty ids")
+        if store.exists(fp):
+            log.info(f"{fp.name} exist, loading it.")
+            self.faulty_ids = store.load(fp)
+            log.info(f"Loaded {len(self.faulty_ids)} faulty ids")
 
         else:
-            fp.touch()
             self.faulty_ids = []
-            print(f"[*] {fp.name} does not exist, creating one.")
+            log.info(f"{fp.name} does not exist, creating one.")
 
     def _dump_errors(self) -> None:
         """
@@ -168,9 +168,8 @@ class NLEECScraper:
         Writes the current list of faulty IDs to a JSON file.
         """
         fp = self.nleecdir / "errors.json"
-        with open(fp, "w") as f:
-            json.dump(self.faulty_ids, f, cls=SetEncoder, indent=4)
-        print(f"[*] Dumped {len(self.faulty_ids)} faulty ids")
+        store.dump(self.faulty_ids, fp)
+        log.info(f"Dumped {len(self.faulty_ids)} faulty ids")
 
     def _load_nletters(self) -> None:
         """
@@ -179,17 +178,15 @@ class NLEECScraper:
         Reads from a JSON file if it exists, otherwise initializes an empty dictionary.
         """
 
-        if self.nletter_path.exists():
-            print(f"[*] {self.nletter_path.name} exist, loading it.")
-            with self.nletter_path.open("r") as file:
-                self.nletters = json.load(file)
-            print(f"[*] Newsletters of {len(self.nletters)} dates loaded")
-            print(f"[*] Total links loaded: {self._nl_links_count()}")
+        if store.exists(self.nletter_path):
+            log.info(f"{self.nletter_path.name} exist, loading it.")
+            self.nletters = store.load(self.nletter_path)
+            log.info(f"Newsletters of {len(self.nletters)} dates loaded")
+            log.info(f"Total links loaded: {self._nl_links_count()}")
 
         else:
-            self.nletter_path.touch()
             self.nletters = {}
-            print(f"[*] {self.nletter_path.name} does not exist, creating one.")
+            log.info(f"{self.nletter_path.name} does not exist, creating one.")
 
     def _dump_nletters(self) -> None:
         """
@@ -198,10 +195,9 @@ class NLEECScraper:
         Writes the current newsletter data to a JSON file.
         """
 
-        with open(self.nletter_path, "w") as f:
-            json.dump(self.nletters, f, cls=SetEncoder, indent=4)
-        print(
-            f"[*] Dumped {self._nl_links_count()} links,"
+        store.dump(self.nletters, self.nletter_path)
+        log.debug(
+            f"Dumped {self._nl_links_count()} links,"
             f" {len(self.nletters):>04} newsletters"
         )
 
@@ -225,32 +221,39 @@ class NLEECScraper:
             )
         except Exception:
             self.faulty_ids.append(article_url)
+            self.progress.update("failed")
             return
         if response.status_code != 200:
-            print(f"[!] {response.status_code} {article_url=}")
+            log.warning(f"{response.status_code} {article_url=}")
             if response.status_code == 404:
                 self.faulty_ids.append(article_id)
-                print(
-                    f"[!] {article_id} DNE, added to faulty_ids,"
+                log.warning(
+                    f"{article_id} DNE, added to faulty_ids,"
                     f" total faults: {len(self.faulty_ids)}"
                 )
+            self.progress.update("failed")
             return
         soup = BeautifulSoup(response.text, "html.parser")
         try:
             script_tag = soup.find_all("script", type="application/ld+json")[1]
         except Exception as e:
-            print(f"[!] script tag issue: {article_url}, {str(e)}")
+            log.warning(f"script tag issue: {article_url}, {str(e)}")
             self.faulty_ids.append(f"{article_url}")
+            self.progress.update("failed")
             return
         try:
             data = json.loads(script_tag.string)
         except Exception:
-            print(f"[!] Decoding Error for {article_url}")
+            log.warning(f"Decoding Error for {article_url}")
+            self.progress.update("failed")
             return
         headline = data.get("headline", "Dummy Headline")
         self.eec_articles.setdefault(article_id, {})
-        self.eec_articles[article_id]["data"] = data
-        print(f"[*] [{len(self.eec_articles)}] {headline}")
+        if self.KEEP_RAW is True:
+            self.raw.append(article_id, data)
+        self.eec_articles[article_id]["data"] = project(data, self.DATA_FIELDS)
+        log.debug(f"[{len(self.eec_articles)}] {headline}")
+        self.progress.update("fetched")
 
     def _nl_links_count(self) -> int:
         """
@@ -285,8 +288,8 @@ class NLEECScraper:
         """
         data = self._categorize_nletters()
         for k, v in data.items():
-            print(k.ljust(10), len(v))
-        time.sleep(5)
+            log.info(f"{k.ljust(10)} {len(v)}", extra=fields(category=k, links=len(v)))
+        time.sleep(NLEECScraper.PAUSE_TIME)
         data = {i: data[i] for i in sorted(data.keys(), key=len, reverse=True)}
         self._load_errors()
         for category, articles in data.items():
@@ -294,32 +297,25 @@ class NLEECScraper:
             scraper._load_listing(category + "-news")
             count = 0
             self._load_listing(category)
+            faulty_ids = set(self.faulty_ids)
+            self.progress = Progress(log, f"nleec {category}", total=len(articles))
             for article_url in articles:
                 article_id = article_url.split("/")[-1]
                 if article_id in self.eec_articles:
-                    print(
-                        f"\r[!] {article_id} already scraped using NLEECScraper",
-                        end="",
-                    )
+                    self.progress.update("scraped_nleec")
                     continue
                 if article_id in scraper.eec_articles:
-                    print(
-                        f"\r[!] {article_id} already scraped using EECScraper",
-                        end="",
-                    )
+                    self.progress.update("scraped_eec")
                     continue
-                if article_id in self.faulty_ids:
-                    print(
-                        f"\r[!] {article_id} is a faulty id, skipping.",
-                        end="",
-                    )
+                if article_id in faulty_ids:
+                    self.progress.update("faulty")
                     continue
-                print()
                 self._get_details(article_url)
                 count += 1
                 if count % 10 == 0:
                     self._dump_listing(category)
                     self._dump_errors()
+            self.progress.close()
             self._dump_errors()
             self._dump_listing(category)
 
@@ -334,21 +330,23 @@ class NLEECScraper:
         self._load_nletters()
         start_date = datetime(2010, 1, 1)
         end_date = datetime.now() - timedelta(days=2)
+        progress = Progress(log, "newsletters", total=(end_date - start_date).days + 1)
         for date in date_range(start_date, end_date):
             frmt_date = date.strftime("%Y-%m-%d")
             if frmt_date in self.nletters:
-                print(f"\r[!] {frmt_date} already scrapped, skipping it.", end="")
+                progress.update("skipped")
                 continue
             atleast_one = False
             self.nletters[frmt_date] = {i[7:]: set() for i in self.CATEGORIES}
-            print(f"[*] Scrapping for {frmt_date}")
+            log.debug(f"Scrapping for {frmt_date}")
             nl_url = NLEECScraper.NL_BASE.format(date=frmt_date)
             response = requests.get(
                 url=nl_url,
                 proxies=PROXIES if USE_SOCKS is True else None,
             )
             if response.status_code != 200:
-                print(f"[*] [{frmt_date}] {response.status_code} {nl_url}")
+                log.warning(f"[{frmt_date}] {response.status_code} {nl_url}")
+                progress.update("failed")
                 continue
             soup = BeautifulSoup(response.text, "html.parser")
             for anchor in soup.find_all("a", href=True):
@@ -356,7 +354,7 @@ class NLEECScraper:
                     if cat in anchor["href"]:
                         headline = re.sub(r"\s+", " ", anchor.get_text()).strip()
                         if headline.lower() not in ("", "read more"):
-                            print(f"\t[*] {cat[7:].rjust(12)}:", headline)
+                            log.debug(f"{cat[7:].rjust(12)}: {headline}")
                             url = (
                                 anchor["href"]
                                 .partition("?url=")[-1]
@@ -366,9 +364,12 @@ class NLEECScraper:
                             self.nletters[frmt_date][cat[7:]].add(url)
                             atleast_one = True
             if atleast_one is False:
-                print(f"\t[?] No newsletter on {frmt_date}? {nl_url}")
+                log.debug(f"No newsletter on {frmt_date}? {nl_url}")
+                progress.update("empty")
                 continue
             self.nletters[frmt_date] = {
                 k: list(v) for k, v in self.nletters[frmt_date].items()
             }
             self._dump_nletters()
+            progress.update("fetched")
+        progress.close()
@@ -1,4 +1,3 @@
-import json
 import re
 from time import sleep
 from typing import Optional
@@ -7,7 +6,10 @@ from uuid import NAMESPACE_DNS, uuid5
 import requests
 from bs4 import BeautifulSoup
 
-from dss_selc.utils import DUMP_PATH, PROXIES, USE_SOCKS
+from dss_selc.utils import DUMP_PATH, PROXIES, USE_SOCKS, store
+from dss_selc.utils.log import Progress, get_logger
+
+log = get_logger("scraper.pvmag")
 
 
 class PvMagScraper:
@@ -25,6 +27,7 @@ class PvMagScraper:
         "TE": "trailers",
     }
     SLEEP_TIME = 2.0
+    LISTING_URL = "https://www.pv-magazine-india.com/news/page/{page_num}/"
 
     def __init__(self) -> None:
         """Initialize Scraper object and create scraper directory"""
@@ -35,22 +38,19 @@ class PvMagScraper:
 
     def _load_listing(self) -> None:
         fp = self.pvdir / "pvmag.json"
-        if fp.exists():
-            print(f"[*] {fp.name} exist, loading it.")
-            with fp.open("r") as file:
-                self.pvmag_articles = json.load(file)
-            print(f"[*] {len(self.pvmag_articles):>05} articles loaded")
+        if store.exists(fp):
+            log.info(f"{fp.name} exist, loading it.")
+            self.pvmag_articles = store.load(fp)
+            log.info(f"{len(self.pvmag_articles):>05} articles loaded")
             self.first_time = False
         else:
-            fp.touch()
             self.pvmag_articles = {}
-            print(f"[*] {fp.name} does not exist, creating one.")
+            log.info(f"{fp.name} does not exist, creating one.")
             self.first_time = True
 
     def _dump_listing(self) -> None:
-        with open(self.pvdir / "pvmag.json", "w") as f:
-            json.dump(self.pvmag_articles, f, indent=4)
-        print(f"[*] Dumped {len(self.pvmag_articles):>05} PVMag articles.")
+        store.dump(self.pvmag_articles, self.pvdir / "pvmag.json")
+        log.info(f"Dumped {len(self.pvmag_articles):>05} PVMag articles.")
 
     def _get_body(self, url: str) -> dict[str, Optional[str]]:
         sleep(PvMagScraper.SLEEP_TIME)
@@ -60,8 +60,8 @@ class PvMagScraper:
             headers=PvMagScraper.HEADERS,
         )
         if response.status_code != 200:
-            print(
-                f"[!] [{len(self.pvmag_articles):>05}] {response.status_code=}"
+            log.warning(
+                f"[{len(self.pvmag_articles):>05}] {response.status_code=}"
                 f"No article body for {url}"
             )
             return {"body": None, "key_words": None}
@@ -74,27 +74,26 @@ class PvMagScraper:
 
     def fetch_body(self) -> None:
         self._load_listing()
+        progress = Progress(log, "pvmag bodies", total=len(self.pvmag_articles))
         for ind, (k, v) in enumerate(self.pvmag_articles.items(), start=1):
             if v.get("body") is not None:
-                print(
-                    f"[*] [{ind:>05}/{len(self.pvmag_articles):>05}]"
-                    f" Body for {k} already exist."
-                )
+                progress.update("existing")
                 continue
             self.pvmag_articles[k] |= self._get_body(v["url"])
-            print(
-                f"[*] [{ind:>05}/{len(self.pvmag_articles):>05}]"
-                f" fetched body for {k}"
+            log.debug(
+                f"[{ind:>05}/{len(self.pvmag_articles):>05}] fetched body for {k}"
             )
+            progress.update("fetched")
             if ind % 10 == 0:
                 self._dump_listing()
+        progress.close()
         self._dump_listing()
 
     def _add_articles(self, response: requests.Response) -> bool:
         soup = BeautifulSoup(response.text, "html.parser")
         articles = soup.find_all("div", class_="article-preview")
         if not articles:
-            print("[?] No articles found, exiting")
+            log.info("No articles found, exiting")
             return False
         for article in articles:
             _h2 = article.find("h2", class_="entry-title")
@@ -102,8 +101,8 @@ class PvMagScraper:
             url = _h2.find("a")["href"]
             _id = str(uuid5(NAMESPACE_DNS, title))
             if _id in self.pvmag_articles and self.first_time is False:
-                print(f"\t[*] {repr(title)} already scraped.")
-                print("\t[!] List is upto date, exiting.")
+                log.info(f"{repr(title)} already scraped.")
+                log.info("List is upto date, exiting.")
                 return False
             date_published = article.find(
                 "time",
@@ -124,20 +123,22 @@ class PvMagScraper:
                 "summary": re.sub(r"\s+", " ", summary).strip(),
             }
             self.pvmag_articles[_id] = article_dict
-            print(
-                f"\t[*] [{len(self.pvmag_articles):>05}] "
+            log.debug(
+                f"[{len(self.pvmag_articles):>05}] "
                 f"[{article_dict['date_published']}] "
                 f"{article_dict['title']}"
             )
+            self.progress.update("listed")
             # print(json.dumps(article_dict, indent=4))
         return True
 
     def fetch_articles(self) -> None:
         self._load_listing()
         page_num = 1
+        self.progress = Progress(log, "pvmag listing")
         while True:
-            requrl = f"https://www.pv-magazine-india.com/news/page/{page_num}/"
-            print(f"[*] Page Num = {page_num}")
+            requrl = PvMagScraper.LISTING_URL.format(page_num=page_num)
+            log.debug(f"Page Num = {page_num}")
             # sleep(PvMagScraper.SLEEP_TIME)
             response = requests.get(
                 url=requrl,
@@ -145,21 +146,22 @@ class PvMagScraper:
                 proxies=PROXIES if USE_SOCKS is True else None,
             )
             if response.status_code == 404:
-                print(
-                    f"[!] [{len(self.pvmag_articles):>05}] "
+                log.info(
+                    f"[{len(self.pvmag_articles):>05}] "
                     f"{page_num=} {response.status_code=} "
                     "Reached EOL, exiting."
                 )
                 break
             if response.status_code != 200:
-                print(
-                    f"[!] [{len(self.pvmag_articles):>05}] "
+                log.warning(
+                    f"[{len(self.pvmag_articles):>05}] "
                     f"{page_num=} {response.status_code=}"
                 )
                 continue
             if self._add_articles(response) is False:
-                print("[?] Probably reached EOL, exiting.")
+                log.info("Probably reached EOL, exiting.")
                 break
             self._dump_listing()
             page_num += 1
+        self.progress.close()
         self._dump_listing()
@@ -1,4 +1,3 @@
-import json
 import re
 from time import sleep
 from typing import Optional
@@ -6,7 +5,10 @@ from typing import Optional
 import requests
 from bs4 import BeautifulSoup
 
-from dss_selc.utils import DUMP_PATH, PROXIES, USE_SOCKS
+from dss_selc.utils import DUMP_PATH, PROXIES, USE_SOCKS, store
+from dss_selc.utils.log import Progress, get_logger
+
+log = get_logger("scraper.saur")
 
 
 class SaurScraper:
@@ -26,6 +28,7 @@ class SaurScraper:
         "TE": "trailers",
     }
     SLEEP_TIME = 2.0
+    LISTING_URL = "https://www.saurenergy.com/solar-energy-news/page/{page_num}"
 
     def __init__(self) -> None:
         """Initialize Scraper object and create scraper directory"""
@@ -36,22 +39,19 @@ class SaurScraper:
 
     def _load_listing(self) -> None:
         fp = self.saurdir / "saur.json"
-        if fp.exists():
-            print(f"[*] {fp.name} exist, loading it.")
-            with fp.open("r") as file:
-                self.saur_articles = json.load(file)
-            print(f"[*] {len(self.saur_articles):>05} articles loaded")
+        if store.exists(fp):
+            log.info(f"{fp.name} exist, loading it.")
+            self.saur_articles = store.load(fp)
+            log.info(f"{len(self.saur_articles):>05} articles loaded")
 
         else:
-            fp.touch()
             self.saur_articles = {}
-            print(f"[*] {fp.name} does not exist, creating one.")
+            log.info(f"{fp.name} does not exist, creating one.")
 
     def _dump_listing(self, verbose: bool = True) -> None:
-        with open(self.saurdir / "saur.json", "w") as f:
-            json.dump(self.saur_articles, f, indent=4)
+        store.dump(self.saur_articles, self.saurdir / "saur.json")
         if verbose:
-            print(f"[*] Dumped {len(self.saur_articles):>05} Saur articles.")
+            log.info(f"Dumped {len(self.saur_articles):>05} Saur articles.")
 
     def _get_body(self, url: str) -> dict[str, Optional[str]]:
         sleep(SaurScraper.SLEEP_TIME)
@@ -60,9 +60,9 @@ class SaurScraper:
             proxies=PROXIES if USE_SOCKS is True else None,
         )
         if response.status_code != 200:
-            print(
-                f"[!] [{len(self.saur_articles):>05}] {response.status_code=}"
-                f"No article body for {url}"
+            log.warning(
+                f"[{len(self.saur_articles):>05}] {response.status_code=}"
+                f" No article body for {url}"
             )
             return {"body": None, "key_words": None}
         soup = BeautifulSoup(response.text, "html.parser")
@@ -82,13 +82,13 @@ class SaurScraper:
         soup = BeautifulSoup(response.text, "html.parser")
         articles = soup.find_all("article")
         if not articles:
-            print("[?] No articles found, exiting")
+            log.info("No articles found, exiting")
             return False
         for article in articles:
             _id = article["id"]
             if _id in self.saur_articles:
-                print(f"\t[*] {_id} already scraped.")
-                print("\t[!] List is upto date, exiting.")
+                log.info(f"{_id} already scraped.")
+                log.info("List is upto date, exiting.")
                 return False
             anchor = article.find("a", class_="content-title-link")
             title = re.sub(r"\s+", " ", anchor.get_text(strip=True)).strip()
@@ -109,37 +109,36 @@ class SaurScraper:
                 "summary": re.sub(r"\s+", " ", summary).strip(),
             }
             self.saur_articles[_id] = article_dict
-            print(
-                f"\t[*] [{len(self.saur_articles):>05}] "
+            log.debug(
+                f"[{len(self.saur_articles):>05}] "
                 f"[{article_dict['date_published']}] "
                 f"{article_dict['title']}"
             )
+            self.progress.update("listed")
         return True
 
     def fetch_body(self) -> None:
         self._load_listing()
+        progress = Progress(log, "saur bodies", total=len(self.saur_articles))
         for ind, (k, v) in enumerate(self.saur_articles.items(), start=1):
             if v.get("body") is not None:
-                print(
-                    f"[*] [{ind:>05}/{len(self.saur_articles):>05}]"
-                    f" Body for {k} already exist."
-                )
+                progress.update("existing")
                 continue
             self.saur_articles[k] |= self._get_body(v["url"])
-            print(
-                f"[*] [{ind:>05}/{len(self.saur_articles):>05}]"
-                f" fetched body for {k}"
-            )
+            log.debug(f"[{ind:>05}/{len(self.saur_articles):>05}] fetched body for {k}")
+            progress.update("fetched")
             self._dump_listing(verbose=False)
+        progress.close()
         self._dump_listing(verbose=False)
 
     def fetch_articles(self) -> None:
         self._load_listing()
         page_num = 1
         # page_num = len(self.saur_articles) // 9 + 1
+        self.progress = Progress(log, "saur listing")
         while True:
-            requrl = f"https://www.saurenergy.com/solar-energy-news/page/{page_num}"
-            print(f"[*] Page Num = {page_num}")
+            requrl = SaurScraper.LISTING_URL.format(page_num=page_num)
+            log.debug(f"Page Num = {page_num}")
             sleep(SaurScraper.SLEEP_TIME)
             response = requests.get(
                 url=requrl,
@@ -147,14 +146,15 @@ class SaurScraper:
                 proxies=PROXIES if USE_SOCKS is True else None,
             )
             if response.status_code != 200:
-                print(
-                    f"[!] [{len(self.saur_articles):>05}] "
+                log.warning(
+                    f"[{len(self.saur_articles):>05}] "
                     f"{page_num=} {response.status_code=}"
                 )
                 continue
             if self._add_articles(response) is False:
-                print("[?] Probably reached EOL, exiting.")
+                log.info("Probably reached EOL, exiting.")
                 break
             self._dump_listing()
             page_num += 1
+        self.progress.close()
         self._dump_listing()
@@ -1,8 +1,9 @@
+import os
 from pathlib import Path
 
-USE_SOCKS = True
+USE_SOCKS = os.environ.get("DSS_SELC_USE_SOCKS", "1") == "1"
 SOCKS_PROXY = "socks5://127.0.0.1:1080"
 PROXIES = {"http": SOCKS_PROXY, "https": SOCKS_PROXY}
 PRJ_PATH = Path(__file__).parent.parent.parent
 PRJ_PATH = PRJ_PATH.parent
-DUMP_PATH = PRJ_PATH / "dss-selc-dump"
+DUMP_PATH = Path(os.environ.get("DSS_SELC_DUMP_PATH", PRJ_PATH / "dss-selc-dump"))
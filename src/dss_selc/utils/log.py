@@ -0,0 +1,152 @@
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from typing import Optional, TextIO
+
+LOG_LEVEL = os.environ.get("DSS_SELC_LOG_LEVEL", "INFO").upper()
+LOG_JSON = os.environ.get("DSS_SELC_LOG_JSON", "0") == "1"
+PROGRESS_INTERVAL = float(os.environ.get("DSS_SELC_PROGRESS_INTERVAL", "5"))
+
+ROOT_LOGGER = "dss_selc"
+MARKERS = {
+    logging.DEBUG: "[?]",
+    logging.INFO: "[*]",
+    logging.WARNING: "[!]",
+    logging.ERROR: "[!]",
+    logging.CRITICAL: "[!]",
+}
+
+
+class MarkerFormatter(logging.Formatter):
+    """Render records the way the scrapers used to print them: `[*] message`"""
+
+    def format(self, record: logging.LogRecord) -> str:  # noqa: A003
+        marker = MARKERS.get(record.levelno, "[*]")
+        line = f"{marker} {record.getMessage()}"
+        if record.exc_info:
+            line += "\n" + self.formatException(record.exc_info)
+        return line
+
+
+class JSONFormatter(logging.Formatter):
+    """Render records as one JSON object per line, merging `extra={"fields": ...}`"""
+
+    def format(self, record: logging.LogRecord) -> str:  # noqa: A003
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry |= getattr(record, "fields", {})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(
+    level: str = LOG_LEVEL,
+    json_output: bool = LOG_JSON,
+    stream: Optional[TextIO] = None,
+) -> logging.Logger:
+    """
+    (Re)configure the package-wide `dss_selc` logger.
+
+    Args:
+        level (str): Minimum level name, e.g. "DEBUG" to see per-article lines.
+        json_output (bool): Emit structured JSON lines instead of marker lines.
+        stream (Optional[TextIO]): Output stream, stdout by default.
+
+    Returns:
+        logging.Logger: The configured root logger of the package.
+    """
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(JSONFormatter() if json_output else MarkerFormatter())
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Return a child of the package logger, configuring it on first use"""
+    if not logging.getLogger(ROOT_LOGGER).handlers:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER}.{name}")
+
+
+def fields(**kwargs: object) -> dict[str, dict[str, object]]:
+    """Shorthand for structured fields: `log.info(msg, extra=fields(n=1))`"""
+    return {"fields": kwargs}
+
+
+class Progress:
+    """
+    Throttled progress reporter for long per-item loops.
+
+    Items are tallied by outcome (e.g. "skipped", "fetched") and a single
+    aggregate line is logged at most once per `interval` seconds, plus a final
+    one on `close()`. Use it as a context manager around the loop.
+
+    Usage:
+        with Progress(log, "pvmag bodies", total=len(articles)) as progress:
+            for article in articles:
+                ...
+                progress.update("skipped")
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        label: str,
+        total: Optional[int] = None,
+        interval: float = PROGRESS_INTERVAL,
+    ) -> None:
+        self.logger = logger
+        self.label = label
+        self.total = total
+        self.interval = interval
+        self.counts = Counter()
+        self.done = 0
+        self.start = self.last = time.monotonic()
+
+    def update(self, outcome: str, n: int = 1) -> None:
+        self.counts[outcome] += n
+        self.done += n
+        now = time.monotonic()
+        if now - self.last >= self.interval:
+            self.last = now
+            self.emit()
+
+    def emit(self) -> None:
+        elapsed = time.monotonic() - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        done = f"{self.done}" if self.total is None else f"{self.done}/{self.total}"
+        counts = ", ".join(f"{k}={v}" for k, v in self.counts.items())
+        self.logger.info(
+            f"{self.label}: {done} ({counts}) {rate:.1f}/s",
+            extra=fields(
+                label=self.label,
+                done=self.done,
+                total=self.total,
+                counts=dict(self.counts),
+                rate=round(rate, 2),
+                elapsed=round(elapsed, 2),
+            ),
+        )
+
+    def close(self) -> None:
+        if self.done:
+            self.emit()
+
+    def __enter__(self) -> "Progress":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
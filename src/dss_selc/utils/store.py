@@ -0,0 +1,374 @@
+import argparse
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+from dss_selc.utils.log import fields, get_logger
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+log = get_logger("store")
+
+Store = Union[dict, list]
+
+# format written by `dump`, loading accepts every format
+STORE_FORMAT = os.environ.get("DSS_SELC_STORE_FORMAT", "json")
+
+
+def _default(obj: object) -> list:
+    """Encode the sets NLEEC keeps in its newsletter and error stores"""
+    if isinstance(obj, set):
+        return list(obj)
+    raise TypeError(f"{type(obj).__name__} is not serializable")
+
+
+class Serializer(ABC):
+    """
+    Encoding of a scraper store to bytes.
+
+    Attributes:
+        name (str): Value of `DSS_SELC_STORE_FORMAT` selecting it.
+        suffix (str): File suffix replacing `.json` in the store path.
+    """
+
+    name = ""
+    suffix = ""
+
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def encode(self, obj: Store) -> bytes:
+        """Bytes of a whole store"""
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Store:
+        """Store encoded by `encode`"""
+
+    def iter_items(self, f: BinaryIO) -> Iterator[tuple[str, object]]:
+        """Key/value pairs of a dict store; formats that can, stream them"""
+        yield from self.decode(f.read()).items()
+
+
+class JSONSerializer(Serializer):
+    """Indented JSON through the standard library, as the scrapers always wrote"""
+
+    name = "json"
+    suffix = ".json"
+
+    def encode(self, obj: Store) -> bytes:
+        return json.dumps(obj, indent=4, default=_default).encode()
+
+    def decode(self, data: bytes) -> Store:
+        return json.loads(data)
+
+    def iter_items(self, f: BinaryIO) -> Iterator[tuple[str, object]]:
+        if ijson is None:
+            yield from super().iter_items(f)
+            return
+        yield from ijson.kvitems(f, "", use_float=True)
+
+
+class FastJSONSerializer(JSONSerializer):
+    """Compact JSON through orjson, readable by every other JSON reader"""
+
+    name = "orjson"
+
+    def available(self) -> bool:
+        return orjson is not None
+
+    def encode(self, obj: Store) -> bytes:
+        return orjson.dumps(obj, default=_default)
+
+    def decode(self, data: bytes) -> Store:
+        return orjson.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    """msgpack, optionally zstd-compressed"""
+
+    name = "msgpack"
+    suffix = ".msgpack"
+
+    def __init__(self, zstd: bool = False, level: int = 3) -> None:
+        self.zstd = zstd
+        self.level = level
+        if zstd:
+            self.name = "msgpack-zstd"
+            self.suffix = ".msgpack.zst"
+
+    def available(self) -> bool:
+        return msgpack is not None and (not self.zstd or zstandard is not None)
+
+    def encode(self, obj: Store) -> bytes:
+        data = msgpack.packb(obj, use_bin_type=True, default=_default)
+        if not self.zstd:
+            return data
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def decode(self, data: bytes) -> Store:
+        if self.zstd:
+            data = zstandard.ZstdDecompressor().decompress(data)
+        return msgpack.unpackb(data, raw=False)
+
+    def iter_items(self, f: BinaryIO) -> Iterator[tuple[str, object]]:
+        if self.zstd:
+            f = zstandard.ZstdDecompressor().stream_reader(f)
+        unpacker = msgpack.Unpacker(f, raw=False)
+        for _ in range(unpacker.read_map_header()):
+            key = unpacker.unpack()
+            yield key, unpacker.unpack()
+
+
+SERIALIZERS = {
+    s.name: s
+    for s in (
+        JSONSerializer(),
+        FastJSONSerializer(),
+        MsgpackSerializer(),
+        MsgpackSerializer(zstd=True),
+    )
+}
+
+
+def get_serializer(name: Optional[str] = None) -> Serializer:
+    """
+    Look up a serializer by name, defaulting to `DSS_SELC_STORE_FORMAT`.
+
+    Raises:
+        ValueError: For unknown names or formats whose library is missing.
+    """
+    name = name or STORE_FORMAT
+    if name not in SERIALIZERS:
+        raise ValueError(f"Unknown store format {name!r}, one of {list(SERIALIZERS)}")
+    serializer = SERIALIZERS[name]
+    if not serializer.available():
+        raise ValueError(f"Store format {name!r} needs a library that is not installed")
+    return serializer
+
+
+def base_path(path: Path) -> Path:
+    """Strip any known store suffix, so `x.json` and `x.msgpack.zst` map to `x`"""
+    suffixes = sorted({s.suffix for s in SERIALIZERS.values()}, key=len, reverse=True)
+    for suffix in suffixes:
+        if path.name.endswith(suffix):
+            return path.with_name(path.name[: -len(suffix)])
+    return path
+
+
+def _serializer_for(path: Path) -> Serializer:
+    for serializer in sorted(
+        SERIALIZERS.values(), key=lambda s: len(s.suffix), reverse=True
+    ):
+        if path.name.endswith(serializer.suffix):
+            if isinstance(serializer, JSONSerializer):
+                # both JSON flavours read each other's files, prefer the fast one
+                return SERIALIZERS["orjson" if orjson is not None else "json"]
+            return serializer
+    raise ValueError(f"Cannot tell the store format of {path}")
+
+
+def find(path: Path) -> Optional[Path]:
+    """
+    Locate the file holding a store, in whichever format it was last written.
+
+    Args:
+        path (Path): Store path as the scrapers name it, e.g. `eec/oil-news.json`.
+
+    Returns:
+        Optional[Path]: The most recently written variant, None if there is none.
+    """
+    base = base_path(Path(path))
+    candidates = [
+        p
+        for p in {base.with_name(base.name + s.suffix) for s in SERIALIZERS.values()}
+        if p.exists() and p.stat().st_size > 0
+    ]
+    return max(candidates, key=lambda p: p.stat().st_mtime, default=None)
+
+
+def exists(path: Path) -> bool:
+    return find(path) is not None
+
+
+def load(path: Path) -> Store:
+    """
+    Read a store written by `dump` in any of the supported formats.
+
+    Args:
+        path (Path): Store path, any format suffix.
+
+    Returns:
+        Store: The decoded object.
+
+    Raises:
+        FileNotFoundError: If no variant of the store exists.
+    """
+    fp = find(path)
+    if fp is None:
+        raise FileNotFoundError(path)
+    start = time.perf_counter()
+    serializer = _serializer_for(fp)
+    obj = serializer.decode(fp.read_bytes())
+    elapsed = time.perf_counter() - start
+    log.debug(
+        f"Loaded {fp.name} ({serializer.name}) in {elapsed * 1000:.0f} ms",
+        extra=fields(op="load", file=str(fp), format=serializer.name, s=elapsed),
+    )
+    return obj  # noqa: R504
+
+
+def iter_items(path: Path) -> Iterator[tuple[str, object]]:
+    """
+    Iterate over the articles of a dict store without decoding it all at once.
+
+    JSON stores stream with `ijson` when it is installed and msgpack stores
+    always do, so memory stays bounded by the largest single article; other
+    cases fall back to `load`.
+
+    Args:
+        path (Path): Store path, any format suffix.
+
+    Yields:
+        tuple[str, object]: Article key and value, in stored order.
+    """
+    fp = find(path)
+    if fp is None:
+        raise FileNotFoundError(path)
+    serializer = _serializer_for(fp)
+    if isinstance(serializer, JSONSerializer):
+        serializer = SERIALIZERS["json"]
+    with fp.open("rb") as f:
+        yield from serializer.iter_items(f)
+
+
+def dump(obj: Store, path: Path, fmt: Optional[str] = None) -> Path:
+    """
+    Write a store in the configured format, next to the path the scraper uses.
+
+    The file is written to a temporary name and renamed, so an interrupted
+    run never leaves a truncated store behind.
+
+    Args:
+        obj (Store): JSON-compatible object; sets are written as lists.
+        path (Path): Store path, any format suffix.
+        fmt (Optional[str]): Format name, defaults to `DSS_SELC_STORE_FORMAT`.
+
+    Returns:
+        Path: The file written.
+    """
+    serializer = get_serializer(fmt)
+    base = base_path(Path(path))
+    fp = base.with_name(base.name + serializer.suffix)
+    start = time.perf_counter()
+    tmp = fp.with_name(fp.name + ".tmp")
+    tmp.write_bytes(serializer.encode(obj))
+    tmp.replace(fp)
+    elapsed = time.perf_counter() - start
+    log.debug(
+        f"Dumped {fp.name} ({serializer.name}) in {elapsed * 1000:.0f} ms",
+        extra=fields(op="dump", file=str(fp), format=serializer.name, s=elapsed),
+    )
+    return fp
+
+
+def bench(path: Path, repeat: int = 3) -> list[dict]:
+    """
+    Time a round trip of one store through every available format.
+
+    Args:
+        path (Path): Store to read, any format suffix.
+        repeat (int): Runs per format; the best time is reported.
+
+    Returns:
+        list[dict]: Format name, size in bytes and best load/dump seconds.
+    """
+    obj = load(path)
+    results = []
+    for serializer in SERIALIZERS.values():
+        if not serializer.available():
+            continue
+        dumps, loads = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = serializer.encode(obj)
+            dumps.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            serializer.decode(data)
+            loads.append(time.perf_counter() - start)
+        results.append(
+            {
+                "format": serializer.name,
+                "bytes": len(data),
+                "dump_s": min(dumps),
+                "load_s": min(loads),
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m dss_selc.utils.store",
+        description="Convert, export and time scraper stores",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert = sub.add_parser("convert", help="rewrite stores in another format")
+    convert.add_argument("paths", nargs="+", type=Path)
+    convert.add_argument("--to", default=STORE_FORMAT, choices=list(SERIALIZERS))
+    convert.add_argument("--keep", action="store_true", help="keep the old files")
+    export = sub.add_parser("export", help="write stores as indented JSON")
+    export.add_argument("paths", nargs="+", type=Path)
+    export.add_argument("--out", type=Path, help="directory, defaults to in place")
+    timing = sub.add_parser("bench", help="time load/dump of stores per format")
+    timing.add_argument("paths", nargs="+", type=Path)
+    timing.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for path in args.paths:
+        if args.command == "convert":
+            old = find(path)
+            if old is None:
+                raise FileNotFoundError(path)
+            new = dump(load(old), old, args.to)
+            if old != new and not args.keep:
+                old.unlink()
+            print(f"[*] {old.name} -> {new.name}")
+        elif args.command == "export":
+            out = base_path(path)
+            out = out.with_name(out.name + ".json")
+            if args.out is not None:
+                args.out.mkdir(parents=True, exist_ok=True)
+                out = args.out / out.name
+            dump(load(path), out, "json")
+            print(f"[*] {path.name} -> {out}")
+        elif args.command == "bench":
+            print(f"[*] {path.name}")
+            print(f"{'format':<14}{'MB':>9}{'dump ms':>10}{'load ms':>10}")
+            for r in bench(path, args.repeat):
+                print(
+                    f"{r['format']:<14}{r['bytes'] / 2**20:>9.2f}"
+                    f"{r['dump_s'] * 1000:>10.1f}{r['load_s'] * 1000:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()